@@ -0,0 +1,7 @@
+#!/bin/bash
+
+# Runs one of the benchmarks in src/benchmarks, e.g.
+#   ./bench.sh async_throughput -c config/legal_case_app_config.json
+module="$1"
+shift
+PYTHONPATH=src pipenv run python -m "benchmarks.${module}" "$@"
@@ -7,8 +7,8 @@ cd "$(dirname "$0")"
 
 echo "Rebuilding legal_case_roster_db ..."
 
+# Schema and app user need root; tables come from the versioned migrations
 mysql -u root < database/01_create_schema.sql
 mysql -u root < database/02_create_app_user.sql
+pipenv run python src/main.py -c config/legal_case_app_config.json migrate
 mysql -u root < database/03_insert_sample_data.sql
-
-
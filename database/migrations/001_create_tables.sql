@@ -1,9 +1,9 @@
-
+-- Baseline schema (formerly database/03_create_tables.sql).
 
 -- -------------------------------------
 -- Table: lawyer
 -- -------------------------------------
-CREATE TABLE lawyer (
+CREATE TABLE IF NOT EXISTS lawyer (
     lawyer_id INT AUTO_INCREMENT PRIMARY KEY,
     first_name VARCHAR(100) NOT NULL,
     last_name VARCHAR(100) NOT NULL,
@@ -16,7 +16,7 @@ CREATE TABLE lawyer (
 -- -------------------------------------
 -- Table: legal_case
 -- -------------------------------------
-CREATE TABLE legal_case (
+CREATE TABLE IF NOT EXISTS legal_case (
     case_id INT AUTO_INCREMENT PRIMARY KEY,
     case_name VARCHAR(255) NOT NULL,
     client_name VARCHAR(255) NOT NULL,
@@ -29,7 +29,7 @@ CREATE TABLE legal_case (
 -- -------------------------------------
 -- Table: case_lawyer_xref
 -- -------------------------------------
-CREATE TABLE case_lawyer_xref (
+CREATE TABLE IF NOT EXISTS case_lawyer_xref (
     id INT AUTO_INCREMENT PRIMARY KEY,
     case_id INT NOT NULL,
     lawyer_id INT NOT NULL,
@@ -0,0 +1,28 @@
+-- Indexes for the queries in AppServices.
+--
+-- The unique (case_id, lawyer_id) key fails if duplicate assignments
+-- already exist; find them first with:
+--   SELECT case_id, lawyer_id, COUNT(*) FROM case_lawyer_xref
+--   GROUP BY case_id, lawyer_id HAVING COUNT(*) > 1;
+
+-- -------------------------------------
+-- case_lawyer_xref: roster lookups by case, assignments by lawyer
+-- -------------------------------------
+ALTER TABLE case_lawyer_xref
+    ADD UNIQUE INDEX ux_case_lawyer_xref_case_lawyer (case_id, lawyer_id),
+    ADD INDEX ix_case_lawyer_xref_lawyer_case (lawyer_id, case_id);
+
+-- -------------------------------------
+-- legal_case: status filters (keyset-paged by case_id) and date ranges
+-- -------------------------------------
+ALTER TABLE legal_case
+    ADD INDEX ix_legal_case_status_case (case_status, case_id),
+    ADD INDEX ix_legal_case_status_start (case_status, start_date),
+    ADD INDEX ix_legal_case_start_date (start_date);
+
+-- -------------------------------------
+-- lawyer: name and specialization lookups
+-- -------------------------------------
+ALTER TABLE lawyer
+    ADD INDEX ix_lawyer_last_first (last_name, first_name),
+    ADD INDEX ix_lawyer_specialization (specialization);
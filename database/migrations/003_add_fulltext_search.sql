@@ -0,0 +1,18 @@
+-- FULLTEXT indexes for AppServices.search_lawyers / search_cases.
+--
+-- Searches run in BOOLEAN MODE with a trailing * on every term, so
+-- partial words match. InnoDB ignores words shorter than
+-- innodb_ft_min_token_size (default 3) and words in its stopword list;
+-- change those server settings before running this if needed.
+
+-- -------------------------------------
+-- lawyer: name, specialization and email
+-- -------------------------------------
+ALTER TABLE lawyer
+    ADD FULLTEXT INDEX ft_lawyer_search (first_name, last_name, specialization, email);
+
+-- -------------------------------------
+-- legal_case: case name, client and description
+-- -------------------------------------
+ALTER TABLE legal_case
+    ADD FULLTEXT INDEX ft_legal_case_search (case_name, client_name, description);
@@ -0,0 +1,50 @@
+-- Append-only billable hours ledger with per-case and per-lawyer totals.
+--
+-- HoursLedgerService.record_hours inserts into time_entry and adds the
+-- same hours to case_hours_total and lawyer_hours_total in one
+-- transaction, so dashboards read one row instead of summing entries.
+-- Corrections are new entries with negative hours; rows are never
+-- updated or deleted. case_lawyer_xref.billable_hours is left as is.
+-- `main.py ledger verify` / `ledger rebuild` recompute the totals.
+
+-- -------------------------------------
+-- Table: time_entry
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS time_entry (
+    entry_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    case_id INT NOT NULL,
+    lawyer_id INT NOT NULL,
+    hours DECIMAL(10,2) NOT NULL,
+    work_date DATE NOT NULL,
+    note VARCHAR(500) NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (case_id) REFERENCES legal_case(case_id),
+    FOREIGN KEY (lawyer_id) REFERENCES lawyer(lawyer_id),
+
+    -- Covering indexes for the per-case / per-lawyer SUMs of ledger verify
+    INDEX ix_time_entry_case_hours (case_id, hours),
+    INDEX ix_time_entry_lawyer_hours (lawyer_id, hours)
+);
+
+-- -------------------------------------
+-- Table: case_hours_total
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS case_hours_total (
+    case_id INT PRIMARY KEY,
+    total_hours DECIMAL(14,2) NOT NULL DEFAULT 0,
+    entry_count BIGINT NOT NULL DEFAULT 0,
+
+    FOREIGN KEY (case_id) REFERENCES legal_case(case_id)
+);
+
+-- -------------------------------------
+-- Table: lawyer_hours_total
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS lawyer_hours_total (
+    lawyer_id INT PRIMARY KEY,
+    total_hours DECIMAL(14,2) NOT NULL DEFAULT 0,
+    entry_count BIGINT NOT NULL DEFAULT 0,
+
+    FOREIGN KEY (lawyer_id) REFERENCES lawyer(lawyer_id)
+);
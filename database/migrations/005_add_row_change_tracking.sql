@@ -0,0 +1,36 @@
+-- Row change timestamps for incremental roster snapshots.
+--
+-- `main.py snapshot export --incremental` copies only the rows whose
+-- updated_at is at or after the previous export's watermark. MySQL sets
+-- updated_at on insert and whenever an UPDATE (or an upsert's
+-- ON DUPLICATE KEY UPDATE) actually changes the row. Existing rows get
+-- the time of this migration. Deleted rows have no updated_at to find:
+-- the only deletes the application makes are `main.py archive` moving
+-- legal_case and case_lawyer_xref rows to the archive tables (migration
+-- 007), and an incremental export records those keys as tombstones from
+-- the archive's archived_at (indexed by migration 008). A full export is
+-- needed to drop rows deleted by hand.
+
+-- -------------------------------------
+-- lawyer
+-- -------------------------------------
+ALTER TABLE lawyer
+    ADD COLUMN updated_at TIMESTAMP NOT NULL
+        DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    ADD INDEX ix_lawyer_updated_at (updated_at);
+
+-- -------------------------------------
+-- legal_case
+-- -------------------------------------
+ALTER TABLE legal_case
+    ADD COLUMN updated_at TIMESTAMP NOT NULL
+        DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    ADD INDEX ix_legal_case_updated_at (updated_at);
+
+-- -------------------------------------
+-- case_lawyer_xref
+-- -------------------------------------
+ALTER TABLE case_lawyer_xref
+    ADD COLUMN updated_at TIMESTAMP NOT NULL
+        DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    ADD INDEX ix_case_lawyer_xref_updated_at (updated_at);
@@ -0,0 +1,17 @@
+-- Applied write-behind batches.
+--
+-- WriteBehindBuffer journals queued assignment and hours writes to a
+-- batch file before acknowledging them, and writes each batch in one
+-- transaction together with its row here. The file is removed after the
+-- commit; a file left behind by a crash is replayed on the next start
+-- only if its batch_id is missing, so added hours are never applied
+-- twice. Rows are deleted by the following flush, or on shutdown.
+
+-- -------------------------------------
+-- Table: write_behind_batch
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS write_behind_batch (
+    batch_id VARCHAR(64) PRIMARY KEY,
+    entries INT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,73 @@
+-- Archive tables for closed cases, partitioned by start_date year.
+--
+-- `main.py archive` (CaseArchiveService) moves cases whose end_date is
+-- more than archive.older_than_years ago, with their case_lawyer_xref
+-- rows, out of the hot tables in small batches. AppServices reads only
+-- the hot tables unless a method is called with include_archive=True.
+--
+-- legal_case itself stays unpartitioned: MySQL does not allow foreign
+-- keys to or from a partitioned InnoDB table (case_lawyer_xref,
+-- time_entry and case_hours_total all reference it) or FULLTEXT indexes
+-- on one (migration 003). Archival keeps it small instead, and the
+-- archive, which has neither, is the table partitioned by year.
+--
+-- The partitioning column must be in every unique key, so the archive's
+-- primary key is (case_id, start_date). Add next year's partition before
+-- it is needed, e.g.:
+--   ALTER TABLE legal_case_archive REORGANIZE PARTITION p_future INTO (
+--       PARTITION p2027 VALUES LESS THAN (2028),
+--       PARTITION p_future VALUES LESS THAN MAXVALUE);
+-- and drop a whole year with ALTER TABLE ... DROP PARTITION once its
+-- retention period is over.
+
+-- -------------------------------------
+-- Table: legal_case_archive
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS legal_case_archive (
+    case_id INT NOT NULL,
+    case_name VARCHAR(255) NOT NULL,
+    client_name VARCHAR(255) NOT NULL,
+    case_status VARCHAR(100) NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NULL,
+    description TEXT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (case_id, start_date),
+    INDEX ix_legal_case_archive_status_case (case_status, case_id)
+)
+PARTITION BY RANGE (YEAR(start_date)) (
+    PARTITION p_before_2015 VALUES LESS THAN (2015),
+    PARTITION p2015 VALUES LESS THAN (2016),
+    PARTITION p2016 VALUES LESS THAN (2017),
+    PARTITION p2017 VALUES LESS THAN (2018),
+    PARTITION p2018 VALUES LESS THAN (2019),
+    PARTITION p2019 VALUES LESS THAN (2020),
+    PARTITION p2020 VALUES LESS THAN (2021),
+    PARTITION p2021 VALUES LESS THAN (2022),
+    PARTITION p2022 VALUES LESS THAN (2023),
+    PARTITION p2023 VALUES LESS THAN (2024),
+    PARTITION p2024 VALUES LESS THAN (2025),
+    PARTITION p2025 VALUES LESS THAN (2026),
+    PARTITION p2026 VALUES LESS THAN (2027),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
+
+-- -------------------------------------
+-- Table: case_lawyer_xref_archive
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS case_lawyer_xref_archive (
+    id INT PRIMARY KEY,
+    case_id INT NOT NULL,
+    lawyer_id INT NOT NULL,
+    role VARCHAR(100) NOT NULL,
+    billable_hours DECIMAL(10,2) DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (lawyer_id) REFERENCES lawyer(lawyer_id),
+
+    INDEX ix_case_lawyer_xref_archive_case_lawyer (case_id, lawyer_id),
+    INDEX ix_case_lawyer_xref_archive_lawyer_case (lawyer_id, case_id)
+);
@@ -0,0 +1,18 @@
+-- Indexes on archived_at for snapshot tombstones.
+--
+-- `main.py snapshot export --incremental` looks up the legal_case and
+-- case_lawyer_xref keys archived since the previous export (archived_at
+-- at or after its watermark) and records them in the new part, so
+-- SnapshotReader drops the copies older parts still hold.
+
+-- -------------------------------------
+-- legal_case_archive
+-- -------------------------------------
+ALTER TABLE legal_case_archive
+    ADD INDEX ix_legal_case_archive_archived_at (archived_at, case_id);
+
+-- -------------------------------------
+-- case_lawyer_xref_archive
+-- -------------------------------------
+ALTER TABLE case_lawyer_xref_archive
+    ADD INDEX ix_case_lawyer_xref_archive_archived_at (archived_at, id);
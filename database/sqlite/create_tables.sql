@@ -0,0 +1,167 @@
+-- SQLite translation of database/migrations 001-008 for the "sqlite"
+-- backend (SQLitePersistenceWrapper runs it when it opens a database).
+--
+-- Keep in step with the MySQL migrations. Differences:
+--   INT AUTO_INCREMENT PRIMARY KEY -> INTEGER PRIMARY KEY AUTOINCREMENT
+--   CURDATE()                      -> date('now')
+--   FULLTEXT indexes (003)         -> none; MATCH ... AGAINST is evaluated
+--                                     by the ft_match() SQL function
+--   ON UPDATE CURRENT_TIMESTAMP    -> an AFTER UPDATE trigger per table (005)
+--   PARTITION BY RANGE (007)       -> none
+-- DATE, TIMESTAMP and DECIMAL keep their declared types so values come
+-- back as date, datetime and Decimal like they do from MySQL.
+
+-- -------------------------------------
+-- Table: lawyer (001, 002, 005)
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS lawyer (
+    lawyer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_name VARCHAR(100) NOT NULL,
+    last_name VARCHAR(100) NOT NULL,
+    specialization VARCHAR(200) NOT NULL,
+    email VARCHAR(200) NOT NULL UNIQUE,
+    phone VARCHAR(20),
+    hire_date DATE NOT NULL DEFAULT (date('now')),
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_lawyer_last_first ON lawyer (last_name, first_name);
+CREATE INDEX IF NOT EXISTS ix_lawyer_specialization ON lawyer (specialization);
+CREATE INDEX IF NOT EXISTS ix_lawyer_updated_at ON lawyer (updated_at);
+CREATE TRIGGER IF NOT EXISTS tr_lawyer_updated_at AFTER UPDATE ON lawyer
+WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE lawyer SET updated_at = CURRENT_TIMESTAMP WHERE lawyer_id = NEW.lawyer_id;
+END;
+
+-- -------------------------------------
+-- Table: legal_case (001, 002, 005)
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS legal_case (
+    case_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    case_name VARCHAR(255) NOT NULL,
+    client_name VARCHAR(255) NOT NULL,
+    case_status VARCHAR(100) NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NULL,
+    description TEXT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_legal_case_status_case ON legal_case (case_status, case_id);
+CREATE INDEX IF NOT EXISTS ix_legal_case_status_start ON legal_case (case_status, start_date);
+CREATE INDEX IF NOT EXISTS ix_legal_case_start_date ON legal_case (start_date);
+CREATE INDEX IF NOT EXISTS ix_legal_case_updated_at ON legal_case (updated_at);
+CREATE TRIGGER IF NOT EXISTS tr_legal_case_updated_at AFTER UPDATE ON legal_case
+WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE legal_case SET updated_at = CURRENT_TIMESTAMP WHERE case_id = NEW.case_id;
+END;
+
+-- -------------------------------------
+-- Table: case_lawyer_xref (001, 002, 005)
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS case_lawyer_xref (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    case_id INT NOT NULL,
+    lawyer_id INT NOT NULL,
+    role VARCHAR(100) NOT NULL,
+    billable_hours DECIMAL(10,2) DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (case_id) REFERENCES legal_case(case_id),
+    FOREIGN KEY (lawyer_id) REFERENCES lawyer(lawyer_id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_case_lawyer_xref_case_lawyer
+    ON case_lawyer_xref (case_id, lawyer_id);
+CREATE INDEX IF NOT EXISTS ix_case_lawyer_xref_lawyer_case
+    ON case_lawyer_xref (lawyer_id, case_id);
+CREATE INDEX IF NOT EXISTS ix_case_lawyer_xref_updated_at ON case_lawyer_xref (updated_at);
+CREATE TRIGGER IF NOT EXISTS tr_case_lawyer_xref_updated_at AFTER UPDATE ON case_lawyer_xref
+WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE case_lawyer_xref SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+
+-- -------------------------------------
+-- Time entry ledger (004)
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS time_entry (
+    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    case_id INT NOT NULL,
+    lawyer_id INT NOT NULL,
+    hours DECIMAL(10,2) NOT NULL,
+    work_date DATE NOT NULL,
+    note VARCHAR(500) NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (case_id) REFERENCES legal_case(case_id),
+    FOREIGN KEY (lawyer_id) REFERENCES lawyer(lawyer_id)
+);
+CREATE INDEX IF NOT EXISTS ix_time_entry_case_hours ON time_entry (case_id, hours);
+CREATE INDEX IF NOT EXISTS ix_time_entry_lawyer_hours ON time_entry (lawyer_id, hours);
+
+CREATE TABLE IF NOT EXISTS case_hours_total (
+    case_id INTEGER PRIMARY KEY,
+    total_hours DECIMAL(14,2) NOT NULL DEFAULT 0,
+    entry_count BIGINT NOT NULL DEFAULT 0,
+
+    FOREIGN KEY (case_id) REFERENCES legal_case(case_id)
+);
+
+CREATE TABLE IF NOT EXISTS lawyer_hours_total (
+    lawyer_id INTEGER PRIMARY KEY,
+    total_hours DECIMAL(14,2) NOT NULL DEFAULT 0,
+    entry_count BIGINT NOT NULL DEFAULT 0,
+
+    FOREIGN KEY (lawyer_id) REFERENCES lawyer(lawyer_id)
+);
+
+-- -------------------------------------
+-- Table: write_behind_batch (006)
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS write_behind_batch (
+    batch_id VARCHAR(64) PRIMARY KEY,
+    entries INT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- -------------------------------------
+-- Table: legal_case_archive (007)
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS legal_case_archive (
+    case_id INT NOT NULL,
+    case_name VARCHAR(255) NOT NULL,
+    client_name VARCHAR(255) NOT NULL,
+    case_status VARCHAR(100) NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NULL,
+    description TEXT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (case_id, start_date)
+);
+CREATE INDEX IF NOT EXISTS ix_legal_case_archive_status_case
+    ON legal_case_archive (case_status, case_id);
+
+-- -------------------------------------
+-- Table: case_lawyer_xref_archive (007)
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS case_lawyer_xref_archive (
+    id INTEGER PRIMARY KEY,
+    case_id INT NOT NULL,
+    lawyer_id INT NOT NULL,
+    role VARCHAR(100) NOT NULL,
+    billable_hours DECIMAL(10,2) DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (lawyer_id) REFERENCES lawyer(lawyer_id)
+);
+CREATE INDEX IF NOT EXISTS ix_case_lawyer_xref_archive_case_lawyer
+    ON case_lawyer_xref_archive (case_id, lawyer_id);
+CREATE INDEX IF NOT EXISTS ix_case_lawyer_xref_archive_lawyer_case
+    ON case_lawyer_xref_archive (lawyer_id, case_id);
+CREATE INDEX IF NOT EXISTS ix_legal_case_archive_archived_at
+    ON legal_case_archive (archived_at, case_id);
+CREATE INDEX IF NOT EXISTS ix_case_lawyer_xref_archive_archived_at
+    ON case_lawyer_xref_archive (archived_at, id);
@@ -0,0 +1,90 @@
+"""
+Compare sync vs AsyncAppServices throughput as in-flight requests grow.
+
+Runs get_case_with_lawyers (roster cache disabled, so every call hits
+MySQL) for random case_ids: first sequentially through AppServices, then
+through AsyncAppServices at increasing in-flight limits.
+
+    ./bench.sh async_throughput -c config/legal_case_app_config.json
+"""
+
+from argparse import ArgumentParser
+import asyncio
+import copy
+import json
+import random
+import time
+
+from legal_case_app.service_layer.app_services import AppServices
+from legal_case_app.service_layer.async_app_services import AsyncAppServices
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-c", "--configfile", required=True)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument(
+        "--in-flight",
+        default="1,2,4,8,16",
+        help="Comma-separated in-flight limits to try (capped at the pool capacity).",
+    )
+    return parser.parse_args()
+
+
+def run_sync(services, case_ids):
+    started = time.perf_counter()
+    for case_id in case_ids:
+        services.get_case_with_lawyers(case_id)
+    return time.perf_counter() - started
+
+
+async def run_async(async_services, case_ids):
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(async_services.get_case_with_lawyers(case_id) for case_id in case_ids)
+    )
+    return time.perf_counter() - started
+
+
+def main():
+    args = parse_args()
+    with open(args.configfile, "r") as file:
+        config = json.load(file)
+
+    # Measure the database, not the cache
+    config = copy.deepcopy(config)
+    config.setdefault("cache", {}).setdefault("case_roster", {})["max_entries"] = 0
+
+    services = AppServices(config)
+    max_case_id = services.fetch_all(
+        "SELECT COALESCE(MAX(case_id), 0) AS max_id FROM legal_case;"
+    )[0]["max_id"]
+    if not max_case_id:
+        raise SystemExit("legal_case is empty; seed the database first.")
+    case_ids = [random.randint(1, max_case_id) for _ in range(args.requests)]
+
+    results = []
+    seconds = run_sync(services, case_ids)
+    results.append({"mode": "sync", "in_flight": 1, "seconds": seconds,
+                    "requests_per_sec": args.requests / seconds})
+
+    for in_flight in [int(value) for value in args.in_flight.split(",")]:
+        async_services = AsyncAppServices(config, services, max_in_flight=in_flight)
+        try:
+            seconds = asyncio.run(run_async(async_services, case_ids))
+        finally:
+            async_services.close()
+        results.append({"mode": "async", "in_flight": in_flight, "seconds": seconds,
+                        "requests_per_sec": args.requests / seconds})
+
+    baseline = results[0]["requests_per_sec"]
+    print(f"{'mode':<6} {'in_flight':>9} {'req/s':>10} {'vs sync':>8}")
+    for row in results:
+        row["speedup_vs_sync"] = row["requests_per_sec"] / baseline
+        print(f"{row['mode']:<6} {row['in_flight']:>9} "
+              f"{row['requests_per_sec']:>10.0f} {row['speedup_vs_sync']:>7.2f}x")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
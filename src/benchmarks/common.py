@@ -0,0 +1,75 @@
+"""Helpers shared by the benchmark scripts."""
+
+import copy
+import datetime
+import json
+import platform
+import resource
+import subprocess
+import sys
+
+
+def load_config(path: str, disable_cache: bool = True) -> dict:
+    """Read an app config; by default turn the roster cache off so reads hit MySQL."""
+    with open(path, "r") as file:
+        config = json.load(file)
+    config = copy.deepcopy(config)
+    if disable_cache:
+        config.setdefault("cache", {}).setdefault("case_roster", {})["max_entries"] = 0
+    return config
+
+
+def percentiles(samples, points=(50, 95, 99)) -> dict:
+    """Nearest-rank percentiles (in milliseconds) of latency samples in seconds."""
+    ordered = sorted(samples)
+    result = {}
+    for point in points:
+        if not ordered:
+            result[f"p{point}_ms"] = 0.0
+            continue
+        rank = max(1, -(-len(ordered) * point // 100))
+        result[f"p{point}_ms"] = ordered[int(rank) - 1] * 1000
+    return result
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def git_commit() -> str:
+    """Current commit hash, so results can be diffed between commits."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run_metadata() -> dict:
+    """Commit, time and host details stored with every result file."""
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def write_json(results: dict, path=None):
+    """Write results to path, or print them if no path is given."""
+    text = json.dumps(results, indent=2, default=str)
+    if path:
+        with open(path, "w") as file:
+            file.write(text + "\n")
+        print(f"Results written to {path}")
+    else:
+        print(text)
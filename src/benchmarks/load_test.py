@@ -0,0 +1,178 @@
+"""
+Drive every AppServices method under single- and multi-threaded load.
+
+Expects a database seeded by benchmarks.seed_dataset. Each operation is run
+for --duration seconds per thread count; the output JSON has throughput,
+p50/p95/p99 latency and error counts per operation, plus peak RSS, so runs
+from two commits can be diffed directly.
+
+    ./bench.sh load_test -c config/legal_case_app_config.json --threads 1,8 -o before.json
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+import time
+
+from benchmarks.common import (
+    load_config,
+    peak_rss_mb,
+    percentiles,
+    run_metadata,
+    write_json,
+)
+from legal_case_app.service_layer.app_services import AppServices
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-c", "--configfile", required=True)
+    parser.add_argument("--threads", default="1,8", help="Comma-separated thread counts.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per operation.")
+    parser.add_argument("--ops", default=None, help="Comma-separated subset of operations.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Leave the roster cache on (default: off, so every read hits MySQL).",
+    )
+    parser.add_argument("-o", "--output", default=None)
+    return parser.parse_args()
+
+
+def build_operations(services: AppServices, max_lawyer_id: int, max_case_id: int) -> dict:
+    """Name -> callable(rng) for every service method under test."""
+    counter = iter(range(1, 1 << 62))
+    counter_lock = threading.Lock()
+
+    def unique():
+        with counter_lock:
+            return next(counter)
+
+    def random_case(rng):
+        return rng.randint(1, max_case_id)
+
+    def random_lawyer(rng):
+        return rng.randint(1, max_lawyer_id)
+
+    def first_pages(iterator, pages=5):
+        for _ in range(pages):
+            if next(iterator, None) is None:
+                break
+
+    operations = {
+        "iter_lawyers": lambda rng: first_pages(services.iter_lawyers()),
+        "iter_cases": lambda rng: first_pages(services.iter_cases()),
+        "iter_case_lawyers": lambda rng: first_pages(services.iter_case_lawyers()),
+        "get_case_with_lawyers": lambda rng: services.get_case_with_lawyers(random_case(rng)),
+        "get_cases_with_lawyers": lambda rng: services.get_cases_with_lawyers(
+            [random_case(rng) for _ in range(100)]
+        ),
+        "add_lawyer": lambda rng: services.add_lawyer(
+            "Load", "Tester", "Benchmarking", f"load{time.time_ns()}.{unique()}@bench.example"
+        ),
+        "add_case": lambda rng: services.add_case(
+            f"Load case {unique()}", "Load Client", "Open", "2025-01-01"
+        ),
+        # Random pairs can hit the unique (case_id, lawyer_id) key; those
+        # show up as errors rather than aborting the run.
+        "assign_lawyer_to_case": lambda rng: services.assign_lawyer_to_case(
+            random_case(rng), random_lawyer(rng), "Load", 1.0
+        ),
+        "iter_case_rosters_by_status": lambda rng: first_pages(
+            services.iter_case_rosters_by_status(rng.choice(("Open", "Pending"))), 1
+        ),
+    }
+    for name in services.BILLABLE_HOURS_REPORTS:
+        operations[f"report_{name}"] = (
+            lambda rng, name=name: services.get_billable_hours_report(name)
+        )
+    return operations
+
+
+def run_operation(operation, threads: int, duration: float, seed: int) -> dict:
+    """Call operation from threads workers for duration seconds."""
+    deadline = time.perf_counter() + duration
+
+    def worker(worker_id):
+        rng = random.Random(seed + worker_id)
+        latencies = []
+        errors = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                operation(rng)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [sample for samples, _ in results for sample in samples]
+    result = {
+        "threads": threads,
+        "seconds": elapsed,
+        "calls": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+    }
+    result.update(percentiles(latencies))
+    return result
+
+
+def main():
+    args = parse_args()
+    config = load_config(args.configfile, disable_cache=not args.cache)
+    services = AppServices(config)
+
+    bounds = services.fetch_all(
+        "SELECT (SELECT MAX(lawyer_id) FROM lawyer) AS max_lawyer_id, "
+        "(SELECT MAX(case_id) FROM legal_case) AS max_case_id;"
+    )[0]
+    if not bounds["max_lawyer_id"] or not bounds["max_case_id"]:
+        raise SystemExit("Database is empty; run benchmarks.seed_dataset first.")
+
+    operations = build_operations(
+        services, bounds["max_lawyer_id"], bounds["max_case_id"]
+    )
+    if args.ops:
+        wanted = args.ops.split(",")
+        unknown = set(wanted) - set(operations)
+        if unknown:
+            raise SystemExit(f"Unknown operations: {', '.join(sorted(unknown))}")
+        operations = {name: operations[name] for name in wanted}
+
+    results = []
+    for threads in [int(value) for value in args.threads.split(",")]:
+        for name, operation in operations.items():
+            result = run_operation(operation, threads, args.duration, args.seed)
+            result["operation"] = name
+            results.append(result)
+            print(
+                f"{name:<24} threads={threads:<3} "
+                f"{result['ops_per_sec']:>9.1f} ops/s  "
+                f"p50={result['p50_ms']:.2f}ms p95={result['p95_ms']:.2f}ms "
+                f"p99={result['p99_ms']:.2f}ms errors={result['errors']}"
+            )
+
+    write_json(
+        {
+            "benchmark": "load_test",
+            "meta": run_metadata(),
+            "params": vars(args),
+            "results": results,
+            "pool": services.get_pool_metrics(),
+            "peak_rss_mb": peak_rss_mb(),
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
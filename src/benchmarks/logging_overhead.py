@@ -0,0 +1,126 @@
+"""
+Measure the per-call cost of LoggingService on the calling thread.
+
+Compares the synchronous handlers with the QueueHandler mode (log_async)
+and eager f-string messages with lazy %s arguments when the level is
+disabled. Calls are made in bursts with an untimed pause in between, as
+in a request path that logs a few lines per request; a tight loop would
+just measure the listener thread competing for the GIL. Log files go to
+a temporary directory; nothing touches MySQL.
+
+    ./bench.sh logging_overhead --calls 200000 -o logging.json
+"""
+
+from argparse import ArgumentParser
+import tempfile
+import time
+
+from benchmarks.common import run_metadata, write_json
+from legal_case_app.logging import LoggingService, dropped_log_records
+
+
+# A payload about the size of the DB config dumped at startup
+PAYLOAD = {
+    "database": "legal_case_roster_db",
+    "user": "legal_case_user",
+    "host": "localhost",
+    "port": 3306,
+}
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--burst", type=int, default=100, help="Calls per timed burst.")
+    parser.add_argument(
+        "--pause", type=float, default=0.005,
+        help="Untimed seconds between bursts (lets the queue drain).",
+    )
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument(
+        "--overflow", choices=["drop", "block"], default="block",
+        help="Queue overflow policy for the async scenario (default: block, "
+        "so every record is written).",
+    )
+    parser.add_argument("-o", "--output", default=None)
+    return parser.parse_args()
+
+
+def make_logger(name: str, logs_dir: str, level: str, log_async: bool, args):
+    settings = {
+        "logs_dir": logs_dir,
+        "log_filename": f"{name}.log",
+        "log_level": level,
+        "log_to_console": False,
+        "log_to_file": True,
+        "deployed_to_production": False,
+        "log_async": log_async,
+        "log_queue_size": args.queue_size,
+        "log_queue_overflow": args.overflow,
+        "log_format": "text",
+    }
+    return LoggingService(f"bench.{name}", "bench", settings=settings)
+
+
+def time_calls(calls: int, burst: int, pause: float, call) -> float:
+    """Mean seconds per call(i), timing bursts of calls only."""
+    elapsed = 0.0
+    for start in range(0, calls, burst):
+        started = time.perf_counter()
+        for i in range(start, min(start + burst, calls)):
+            call(i)
+        elapsed += time.perf_counter() - started
+        time.sleep(pause)
+    return elapsed / calls
+
+
+def main():
+    args = parse_args()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as logs_dir:
+        scenarios = {
+            # Level disabled: the f-string is still built, %s args are not
+            "disabled_fstring": (
+                make_logger("disabled_fstring", logs_dir, "error", False, args),
+                lambda logger, i: logger.log_debug(f"call {i}: config {PAYLOAD}"),
+            ),
+            "disabled_lazy": (
+                make_logger("disabled_lazy", logs_dir, "error", False, args),
+                lambda logger, i: logger.log_debug("call %d: config %s", i, PAYLOAD),
+            ),
+            # Level enabled: file write on the caller vs. enqueue only
+            "sync_file": (
+                make_logger("sync_file", logs_dir, "debug", False, args),
+                lambda logger, i: logger.log_debug("call %d: config %s", i, PAYLOAD),
+            ),
+            "async_queue": (
+                make_logger("async_queue", logs_dir, "debug", True, args),
+                lambda logger, i: logger.log_debug("call %d: config %s", i, PAYLOAD),
+            ),
+        }
+
+        for name, (logger, call) in scenarios.items():
+            # Warm up (opens the handlers / starts the listener)
+            call(logger, 0)
+            seconds = time_calls(
+                args.calls, args.burst, args.pause, lambda i: call(logger, i)
+            )
+            results[name] = {"us_per_call": seconds * 1e6}
+            print(f"{name:<18} {seconds * 1e6:>8.2f} us/call")
+
+        results["async_queue"]["dropped"] = dropped_log_records()
+
+    write_json(
+        {
+            "benchmark": "logging_overhead",
+            "meta": run_metadata(),
+            "params": vars(args),
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Compare fetch_all/stream_rows modes against today's defaults.
+
+Each mode is an AppServices built with different settings (pure-Python
+vs C extension protocol, prepared statements on/off) and a row format
+(dict, tuple, record). Every mode runs the same workloads against a
+database seeded by benchmarks.seed_dataset:
+
+    point  one case roster by random case_id (ROSTER_SQL)
+    page   one keyset page of lawyers
+    scan   the whole lawyer table, fetch_all vs. stream_rows (with peak
+           Python memory from tracemalloc)
+
+    ./bench.sh query_modes -c config/legal_case_app_config.json -o modes.json
+"""
+
+from argparse import ArgumentParser
+import copy
+import random
+import time
+import tracemalloc
+
+from benchmarks.common import load_config, percentiles, run_metadata, write_json
+from legal_case_app.service_layer.app_services import AppServices
+
+
+# name -> (pool use_pure, prepared_statements, row_format)
+MODES = {
+    "baseline_pure_dict": (True, False, "dict"),
+    "pure_tuple": (True, False, "tuple"),
+    "pure_record": (True, False, "record"),
+    "pure_prepared_dict": (True, True, "dict"),
+    "pure_prepared_tuple": (True, True, "tuple"),
+    "cext_dict": (False, False, "dict"),
+    "cext_tuple": (False, False, "tuple"),
+    "cext_prepared_tuple": (False, True, "tuple"),
+}
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-c", "--configfile", required=True)
+    parser.add_argument("--calls", type=int, default=2000, help="Calls per point/page run.")
+    parser.add_argument("--modes", default=None, help="Comma-separated subset of modes.")
+    parser.add_argument("--no-scan", action="store_true", help="Skip the full-table scan.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", default=None)
+    return parser.parse_args()
+
+
+def build_services(config: dict, use_pure: bool, prepared: bool) -> AppServices:
+    config = copy.deepcopy(config)
+    config["database"]["pool"]["use_pure"] = use_pure
+    config.setdefault("service", {})["prepared_statements"] = prepared
+    if prepared:
+        # reset_session on check-in deallocates the prepared statements,
+        # so every call would re-prepare
+        config["database"]["pool"]["reset_session"] = False
+    return AppServices(config)
+
+
+def time_calls(calls: int, call) -> dict:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(calls):
+        call_started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    result = {"calls": calls, "ops_per_sec": calls / elapsed if elapsed else 0.0}
+    result.update(percentiles(latencies))
+    return result
+
+
+def run_scan(services: AppServices, row_format: str) -> dict:
+    """Whole lawyer table: buffered fetch_all vs. unbuffered stream_rows."""
+    query = f"SELECT {', '.join(services.LAWYER_COLUMNS)} FROM lawyer;"
+    results = {}
+    for name, scan in (
+        ("fetch_all", lambda: len(services.fetch_all(query, row_format=row_format))),
+        ("stream_rows", lambda: sum(
+            len(batch) for batch in services.stream_rows(query, row_format=row_format)
+        )),
+    ):
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = scan()
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds if seconds else 0.0,
+            "peak_python_mb": peak / (1024 * 1024),
+        }
+    return results
+
+
+def main():
+    args = parse_args()
+    config = load_config(args.configfile)
+
+    modes = MODES
+    if args.modes:
+        modes = {name: MODES[name] for name in args.modes.split(",")}
+
+    results = {}
+    for name, (use_pure, prepared, row_format) in modes.items():
+        try:
+            services = build_services(config, use_pure, prepared)
+            bounds = services.fetch_all(
+                "SELECT MAX(case_id) AS max_case_id FROM legal_case;"
+            )[0]
+        except ImportError as e:
+            # The C extension modes need mysql-connector-python's binary wheel
+            print(f"{name:<22} skipped: {e}")
+            results[name] = {"skipped": str(e)}
+            continue
+
+        rng = random.Random(args.seed)
+        max_case_id = bounds["max_case_id"] or 1
+        roster_query = services.ROSTER_SQL.format(
+            source="legal_case", where="WHERE lc.case_id = %s"
+        )
+        page_query = services._keyset_query("lawyer", "lawyer_id", services.LAWYER_COLUMNS)
+
+        result = {
+            "point": time_calls(args.calls, lambda: services.fetch_all(
+                roster_query, (rng.randint(1, max_case_id),), row_format=row_format
+            )),
+            "page": time_calls(args.calls, lambda: services.fetch_all(
+                page_query, (rng.randint(0, 1000), services.page_size),
+                row_format=row_format,
+            )),
+        }
+        if not args.no_scan:
+            result["scan"] = run_scan(services, row_format)
+        results[name] = result
+        services.db.close()
+
+        print(
+            f"{name:<22} point {result['point']['ops_per_sec']:>8.0f} ops/s "
+            f"p50={result['point']['p50_ms']:.2f}ms  "
+            f"page {result['page']['ops_per_sec']:>7.0f} ops/s "
+            f"p50={result['page']['p50_ms']:.2f}ms"
+        )
+
+    write_json(
+        {
+            "benchmark": "query_modes",
+            "meta": run_metadata(),
+            "params": vars(args),
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare the memory and build time of one large result in each row shape.
+
+No database is needed: a synthetic lawyer result of --rows tuples (the
+shape the connector returns) is converted to each representation the
+service layer can hand out, and tracemalloc measures what it retains:
+
+    tuple     raw cursor tuples
+    dict      one dict per row (row_format 'dict')
+    record    __slots__ records (row_format 'record')
+    model     slotted Lawyer dataclasses (get_all_lawyers, iter_lawyers)
+    columnar  {column: array/list} from to_columns (report columnar=True)
+
+    ./bench.sh row_models --rows 1000000 -o row_models.json
+"""
+
+from argparse import ArgumentParser
+import datetime
+import time
+import tracemalloc
+
+from benchmarks.common import run_metadata, write_json
+from legal_case_app.models import Lawyer
+from legal_case_app.persistence_layer.row_formats import convert_rows, to_columns
+
+
+SHAPES = {
+    "dict": lambda rows: convert_rows(rows, Lawyer.COLUMNS, "dict"),
+    "record": lambda rows: convert_rows(rows, Lawyer.COLUMNS, "record"),
+    "model": Lawyer.from_rows,
+    "columnar": lambda rows: to_columns(rows, Lawyer.COLUMNS),
+}
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("-o", "--output", default=None)
+    return parser.parse_args()
+
+
+def synthetic_rows(count: int) -> list:
+    hired = datetime.date(2020, 1, 1)
+    return [
+        (
+            lawyer_id,
+            f"First{lawyer_id % 5000}",
+            f"Last{lawyer_id % 20000}",
+            "Tax Law",
+            f"lawyer{lawyer_id}@example.com",
+            None,
+            hired,
+        )
+        for lawyer_id in range(1, count + 1)
+    ]
+
+
+def measure(build) -> dict:
+    """Retained bytes and seconds of build(); the result is kept alive until measured."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - started
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"seconds": seconds, "retained_mb": retained / (1024 * 1024)}
+
+
+def main():
+    args = parse_args()
+
+    # The tuples are measured while being built; every other shape is
+    # measured on top of them, so its number is the cost of the conversion
+    results = {"tuple": measure(lambda: synthetic_rows(args.rows))}
+    rows = synthetic_rows(args.rows)
+    for name, build in SHAPES.items():
+        results[name] = measure(lambda build=build: build(rows))
+
+    for name, result in results.items():
+        result["bytes_per_row"] = result["retained_mb"] * 1024 * 1024 / args.rows
+        print(
+            f"{name:<9} {result['retained_mb']:>9.1f} MiB "
+            f"{result['bytes_per_row']:>7.0f} B/row  {result['seconds']:.2f}s"
+        )
+
+    write_json(
+        {
+            "benchmark": "row_models",
+            "meta": run_metadata(),
+            "params": vars(args),
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
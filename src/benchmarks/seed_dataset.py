@@ -0,0 +1,181 @@
+"""
+Seed a synthetic benchmark dataset into a local MySQL/MariaDB instance.
+
+Applies database/migrations first, so the tables match the application
+schema, then bulk-inserts lawyers, cases and assignments in batches.
+The data is deterministic for a given --seed.
+
+    ./bench.sh seed_dataset -c config/legal_case_app_config.json \\
+        --lawyers 100000 --cases 1000000 --assignments 5000000 --reset
+
+Point the config at a scratch database: seeding empties the tables.
+"""
+
+from argparse import ArgumentParser
+import datetime
+import random
+import time
+
+from benchmarks.common import load_config, peak_rss_mb, run_metadata, write_json
+from legal_case_app.persistence_layer.migration_runner import MigrationRunner
+from legal_case_app.service_layer.app_services import AppServices
+
+
+SPECIALIZATIONS = (
+    "Corporate Law", "Criminal Defense", "Family Law", "Tax Law",
+    "Intellectual Property", "Employment Law", "Real Estate", "Immigration",
+)
+STATUSES = ("Open", "Pending", "In Progress", "Closed")
+ROLES = ("Lead", "Consultant", "Associate", "Paralegal Supervisor")
+FIRST_NAMES = (
+    "Jordan", "Sara", "David", "Maria", "Wei", "Aisha", "Liam", "Olga",
+    "Kenji", "Fatima", "Noah", "Priya", "Diego", "Hannah", "Tariq", "Elena",
+)
+LAST_NAMES = (
+    "Miles", "Patel", "Nguyen", "Garcia", "Chen", "Okafor", "Smith", "Ivanova",
+    "Tanaka", "Haddad", "Brown", "Sharma", "Lopez", "Schmidt", "Khan", "Rossi",
+)
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-c", "--configfile", required=True)
+    parser.add_argument("--lawyers", type=int, default=100_000)
+    parser.add_argument("--cases", type=int, default=1_000_000)
+    parser.add_argument("--assignments", type=int, default=5_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Allow deleting existing rows (required if the tables are not empty).",
+    )
+    parser.add_argument("-o", "--output", default=None, help="Write timings as JSON.")
+    return parser.parse_args()
+
+
+def reset_tables(services: AppServices):
+    """Empty the tables and restart their AUTO_INCREMENT counters at 1."""
+    cnx = services.db.get_connection()
+    cursor = cnx.cursor()
+    try:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0;")
+        # Everything that references lawyer or legal_case goes too, or
+        # stale ledger, archive and write-behind rows would outlive them
+        for table in (
+            "time_entry", "case_hours_total", "lawyer_hours_total",
+            "case_lawyer_xref_archive", "legal_case_archive", "write_behind_batch",
+            "case_lawyer_xref", "legal_case", "lawyer",
+        ):
+            cursor.execute(f"TRUNCATE TABLE {table};")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1;")
+    finally:
+        cursor.close()
+        cnx.close()
+
+
+def insert_in_batches(services: AppServices, query: str, rows, batch_size: int) -> float:
+    """executemany rows in batches; returns elapsed seconds."""
+    started = time.perf_counter()
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            services.execute_many(query, batch)
+            batch = []
+    if batch:
+        services.execute_many(query, batch)
+    return time.perf_counter() - started
+
+
+def lawyer_rows(rng: random.Random, count: int):
+    for n in range(1, count + 1):
+        yield (
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            rng.choice(SPECIALIZATIONS),
+            f"lawyer{n}@bench.example",
+            f"555-{n % 10000:04d}",
+        )
+
+
+def case_rows(rng: random.Random, count: int):
+    first_day = datetime.date(2015, 1, 1).toordinal()
+    last_day = datetime.date(2025, 12, 31).toordinal()
+    for n in range(1, count + 1):
+        start = datetime.date.fromordinal(rng.randint(first_day, last_day))
+        status = rng.choice(STATUSES)
+        end = None
+        if status == "Closed":
+            end = start + datetime.timedelta(days=rng.randint(30, 900))
+        yield (
+            f"Matter {n}: {rng.choice(LAST_NAMES)} v. {rng.choice(LAST_NAMES)}",
+            f"Client {rng.randint(1, count // 4 + 1)}",
+            status,
+            start.isoformat(),
+            end.isoformat() if end else None,
+            None,
+        )
+
+
+def assignment_rows(rng: random.Random, cases: int, lawyers: int, count: int):
+    """Spread count assignments over the cases, distinct lawyers per case."""
+    per_case, extra = divmod(count, cases)
+    for case_id in range(1, cases + 1):
+        team = per_case + (1 if case_id <= extra else 0)
+        for lawyer_id in rng.sample(range(1, lawyers + 1), min(team, lawyers)):
+            yield (
+                case_id,
+                lawyer_id,
+                rng.choice(ROLES),
+                round(rng.uniform(0.5, 400.0), 2),
+            )
+
+
+def main():
+    args = parse_args()
+    config = load_config(args.configfile)
+    rng = random.Random(args.seed)
+
+    MigrationRunner(config).migrate()
+    services = AppServices(config)
+
+    existing = services.fetch_all("SELECT COUNT(*) AS n FROM lawyer;")[0]["n"]
+    if existing and not args.reset:
+        raise SystemExit("Tables are not empty; re-run with --reset to replace them.")
+    # Always truncate so AUTO_INCREMENT ids start at 1; the generators rely on it
+    reset_tables(services)
+
+    timings = {}
+    timings["lawyers_seconds"] = insert_in_batches(
+        services, services.INSERT_LAWYER_SQL, lawyer_rows(rng, args.lawyers), args.batch_size
+    )
+    print(f"Inserted {args.lawyers} lawyers in {timings['lawyers_seconds']:.1f}s")
+
+    timings["cases_seconds"] = insert_in_batches(
+        services, services.INSERT_CASE_SQL, case_rows(rng, args.cases), args.batch_size
+    )
+    print(f"Inserted {args.cases} cases in {timings['cases_seconds']:.1f}s")
+
+    timings["assignments_seconds"] = insert_in_batches(
+        services,
+        services.INSERT_CASE_LAWYER_SQL,
+        assignment_rows(rng, args.cases, args.lawyers, args.assignments),
+        args.batch_size,
+    )
+    print(f"Inserted {args.assignments} assignments in {timings['assignments_seconds']:.1f}s")
+
+    write_json(
+        {
+            "benchmark": "seed_dataset",
+            "meta": run_metadata(),
+            "params": vars(args),
+            "timings": timings,
+            "peak_rss_mb": peak_rss_mb(),
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure StatementReportRunner speedup as worker processes are added.
+
+Renders every case's statement (seed the database with seed_dataset
+first) once per worker count, from scratch each time, and reports the
+wall time and the speedup over the first count:
+
+    ./bench.sh statement_runner -c config/legal_case_app_config.json \
+        --workers 1,2,4,8 -o statement_runner.json
+"""
+
+from argparse import ArgumentParser
+import os
+import tempfile
+
+from benchmarks.common import load_config, run_metadata, write_json
+from legal_case_app.service_layer.app_services import AppServices
+from legal_case_app.service_layer.statement_report_runner import StatementReportRunner
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-c", "--configfile", required=True)
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(count) for count in (1, 2, 4, 8) if count <= (os.cpu_count() or 1)),
+        help="Comma-separated worker counts to try (default: powers of two up to the CPU count).",
+    )
+    parser.add_argument("--shard-size", type=int, default=None)
+    parser.add_argument("--format", default="jsonl", choices=["jsonl", "csv"])
+    parser.add_argument("-o", "--output", default=None)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = load_config(args.configfile)
+    services = AppServices(config)
+    runner = StatementReportRunner(config, services)
+
+    results = {"meta": run_metadata(), "cpu_count": os.cpu_count(), "runs": {}}
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in (int(count) for count in args.workers.split(",")):
+            result = runner.run(
+                os.path.join(directory, f"statements.{args.format}"),
+                workers=workers,
+                fmt=args.format,
+                shard_size=args.shard_size,
+                restart=True,
+            )
+            baseline = baseline or result["seconds"]
+            run = {
+                "seconds": result["seconds"],
+                "cases": result["cases"],
+                "shards": result["shards"],
+                "cases_per_sec": result["cases"] / result["seconds"],
+                "speedup": baseline / result["seconds"],
+            }
+            results["runs"][workers] = run
+            print(
+                f"{workers:>3} workers  {run['seconds']:8.2f}s  "
+                f"{run['cases_per_sec']:10.0f} cases/s  x{run['speedup']:.2f}"
+            )
+
+    write_json(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,14 @@
 
 from abc import ABC, abstractmethod
 from legal_case_app.logging import LoggingService
-from legal_case_app.settings import Settings
+from legal_case_app.settings import get_settings
 
 class ApplicationBase(ABC):
     """Implements ApplicationBase class."""
     
     def __init__(self, subclass_name:str, logfile_prefix_name:str)->None:
         """Instantiate instance."""
-        self._settings = Settings().read_settings_file_from_location()
+        self._settings = get_settings()
         self._logger = LoggingService(subclass_name, logfile_prefix_name)
         
        
@@ -0,0 +1,200 @@
+"""
+Batch commands (list-lawyers, add-case, ...) run from the command line,
+from a --script file, or forwarded to the 'serve' daemon with --socket.
+
+Only standard library imports at module level: the --socket client path of
+main.py imports this module and must not load the service layer.
+"""
+
+from argparse import ArgumentParser
+from typing import TYPE_CHECKING
+import json
+import sys
+
+if TYPE_CHECKING:
+    from legal_case_app.service_layer.app_services import AppServices
+
+
+# Top-level options, i.e. everything in the parsed args that is not an
+# argument of the batch command itself
+GLOBAL_OPTIONS = (
+    "configfile", "profile", "test_connection", "startup_report",
+    "startup_budget_ms", "script", "socket", "format", "command",
+)
+
+
+def add_batch_command_parsers(subparsers):
+    """
+    Add the batch commands (list-lawyers, add-case, ...) to subparsers.
+    Used for the command line and for each line of a --script file.
+    """
+    subparsers.add_parser("list-lawyers", help="Print every lawyer.")
+    list_cases_parser = subparsers.add_parser("list-cases", help="Print every case.")
+
+    view_parser = subparsers.add_parser(
+        "view-case", help="Print one case and its assigned lawyers."
+    )
+    view_parser.add_argument("case_id", type=int)
+    for command_parser in (list_cases_parser, view_parser):
+        command_parser.add_argument(
+            "--include-archive",
+            action="store_true",
+            help="Also look in the archive of closed cases.",
+        )
+
+    for name, what in (("search-lawyers", "lawyers"), ("search-cases", "cases")):
+        search_parser = subparsers.add_parser(
+            name, help=f"Full-text search over {what}, best match first."
+        )
+        search_parser.add_argument("query")
+        search_parser.add_argument("--page", type=int, default=1)
+        search_parser.add_argument("--page-size", type=int, default=None)
+
+    lawyer_parser = subparsers.add_parser("add-lawyer", help="Add a new lawyer.")
+    lawyer_parser.add_argument("first_name")
+    lawyer_parser.add_argument("last_name")
+    lawyer_parser.add_argument("specialization")
+    lawyer_parser.add_argument("email")
+    lawyer_parser.add_argument("--phone", default=None)
+
+    case_parser = subparsers.add_parser("add-case", help="Add a new case.")
+    case_parser.add_argument("case_name")
+    case_parser.add_argument("client_name")
+    case_parser.add_argument("case_status")
+    case_parser.add_argument("start_date", help="YYYY-MM-DD")
+    case_parser.add_argument("--end-date", default=None, help="YYYY-MM-DD")
+    case_parser.add_argument("--description", default=None)
+
+    assign_parser = subparsers.add_parser(
+        "assign", help="Assign a lawyer to a case."
+    )
+    assign_parser.add_argument("case_id")
+    assign_parser.add_argument("lawyer_id")
+    assign_parser.add_argument("role")
+    assign_parser.add_argument("billable_hours")
+
+
+def write_result(headers, rows, output_format: str, file=sys.stdout):
+    """Write one command result as a JSON array or CSV with a header row."""
+    from legal_case_app.persistence_layer.row_formats import json_default
+
+    if output_format == "csv":
+        import csv
+
+        writer = csv.DictWriter(file, fieldnames=headers, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+        return
+
+    # Stream the array so large listings are never held in memory
+    file.write("[")
+    for n, row in enumerate(rows):
+        file.write(",\n " if n else "\n ")
+        file.write(json.dumps(row, default=json_default))
+    file.write("\n]\n")
+
+
+def read_script(path: str):
+    """
+    Yield (line_number, command, args) for each command in a script file.
+    Lines are split like a shell command line; blank lines and lines
+    starting with # are skipped.
+    """
+    import shlex
+
+    parser = ArgumentParser(prog="script", add_help=False)
+    add_batch_command_parsers(parser.add_subparsers(dest="command", required=True))
+
+    file = sys.stdin if path == "-" else open(path, "r")
+    try:
+        for line_number, line in enumerate(file, start=1):
+            words = shlex.split(line, comments=True)
+            if not words:
+                continue
+            try:
+                args = parser.parse_args(words)
+            except SystemExit:
+                raise ValueError(f"line {line_number}: invalid command: {line.strip()}")
+            yield line_number, args.command, vars(args)
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def run_batch_command(config: dict, services: "AppServices", args) -> int:
+    """Run one batch command or a --script file. Returns the exit code."""
+    from legal_case_app.persistence_layer.row_formats import json_default
+    from legal_case_app.service_layer.command_runner import CommandRunner
+
+    runner = CommandRunner(config, services)
+    try:
+        if not args.script:
+            headers, rows = runner.run(args.command, vars(args))
+            write_result(headers, rows, args.format)
+            return 0
+
+        count = 0
+        for line_number, command, headers, rows in runner.run_script(read_script(args.script)):
+            count += 1
+            if args.format == "json":
+                # One JSON document per command (JSON Lines)
+                print(json.dumps(
+                    {"line": line_number, "command": command, "rows": rows},
+                    default=json_default,
+                ))
+            else:
+                print(f"# line {line_number}: {command}")
+                write_result(headers, rows, "csv")
+        print(f"Committed {count} commands.", file=sys.stderr)
+        return 0
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+    except Exception as e:
+        print(f"Database error: {e}", file=sys.stderr)
+    if args.script:
+        print("Script rolled back; no changes were saved.", file=sys.stderr)
+    return 1
+
+
+def run_client(args) -> int:
+    """Forward a batch command or --script to the daemon. Returns the exit code."""
+    from legal_case_app.service_layer.command_protocol import CommandClient
+
+    try:
+        with CommandClient(args.socket) as client:
+            if args.script:
+                script = [
+                    {"line": line_number, "command": command, "args": command_args}
+                    for line_number, command, command_args in read_script(args.script)
+                ]
+                reply = client.request({"script": script})
+            else:
+                command_args = {
+                    key: value for key, value in vars(args).items()
+                    if key not in GLOBAL_OPTIONS
+                }
+                reply = client.request({"command": args.command, "args": command_args})
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"Cannot reach the server on {args.socket}: {e}", file=sys.stderr)
+        return 1
+
+    if not reply["ok"]:
+        print(f"Error: {reply['error']}", file=sys.stderr)
+        if args.script:
+            print("Script rolled back; no changes were saved.", file=sys.stderr)
+        return 1
+
+    if not args.script:
+        write_result(reply["headers"], reply["rows"], args.format)
+        return 0
+    for result in reply["results"]:
+        if args.format == "json":
+            print(json.dumps({key: result[key] for key in ("line", "command", "rows")}))
+        else:
+            print(f"# line {result['line']}: {result['command']}")
+            write_result(result["headers"], result["rows"], "csv")
+    print(f"Committed {len(reply['results'])} commands.", file=sys.stderr)
+    return 0
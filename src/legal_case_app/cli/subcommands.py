@@ -0,0 +1,262 @@
+"""
+Runners for the main.py subcommands (import, migrate, ledger, parity,
+snapshot, archive, statements, report, serve): each calls its service and
+prints a summary.
+
+The service modules are imported inside the runners that use them, so
+importing this module keeps cold start short.
+"""
+
+from typing import TYPE_CHECKING
+import sys
+
+if TYPE_CHECKING:
+    from legal_case_app.service_layer.app_services import AppServices
+
+
+def run_import(config: dict, services: "AppServices", args):
+    """Run the bulk import subcommand and print a summary."""
+    from legal_case_app.service_layer.bulk_import_service import BulkImportService
+
+    importer = BulkImportService(config, services)
+    stats = importer.import_file(
+        args.kind, args.file, rejects_path=args.rejects, batch_size=args.batch_size
+    )
+
+    print(
+        f"Read {stats['read']} rows: {stats['loaded']} loaded, "
+        f"{stats['rejected']} rejected in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_sec']:.0f} rows/sec)."
+    )
+    if stats["rejects_path"]:
+        print(f"Rejected rows written to {stats['rejects_path']}")
+
+
+def run_migrate(config: dict, args) -> int:
+    """Run the migrate subcommand. Returns the process exit code."""
+    from legal_case_app.persistence_layer.migration_runner import MigrationRunner
+    from legal_case_app.service_layer.query_plan_checker import QueryPlanChecker
+
+    if config["database"].get("backend", "mysql") == "sqlite":
+        print("The sqlite backend applies database/sqlite/create_tables.sql itself; nothing to migrate.")
+        return 0
+
+    runner = MigrationRunner(config)
+
+    if args.status:
+        for version, name, state in runner.status():
+            print(f"{version:03d}_{name}: {state}")
+        return 0
+
+    applied = runner.migrate(target=args.target)
+    for version, name in applied:
+        print(f"Applied {version:03d}_{name}")
+    if not applied:
+        print("Database schema is up to date.")
+
+    if args.check_plans:
+        from legal_case_app.service_layer.app_services import AppServices
+
+        checker = QueryPlanChecker(config, AppServices(config))
+        failed = 0
+        for name, ok, problems in checker.check():
+            if ok:
+                print(f"[ok]   {name}")
+            else:
+                failed += 1
+                print(f"[FAIL] {name}: full scan on {', '.join(problems)}")
+        if failed:
+            print(f"{failed} quer{'y' if failed == 1 else 'ies'} fell back to a full table scan.")
+            return 1
+    return 0
+
+
+def run_ledger(config: dict, services: "AppServices", args) -> int:
+    """Run the ledger subcommand. Returns the process exit code."""
+    ledger = services.hours_ledger
+    if args.action == "record":
+        try:
+            entry_id = ledger.record_hours(
+                args.case_id, args.lawyer_id, args.hours, args.work_date, args.note
+            )
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        totals = ledger.get_case_hours(args.case_id)
+        print(
+            f"Recorded entry {entry_id}; case {args.case_id} now has "
+            f"{totals['total_hours']} h over {totals['entry_count']} entries."
+        )
+        return 0
+
+    fix = args.action == "rebuild"
+    drifted = 0
+    for drift in ledger.verify_totals(fix=fix, chunk_size=args.chunk_size):
+        drifted += 1
+        print(
+            f"{drift['scope']} {drift['id']}: stored {drift['stored_hours']} h "
+            f"/ {drift['stored_entries']} entries, ledger {drift['actual_hours']} h "
+            f"/ {drift['actual_entries']} entries"
+        )
+
+    if not drifted:
+        print("All hours totals match the ledger.")
+        return 0
+    if fix:
+        print(f"Corrected {drifted} total{'' if drifted == 1 else 's'}.")
+        return 0
+    print(f"{drifted} total{'' if drifted == 1 else 's'} drifted; run 'ledger rebuild' to correct.")
+    return 1
+
+
+def run_parity(config: dict) -> int:
+    """Run the parity subcommand. Returns the process exit code."""
+    from legal_case_app.service_layer.backend_parity_checker import BackendParityChecker
+
+    if config["database"].get("backend", "mysql") == "sqlite":
+        print("parity compares another backend against sqlite; set database.backend to mysql.")
+        return 1
+
+    try:
+        results = BackendParityChecker(config).check()
+    except ValueError as e:
+        print(e)
+        return 1
+
+    failed = 0
+    for name, ok, expected, actual in results:
+        if ok:
+            print(f"[ok]   {name}")
+        else:
+            failed += 1
+            print(f"[FAIL] {name}:\n  reference: {expected!r}\n  sqlite:    {actual!r}")
+    if failed:
+        print(f"{failed} of {len(results)} steps differ between the backends.")
+        return 1
+    return 0
+
+
+def run_snapshot(config: dict, services: "AppServices", args):
+    """Run the snapshot subcommand and print a summary."""
+    from legal_case_app.service_layer.snapshot_export_service import SnapshotExportService
+
+    exporter = SnapshotExportService(config, services, directory=args.directory)
+    part = exporter.export(incremental=args.incremental)
+    rows = ", ".join(f"{count} {table}" for table, count in part["rows"].items())
+    deleted = ", ".join(
+        f"{count} {table}" for table, count in part["deleted"].items() if count
+    )
+    print(
+        f"Wrote {part['kind']} {part['format']} part {part['part']} "
+        f"to {exporter.directory} in {part['seconds']:.2f}s: {rows} rows"
+        + (f"; archived since the last export: {deleted}." if deleted else ".")
+    )
+
+
+def run_archive(config: dict, services: "AppServices", args):
+    """Run the archive subcommand, printing progress to stderr."""
+    from legal_case_app.service_layer.case_archive_service import CaseArchiveService
+
+    def show_progress(report):
+        print(
+            f"[batch {report['batches']}] {report['cases']} cases, "
+            f"{report['assignments']} assignments archived "
+            f"(up to case_id {report['last_case_id']}), {report['seconds']:.1f}s elapsed",
+            file=sys.stderr,
+        )
+
+    archiver = CaseArchiveService(config, services)
+    result = archiver.archive(
+        older_than_years=args.older_than_years,
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+        progress=show_progress,
+    )
+    more = "" if result["finished"] else " Stopped at --max-batches; run again to continue."
+    print(
+        f"Archived {result['cases']} cases closed before {result['cutoff']} and "
+        f"{result['assignments']} assignments in {result['batches']} batches, "
+        f"{result['seconds']:.2f}s.{more}"
+    )
+
+
+def run_statements(config: dict, services: "AppServices", args):
+    """Run the statements subcommand, printing progress to stderr."""
+    from legal_case_app.service_layer.statement_report_runner import StatementReportRunner
+
+    def show_progress(report):
+        print(
+            f"[{report['shards_done']}/{report['shards_total']} shards] "
+            f"{report['cases']} cases, {report['elapsed_seconds']:.1f}s elapsed, "
+            f"~{report['eta_seconds']:.0f}s left",
+            file=sys.stderr,
+        )
+
+    runner = StatementReportRunner(config, services)
+    result = runner.run(
+        args.output,
+        workers=args.workers,
+        fmt=args.statement_format,
+        shard_size=args.shard_size,
+        restart=args.restart,
+        progress=show_progress,
+    )
+    resumed = f" ({result['resumed_shards']} resumed)" if result["resumed_shards"] else ""
+    print(
+        f"Wrote {result['cases']} statements to {result['output']} from "
+        f"{result['shards']} shards{resumed} in {result['seconds']:.2f}s."
+    )
+
+
+def run_report(services: "AppServices", args):
+    """Run the report subcommand and write the result as CSV."""
+    import csv
+
+    if args.snapshot:
+        from legal_case_app.service_layer.snapshot_reader import SnapshotReader
+
+        if args.include_archive:
+            print("Snapshots hold only the hot tables; --include-archive ignored.",
+                  file=sys.stderr)
+        headers, rows = SnapshotReader(args.snapshot).billable_hours_report(args.name)
+    else:
+        headers, rows = services.get_billable_hours_report(
+            args.name, include_archive=args.include_archive
+        )
+
+    if args.output:
+        with open(args.output, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(headers)
+            writer.writerows(rows)
+        print(f"Wrote {len(rows)} rows to {args.output}")
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def run_server(config: dict, services: "AppServices", args) -> int:
+    """Run the serve subcommand until interrupted."""
+    from legal_case_app.service_layer.command_server import CommandServer
+
+    server = CommandServer(
+        config, services, socket_path=args.serve_socket, workers=args.workers
+    )
+    # Let service managers stop the daemon cleanly (socket file removed)
+    import signal
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.shutdown())
+
+    print(f"Serving on {server.socket_path} with {server.workers} workers (Ctrl-C to stop).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    return 0
+
+
+def print_query_profile(services: "AppServices"):
+    """Print the query latency report to stderr (keeps CSV on stdout clean)."""
+    print("\n--- Query Latency ---", file=sys.stderr)
+    print(services.get_query_profile_report(), file=sys.stderr)
@@ -1,19 +1,135 @@
 """Provides LoggingService convenience class for application logging."""
 
+import atexit
+import datetime
+import json
 import logging
 import logging.handlers
-from legal_case_app.settings import Settings
+from legal_case_app.settings import OPTIONAL_SETTINGS, get_settings
 import os
+import queue
+import threading
+
+# Serializes the one-time handler setup across LoggingService instances
+_handler_setup_lock = threading.Lock()
+
+# Log file path -> (queue handler, listener) when log_async is on, so every
+# logger writing to the same file shares one queue and one writer thread
+_queue_handlers = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue.
+
+    When the queue is full, overflow 'drop' discards the record (counted in
+    dropped) so callers never wait on log I/O; 'block' waits for room.
+    Only the message text is rendered on the calling thread; timestamps,
+    formatting and I/O happen on the listener thread.
+    """
+
+    def __init__(self, log_queue, overflow: str = 'drop'):
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Interpolate args now (they may change later) but leave the
+        # formatter to the listener thread. The record is not shared with
+        # other handlers (loggers don't propagate), so no copy is needed.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.overflow == 'block':
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener whose stop() waits for room in a full queue.
+
+    The stock listener enqueues its stop sentinel with put_nowait, which
+    raises queue.Full at exit if the application logged faster than the
+    listener wrote.
+    """
+
+    STOP_TIMEOUT_SECONDS = 5.0
+
+    def enqueue_sentinel(self):
+        # The listener thread keeps draining, so room appears unless it died
+        self.queue.put(self._sentinel, timeout=self.STOP_TIMEOUT_SECONDS)
+
+
+def _stop_queue_listeners():
+    """Flush queued records and report drops at exit."""
+    while _queue_handlers:
+        # Pop so a second call (an explicit one, then atexit) is a no-op
+        _, (handler, listener) = _queue_handlers.popitem()
+        try:
+            listener.stop()
+        except queue.Full:
+            # Listener is stuck; keep going so the others stop and drops are reported
+            pass
+        if handler.dropped:
+            for output in listener.handlers:
+                output.handle(logging.makeLogRecord({
+                    'name': __name__,
+                    'levelno': logging.WARNING,
+                    'levelname': 'WARNING',
+                    'msg': f'{handler.dropped} log records dropped (queue full)',
+                }))
+
+atexit.register(_stop_queue_listeners)
+
+
+def dropped_log_records() -> int:
+    """Records discarded so far because a log queue was full."""
+    return sum(handler.dropped for handler, _ in _queue_handlers.values())
 
 class LoggingService():
     """Provides logging services."""
 
-    def __init__(self, class_name:str, logfile_prefix_name:str=None)->None:
-        """Initialize instance."""
+    def __init__(self, class_name:str, logfile_prefix_name:str=None,
+                 settings:dict=None)->None:
+        """Initialize instance.
+
+        :param settings: overrides the process-wide app_settings.json
+        """
         
         self._logger = logging.getLogger(class_name)
         self._logger.propagate = False
-        self._settings_dict = Settings().read_settings_file_from_location()
+        self._settings_dict = dict(OPTIONAL_SETTINGS)
+        self._settings_dict.update(settings if settings is not None else get_settings())
         self._logfile_prefix_name = logfile_prefix_name
         self.log_level = logging.ERROR
         
@@ -22,7 +138,7 @@ class LoggingService():
             self.log_level = logging.NOTSET
         elif self._settings_dict['log_level'] == 'debug':
             self._logger.setLevel(logging.DEBUG)
-            self.log_level = logging.debug
+            self.log_level = logging.DEBUG
         elif self._settings_dict['log_level'] == 'info':
             self._logger.setLevel(logging.INFO)
             self.log_level = logging.INFO
@@ -39,45 +155,94 @@ class LoggingService():
             self._logger.setLevel(logging.ERROR)
             self.log_level = logging.ERROR
 
-        self._formatter = \
-                logging.Formatter('%(levelname)s:%(name)s:%(asctime)s:%(message)s')
+        if self._settings_dict['log_format'] == 'json':
+            self._formatter = JsonFormatter()
+        else:
+            self._formatter = \
+                    logging.Formatter('%(levelname)s:%(name)s:%(asctime)s:%(message)s')
 
-        if not self._logger.handlers:
-            if self._settings_dict['log_to_console']:
-                self._ch = logging.StreamHandler()
-                self._ch.setLevel(logging.DEBUG)
-                self._ch.setFormatter(self._formatter)
-                self._logger.addHandler(self._ch)
+        # Handlers (and the log file) are set up on the first message that
+        # is actually emitted, not at construction time.
+        self._handlers_ready = bool(self._logger.handlers)
 
-            if self._settings_dict['log_to_file']:
-                log_file = os.path.join(self._settings_dict['logs_dir'], 
+    def _attach_handlers(self):
+        """Attach console/file handlers to this logger once per process."""
+        with _handler_setup_lock:
+            self._attach_handlers_locked()
+        self._handlers_ready = True
+
+    def _attach_handlers_locked(self):
+        """Caller holds _handler_setup_lock."""
+        if self._logger.handlers:
+            return
+        if not self._settings_dict['log_async']:
+            for handler in self._build_output_handlers():
+                self._logger.addHandler(handler)
+            return
+
+        # One queue and listener thread per log file, shared by all loggers
+        key = self._log_file_path()
+        if key not in _queue_handlers:
+            log_queue = queue.Queue(maxsize=self._settings_dict['log_queue_size'])
+            handler = BoundedQueueHandler(
+                log_queue, self._settings_dict['log_queue_overflow'])
+            listener = DrainingQueueListener(
+                log_queue, *self._build_output_handlers(),
+                respect_handler_level=True)
+            listener.start()
+            _queue_handlers[key] = (handler, listener)
+        self._logger.addHandler(_queue_handlers[key][0])
+
+    def _build_output_handlers(self) -> list:
+        """Console and/or file handlers as configured in settings."""
+        handlers = []
+        if self._settings_dict['log_to_console']:
+            self._ch = logging.StreamHandler()
+            self._ch.setLevel(logging.DEBUG)
+            self._ch.setFormatter(self._formatter)
+            handlers.append(self._ch)
+
+        if self._settings_dict['log_to_file']:
+            self._fh = logging.handlers.TimedRotatingFileHandler(
+                        self._log_file_path(), 
+                        when='midnight', backupCount=20, delay=True)
+            self._fh.setLevel(logging.DEBUG)
+            self._fh.setFormatter(self._formatter)
+            handlers.append(self._fh)
+        return handlers
+
+    def _log_file_path(self) -> str:
+        return os.path.join(self._settings_dict['logs_dir'], 
                             f"{self._logfile_prefix_name}_" \
                             f"{self._settings_dict['log_filename']}")
-                self._fh = logging.handlers.TimedRotatingFileHandler(log_file, 
-                            when='midnight', backupCount=20)
-                self._fh.setLevel(logging.DEBUG)
-                self._fh.setFormatter(self._formatter)
-                self._logger.addHandler(self._fh)
-        
 
-    
-    def log_debug(self, message):
+    def _log(self, level, message, args):
+        """Emit message at level, setting up handlers on first use.
+        message is only %-formatted with args if the level is enabled.
+        """
+        if not self._logger.isEnabledFor(level):
+            return
+        if not self._handlers_ready:
+            self._attach_handlers()
+        self._logger.log(level, message, *args)
+
+    def log_debug(self, message, *args):
         """Log to debug."""
-        self._logger.debug(message)
+        self._log(logging.DEBUG, message, args)
 
-    def log_error(self, message):
+    def log_error(self, message, *args):
         """Log to error."""
-        self._logger.error(message)
+        self._log(logging.ERROR, message, args)
 
-    def log_info(self, message):
+    def log_info(self, message, *args):
         """Log to info."""
-        self._logger.info(message)
+        self._log(logging.INFO, message, args)
 
-    def log_warning(self, message):
+    def log_warning(self, message, *args):
         """Log to warning."""
-        self._logger.warning(message)
+        self._log(logging.WARNING, message, args)
 
-    def log_critical(self, message):
+    def log_critical(self, message, *args):
         """Log to critical."""
-        self._logger.critical(message)
+        self._log(logging.CRITICAL, message, args)
 
@@ -0,0 +1,74 @@
+"""Typed row models for the lawyer, legal_case and case_lawyer_xref tables."""
+
+from dataclasses import dataclass, fields
+from datetime import date
+from decimal import Decimal
+from typing import ClassVar, Optional
+
+
+class _Model():
+    """Shared helpers; subclasses are slotted dataclasses."""
+
+    __slots__ = ()
+
+    COLUMNS: ClassVar[tuple] = ()
+
+    @classmethod
+    def from_rows(cls, rows) -> list:
+        """Build one model per tuple (columns in COLUMNS order)."""
+        return [cls(*row) for row in rows]
+
+    def to_dict(self) -> dict:
+        """Column name -> value, e.g. for JSON or CSV output."""
+        return {name: getattr(self, name) for name in self.COLUMNS}
+
+
+def _columns(model) -> tuple:
+    return tuple(field.name for field in fields(model))
+
+
+@dataclass(slots=True)
+class Lawyer(_Model):
+    """One row of the lawyer table."""
+
+    lawyer_id: int
+    first_name: str
+    last_name: str
+    specialization: str
+    email: str
+    phone: Optional[str]
+    hire_date: date
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+
+@dataclass(slots=True)
+class LegalCase(_Model):
+    """One row of the legal_case table."""
+
+    case_id: int
+    case_name: str
+    client_name: str
+    case_status: str
+    start_date: date
+    end_date: Optional[date]
+    description: Optional[str]
+
+
+@dataclass(slots=True)
+class CaseAssignment(_Model):
+    """One row of the case_lawyer_xref table."""
+
+    id: int
+    case_id: int
+    lawyer_id: int
+    role: str
+    billable_hours: Decimal
+
+
+# Column order of every model, which is also its SELECT list
+Lawyer.COLUMNS = _columns(Lawyer)
+LegalCase.COLUMNS = _columns(LegalCase)
+CaseAssignment.COLUMNS = _columns(CaseAssignment)
@@ -0,0 +1,267 @@
+"""Column files for roster snapshots: Arrow IPC (pyarrow) or raw .npy arrays."""
+
+from array import array
+from datetime import date, datetime
+from decimal import Decimal
+import calendar
+import gzip
+import json
+import os
+import sys
+
+
+FORMATS = ("arrow", "npy")
+
+# Column kinds and how they are stored:
+#   int       int64
+#   decimal   int64 hundredths (every DECIMAL column in the schema has 2 places)
+#   date      days since 1970-01-01 (Arrow date32, NumPy datetime64[D])
+#   timestamp seconds since 1970-01-01 UTC (Arrow timestamp[s], datetime64[s])
+#   str       dictionary-encoded: int32 codes into a list of values
+KINDS = ("int", "decimal", "date", "timestamp", "str")
+
+# NULL in int64 columns; NumPy reads it as NaT in date/timestamp columns
+NULL_INT = -(2 ** 63)
+NULL_CODE = -1
+
+_EPOCH = date(1970, 1, 1)
+_ENDIAN = "<" if sys.byteorder == "little" else ">"
+_NPY_HEADER_BYTES = 128
+
+
+def have_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_format(name: str) -> str:
+    """
+    Map a configured format to "arrow" or "npy".
+
+    "auto" picks Arrow IPC when pyarrow is installed, otherwise .npy files.
+    """
+    if name == "auto":
+        return "arrow" if have_pyarrow() else "npy"
+    if name not in FORMATS:
+        raise ValueError(
+            f"Unknown snapshot format '{name}'. Expected auto or one of: {', '.join(FORMATS)}."
+        )
+    if name == "arrow" and not have_pyarrow():
+        raise ImportError("The arrow snapshot format needs pyarrow (pip install pyarrow).")
+    return name
+
+
+def encode(kind: str, value):
+    """Convert one database value to its stored scalar (None stays None)."""
+    if value is None:
+        return None
+    if kind == "int":
+        return int(value)
+    if kind == "decimal":
+        return int((Decimal(str(value)) * 100).to_integral_value())
+    if kind == "date":
+        if isinstance(value, str):
+            value = date.fromisoformat(value)
+        return (value - _EPOCH).days
+    if kind == "timestamp":
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        return calendar.timegm(value.timetuple())
+    return str(value)
+
+
+# ---------- Writers ----------
+
+class NpyTableWriter():
+    """
+    Writes one table as a directory of .npy files, one per column, that
+    NumPy can memory-map (np.load(..., mmap_mode="r")) and that need
+    nothing but the standard library to write. str columns are an int32
+    <column>.npy of codes plus <column>.values.json.gz.
+    """
+
+    _DESCR = {"int": "i8", "decimal": "i8", "date": "M8[D]", "timestamp": "M8[s]", "str": "i4"}
+
+    def __init__(self, part_dir: str, table: str, columns: tuple, compression=None) -> None:
+        """
+        Initialize instance and create the column files.
+
+        :param columns: ((name, kind), ...)
+        :param compression: ignored; .npy files stay uncompressed so they can be mapped
+        """
+        self.directory = os.path.join(part_dir, table)
+        os.makedirs(self.directory, exist_ok=True)
+        self.columns = columns
+        self.rows = 0
+        self._files = []
+        self._dictionaries = {}
+        for name, kind in columns:
+            file = open(os.path.join(self.directory, f"{name}.npy"), "wb")
+            # Placeholder header, rewritten with the final shape on close()
+            file.write(b"\0" * _NPY_HEADER_BYTES)
+            self._files.append(file)
+            if kind == "str":
+                self._dictionaries[name] = {}
+
+    def write_batch(self, rows: list):
+        """Append rows (tuples in column order) to every column file."""
+        for index, (name, kind) in enumerate(self.columns):
+            if kind == "str":
+                codes = self._dictionaries[name]
+                values = array("i", (
+                    NULL_CODE if row[index] is None
+                    else codes.setdefault(str(row[index]), len(codes))
+                    for row in rows
+                ))
+            else:
+                values = array("q", (
+                    NULL_INT if value is None else value
+                    for value in (encode(kind, row[index]) for row in rows)
+                ))
+            values.tofile(self._files[index])
+        self.rows += len(rows)
+
+    def close(self) -> int:
+        """Finish the column files; returns the number of rows written."""
+        for file, (name, kind) in zip(self._files, self.columns):
+            file.seek(0)
+            file.write(self._npy_header(self._DESCR[kind]))
+            file.close()
+            if kind == "str":
+                path = os.path.join(self.directory, f"{name}.values.json.gz")
+                with gzip.open(path, "wt", encoding="utf-8") as values_file:
+                    json.dump(list(self._dictionaries[name]), values_file)
+        return self.rows
+
+    def _npy_header(self, descr: str) -> bytes:
+        """A .npy v1.0 header for a 1-D array of self.rows values, padded to a fixed size."""
+        header = (
+            f"{{'descr': '{_ENDIAN}{descr}', 'fortran_order': False, "
+            f"'shape': ({self.rows},), }}"
+        )
+        header = header.ljust(_NPY_HEADER_BYTES - 10 - 1) + "\n"
+        return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+
+class ArrowTableWriter():
+    """
+    Writes one table as an Arrow IPC file (<table>.arrow), one record batch
+    per write_batch() call. Readers memory-map the file; with compression
+    (zstd or lz4) each batch is decompressed as it is read.
+    """
+
+    def __init__(self, part_dir: str, table: str, columns: tuple, compression=None) -> None:
+        """
+        Initialize instance and open the file.
+
+        :param columns: ((name, kind), ...)
+        :param compression: "zstd", "lz4" or None
+        """
+        import pyarrow as pa
+
+        self._pa = pa
+        self.columns = columns
+        self.rows = 0
+        self._types = {
+            "int": pa.int64(), "decimal": pa.int64(), "date": pa.date32(),
+            "timestamp": pa.timestamp("s"), "str": pa.string(),
+        }
+        self.schema = pa.schema([
+            pa.field(name, self._types[kind], metadata={"kind": kind})
+            for name, kind in columns
+        ])
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        self._sink = pa.OSFile(os.path.join(part_dir, f"{table}.arrow"), "wb")
+        self._writer = pa.ipc.new_file(self._sink, self.schema, options=options)
+
+    def write_batch(self, rows: list):
+        """Write rows (tuples in column order) as one record batch."""
+        pa = self._pa
+        arrays = []
+        for index, (name, kind) in enumerate(self.columns):
+            values = [encode(kind, row[index]) for row in rows]
+            if kind in ("date", "timestamp"):
+                # Stored scalars are day/second counts: build the int array, then relabel it
+                storage = pa.int32() if kind == "date" else pa.int64()
+                arrays.append(pa.array(values, type=storage).cast(self._types[kind]))
+            else:
+                arrays.append(pa.array(values, type=self._types[kind]))
+        self._writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self) -> int:
+        """Finish the file; returns the number of rows written."""
+        self._writer.close()
+        self._sink.close()
+        return self.rows
+
+
+def open_writer(fmt: str, part_dir: str, table: str, columns: tuple, compression=None):
+    """Return an NpyTableWriter or ArrowTableWriter for one table of one part."""
+    writer_class = ArrowTableWriter if fmt == "arrow" else NpyTableWriter
+    return writer_class(part_dir, table, columns, compression)
+
+
+# ---------- Readers (need NumPy) ----------
+
+def read_table(fmt: str, part_dir: str, table: str, columns: tuple) -> dict:
+    """
+    Map one table of one part.
+
+    :return: {name: ndarray} for numeric columns (int64 with NULL_INT for
+             int/decimal, datetime64 with NaT for date/timestamp) and
+             {name: (int32 codes, list of values)} for str columns
+    """
+    if fmt == "arrow":
+        return _read_arrow(part_dir, table, columns)
+    return _read_npy(part_dir, table, columns)
+
+
+def _read_npy(part_dir: str, table: str, columns: tuple) -> dict:
+    import numpy as np
+
+    directory = os.path.join(part_dir, table)
+    result = {}
+    for name, kind in columns:
+        path = os.path.join(directory, f"{name}.npy")
+        # An empty column can't be memory-mapped (mmap of zero bytes)
+        mmap_mode = "r" if os.path.getsize(path) > _NPY_HEADER_BYTES else None
+        values = np.load(path, mmap_mode=mmap_mode)
+        if kind == "str":
+            with gzip.open(os.path.join(directory, f"{name}.values.json.gz"), "rt",
+                           encoding="utf-8") as values_file:
+                result[name] = (values, json.load(values_file))
+        else:
+            result[name] = values
+    return result
+
+
+def _read_arrow(part_dir: str, table: str, columns: tuple) -> dict:
+    import pyarrow as pa
+
+    source = pa.memory_map(os.path.join(part_dir, f"{table}.arrow"), "r")
+    data = pa.ipc.open_file(source).read_all()
+    result = {}
+    for name, kind in columns:
+        column = data.column(name).combine_chunks()
+        if kind == "str":
+            encoded = column.dictionary_encode()
+            result[name] = (
+                encoded.indices.fill_null(NULL_CODE).to_numpy(zero_copy_only=False),
+                encoded.dictionary.to_pylist(),
+            )
+            continue
+        if kind == "date":
+            column = column.cast(pa.int32()).cast(pa.int64())
+        elif kind == "timestamp":
+            column = column.cast(pa.int64())
+        values = column.fill_null(NULL_INT).to_numpy(zero_copy_only=False)
+        if kind == "date":
+            values = values.view("M8[D]")
+        elif kind == "timestamp":
+            values = values.view("M8[s]")
+        result[name] = values
+    return result
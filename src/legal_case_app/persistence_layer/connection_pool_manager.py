@@ -0,0 +1,287 @@
+
+"""Defines the ConnectionPoolManager class."""
+
+from mysql import connector
+from mysql.connector.errors import PoolError
+from collections import OrderedDict
+import bisect
+import threading
+import time
+
+
+class PooledConnection():
+    """
+    A checked-out connection. Behaves like the underlying MySQL connection;
+    close() hands it back to the ConnectionPoolManager instead of closing it.
+    """
+
+    def __init__(self, manager, cnx, created_at: float) -> None:
+        """Initialize instance."""
+        self._manager = manager
+        self._cnx = cnx
+        self.created_at = created_at
+        self.returned_at = None
+        # SQL -> (prepared cursor, statement), managed by AppServices; lives
+        # as long as the server-side session does
+        self.statement_cache = OrderedDict()
+        # Endpoint name when checked out through ReplicaRouter, else None
+        self.replica = None
+
+    def __getattr__(self, name):
+        # Everything except close() goes straight to the real connection
+        return getattr(self._cnx, name)
+
+    def close(self):
+        """Return the connection to the pool (safe to call twice)."""
+        if self._manager is not None:
+            manager, self._manager = self._manager, None
+            manager._release(self)
+
+
+class ConnectionPoolManager():
+    """
+    Thread-safe MySQL connection pool with blocking checkout and overflow.
+
+    Up to pool_size connections are kept idle for reuse. When all are in use,
+    get_connection() opens up to max_overflow extra connections (closed again
+    when returned), and past that waits up to timeout_seconds for one to be
+    returned before raising PoolError. Connections older than recycle_seconds
+    are replaced, and ones idle for more than pre_ping_idle_seconds are
+    pinged before being handed out. Connections are opened lazily; startup
+    only opens one, retrying with exponential backoff.
+    """
+
+    # Upper bounds (milliseconds) of the checkout wait-time histogram buckets
+    WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self, pool_config: dict, db_config: dict, logger=None) -> None:
+        """
+        Initialize instance and open the first connection.
+
+        :param pool_config: the "database.pool" section of the app config
+        :param db_config: keyword arguments for mysql.connector.connect
+        :param logger: LoggingService for warnings (optional)
+        """
+        self.name = pool_config["name"]
+        self.pool_size = pool_config["size"]
+        self.max_overflow = pool_config.get("max_overflow", 0)
+        self.timeout_seconds = pool_config.get("timeout_seconds", 5.0)
+        self.recycle_seconds = pool_config.get("recycle_seconds", 3600)
+        self.pre_ping_idle_seconds = pool_config.get("pre_ping_idle_seconds", 30)
+        self.reset_session = pool_config.get("reset_session", True)
+        # "auto" picks the C extension when it is installed
+        use_pure = pool_config.get("use_pure", "auto")
+        if use_pure == "auto":
+            use_pure = not connector.HAVE_CEXT
+        self._connect_args = dict(db_config, use_pure=use_pure)
+        self._logger = logger
+
+        self._condition = threading.Condition()
+        self._idle = []
+        self._open = 0
+
+        self._metrics = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "reconnects": 0,
+            "connections_created": 0,
+            "overflow_checkouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+        self._wait_histogram = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+        self._in_use = 0
+        self._in_use_peak = 0
+
+        self._startup(
+            retries=pool_config.get("startup_retries", 5),
+            backoff_seconds=pool_config.get("startup_backoff_seconds", 0.5),
+        )
+
+    # ---------- Public API ----------
+
+    @property
+    def capacity(self) -> int:
+        """Most connections that can be checked out at once."""
+        return self.pool_size + self.max_overflow
+
+    @property
+    def in_use(self) -> int:
+        """Connections checked out right now."""
+        return self._in_use
+
+    def get_connection(self, timeout=None) -> PooledConnection:
+        """
+        Check out a connection, waiting up to timeout seconds if none is free.
+
+        :param timeout: seconds to wait, default timeout_seconds
+        :raises PoolError: if no connection became available in time
+        """
+        timeout = self.timeout_seconds if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._condition:
+            while not self._idle and self._open >= self.capacity:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics["timeouts"] += 1
+                    self._log_warning(
+                        f"Pool '{self.name}' exhausted: no connection free "
+                        f"after {timeout:.1f}s ({self._open} open)."
+                    )
+                    raise PoolError(
+                        f"Pool '{self.name}' exhausted: waited {timeout:.1f}s"
+                    )
+                self._condition.wait(remaining)
+
+            pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                # Reserve the slot now; the connect happens outside the lock
+                self._open += 1
+                if self._open > self.pool_size:
+                    self._metrics["overflow_checkouts"] += 1
+
+            self._record_checkout(time.monotonic() - started)
+
+        try:
+            if pooled is None:
+                return self._new_connection()
+            return self._validate(pooled)
+        except Exception:
+            with self._condition:
+                self._open -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+    def metrics(self) -> dict:
+        """Return a snapshot of the pool counters and wait-time histogram."""
+        with self._condition:
+            snapshot = dict(self._metrics)
+            snapshot.update(
+                {
+                    "pool_size": self.pool_size,
+                    "max_overflow": self.max_overflow,
+                    "open": self._open,
+                    "idle": len(self._idle),
+                    "in_use": self._in_use,
+                    "in_use_peak": self._in_use_peak,
+                }
+            )
+            checkouts = snapshot["checkouts"]
+            snapshot["wait_seconds_avg"] = (
+                snapshot["wait_seconds_total"] / checkouts if checkouts else 0.0
+            )
+            labels = [f"<={ms}ms" for ms in self.WAIT_BUCKETS_MS]
+            labels.append(f">{self.WAIT_BUCKETS_MS[-1]}ms")
+            snapshot["wait_histogram"] = dict(zip(labels, self._wait_histogram))
+            return snapshot
+
+    def close_all(self):
+        """Close every idle connection (checked-out ones close on return)."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for pooled in idle:
+            self._close_quietly(pooled._cnx)
+
+    # ---------- Private helpers ----------
+
+    def _startup(self, retries: int, backoff_seconds: float):
+        """Open the first connection, retrying with exponential backoff."""
+        for attempt in range(retries + 1):
+            try:
+                cnx = connector.connect(**self._connect_args)
+            except connector.Error as err:
+                if attempt == retries:
+                    raise
+                delay = backoff_seconds * (2 ** attempt)
+                self._log_warning(
+                    f"Pool '{self.name}' startup attempt {attempt + 1} failed "
+                    f"({err}); retrying in {delay:.1f}s."
+                )
+                time.sleep(delay)
+                continue
+
+            now = time.monotonic()
+            pooled = PooledConnection(None, cnx, now)
+            pooled.returned_at = now
+            with self._condition:
+                self._metrics["connections_created"] += 1
+                self._idle.append(pooled)
+                self._open += 1
+            return
+
+    def _new_connection(self) -> PooledConnection:
+        """Open a brand new connection (the slot is already reserved)."""
+        cnx = connector.connect(**self._connect_args)
+        with self._condition:
+            self._metrics["connections_created"] += 1
+        return PooledConnection(self, cnx, time.monotonic())
+
+    def _validate(self, pooled: PooledConnection) -> PooledConnection:
+        """Recycle an old connection, ping one that sat idle, reconnect if dead."""
+        now = time.monotonic()
+        stale = now - pooled.created_at > self.recycle_seconds
+        if not stale and now - pooled.returned_at > self.pre_ping_idle_seconds:
+            try:
+                pooled._cnx.ping(reconnect=False)
+            except Exception:
+                stale = True
+
+        if stale:
+            self._close_quietly(pooled._cnx)
+            with self._condition:
+                self._metrics["reconnects"] += 1
+            return self._new_connection()
+
+        pooled._manager = self
+        return pooled
+
+    def _release(self, pooled: PooledConnection):
+        """Take a connection back; overflow connections are closed."""
+        keep = True
+        try:
+            # Never hand the next caller an open transaction
+            if pooled._cnx.in_transaction:
+                pooled._cnx.rollback()
+            if self.reset_session:
+                pooled._cnx.reset_session()
+                # Resetting the session deallocates its prepared statements
+                pooled.statement_cache.clear()
+        except Exception:
+            keep = False
+
+        with self._condition:
+            self._in_use -= 1
+            if keep and len(self._idle) < self.pool_size:
+                pooled.returned_at = time.monotonic()
+                self._idle.append(pooled)
+                pooled = None
+            else:
+                self._open -= 1
+            self._condition.notify()
+
+        if pooled is not None:
+            self._close_quietly(pooled._cnx)
+
+    def _record_checkout(self, waited: float):
+        """Update checkout counters. Caller holds the lock."""
+        self._metrics["checkouts"] += 1
+        self._metrics["wait_seconds_total"] += waited
+        self._metrics["wait_seconds_max"] = max(self._metrics["wait_seconds_max"], waited)
+        self._wait_histogram[bisect.bisect_left(self.WAIT_BUCKETS_MS, waited * 1000)] += 1
+        self._in_use += 1
+        self._in_use_peak = max(self._in_use_peak, self._in_use)
+
+    def _log_warning(self, message: str):
+        if self._logger is not None:
+            self._logger.log_warning(message)
+
+    @staticmethod
+    def _close_quietly(cnx):
+        try:
+            cnx.close()
+        except Exception:
+            pass
@@ -0,0 +1,188 @@
+
+"""Defines the MigrationRunner class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.persistence_layer.mysql_persistence_wrapper import MySQLPersistenceWrapper
+import hashlib
+import inspect
+import os
+import re
+
+
+class MigrationRunner(ApplicationBase):
+    """
+    Applies the numbered SQL scripts in database/migrations in order.
+
+    Scripts are named NNN_description.sql. Each applied version is recorded
+    in the schema_migrations table together with a checksum of the file, so
+    re-running only applies what is new and edits to applied scripts are
+    reported.
+    """
+
+    DEFAULT_MIGRATIONS_DIR = os.path.join("database", "migrations")
+    FILENAME_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+    CREATE_VERSION_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        """
+
+    def __init__(self, config: dict, db=None) -> None:
+        """
+        Initializes object.
+
+        :param config: application config dict
+        :param db: optional MySQLPersistenceWrapper to reuse
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.db = db or MySQLPersistenceWrapper(config)
+        self.migrations_dir = config.get("migrations", {}).get(
+            "directory", self.DEFAULT_MIGRATIONS_DIR
+        )
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Public API ----------
+
+    def available(self) -> list:
+        """Return [(version, name, path)] for every script, ordered by version."""
+        migrations = []
+        for filename in os.listdir(self.migrations_dir):
+            match = self.FILENAME_PATTERN.match(filename)
+            if match:
+                migrations.append(
+                    (
+                        int(match.group(1)),
+                        match.group(2),
+                        os.path.join(self.migrations_dir, filename),
+                    )
+                )
+        migrations.sort()
+
+        versions = [version for version, _, _ in migrations]
+        if len(versions) != len(set(versions)):
+            raise ValueError(f"Duplicate migration version in {self.migrations_dir}")
+        return migrations
+
+    def applied(self) -> dict:
+        """Return {version: checksum} for every recorded migration."""
+        cnx = self.db.get_connection()
+        cursor = cnx.cursor()
+        try:
+            cursor.execute(self.CREATE_VERSION_TABLE_SQL)
+            cursor.execute("SELECT version, checksum FROM schema_migrations;")
+            return {version: checksum for version, checksum in cursor.fetchall()}
+        finally:
+            cursor.close()
+            cnx.close()
+
+    def status(self) -> list:
+        """Return [(version, name, state)] where state is applied/pending/changed."""
+        applied = self.applied()
+        result = []
+        for version, name, path in self.available():
+            if version not in applied:
+                state = "pending"
+            elif applied[version] != self._checksum(path):
+                state = "changed"
+            else:
+                state = "applied"
+            result.append((version, name, state))
+        return result
+
+    def migrate(self, target=None) -> list:
+        """
+        Apply every pending migration up to and including target.
+
+        MySQL DDL commits implicitly, so a script that fails halfway is not
+        recorded and must be fixed and re-run by hand.
+
+        :return: list of (version, name) applied by this call
+        """
+        applied = self.applied()
+        done = []
+        for version, name, path in self.available():
+            if target is not None and version > target:
+                break
+            if version in applied:
+                if applied[version] != self._checksum(path):
+                    self._logger.log_warning(
+                        f"{inspect.currentframe().f_code.co_name}: "
+                        f"Migration {version:03d}_{name} changed after it was applied."
+                    )
+                continue
+
+            self._logger.log_info(
+                f"{inspect.currentframe().f_code.co_name}: "
+                f"Applying migration {version:03d}_{name}"
+            )
+            self._apply(version, name, path)
+            done.append((version, name))
+        return done
+
+    # ---------- Private helpers ----------
+
+    def _apply(self, version: int, name: str, path: str):
+        """Run every statement of one script and record the version."""
+        with open(path, "r") as f:
+            script = f.read()
+
+        cnx = self.db.get_connection()
+        cursor = cnx.cursor()
+        try:
+            for statement in self.split_statements(script):
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) "
+                "VALUES (%s, %s, %s);",
+                (version, name, self._checksum(path)),
+            )
+            cnx.commit()
+        except Exception:
+            cnx.rollback()
+            raise
+        finally:
+            cursor.close()
+            cnx.close()
+
+    @staticmethod
+    def split_statements(script: str) -> list:
+        """
+        Split a SQL script into statements on ';' at the end of a line.
+
+        Full-line '--' comments are dropped. Good enough for our schema
+        scripts; it does not understand DELIMITER blocks.
+        """
+        statements = []
+        current = []
+        for line in script.splitlines():
+            if line.strip().startswith("--"):
+                continue
+            current.append(line)
+            if line.rstrip().endswith(";"):
+                statement = "\n".join(current).strip().rstrip(";").strip()
+                if statement:
+                    statements.append(statement)
+                current = []
+
+        trailing = "\n".join(current).strip()
+        if trailing:
+            statements.append(trailing)
+        return statements
+
+    @staticmethod
+    def _checksum(path: str) -> str:
+        """Return the SHA-256 hex digest of a script."""
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
@@ -1,15 +1,19 @@
 
 """Defines the MySQLPersistenceWrapper class."""
 
-from legal_case_app.application_base import ApplicationBase
-from mysql import connector
-from mysql.connector.pooling import MySQLConnectionPool
+from legal_case_app.persistence_layer.persistence_backend import PersistenceBackend
+from legal_case_app.persistence_layer.query_profiler import QueryProfiler
+import contextvars
 import inspect
 import json
+import threading
+import time
 
 
-class MySQLPersistenceWrapper(ApplicationBase):
-    """Implements the MySQLPersistenceWrapper class."""
+class MySQLPersistenceWrapper(PersistenceBackend):
+    """Implements the MySQLPersistenceWrapper class (database.backend "mysql")."""
+
+    name = "mysql"
 
     def __init__(self, config: dict) -> None:
         """Initializes object."""
@@ -34,38 +38,89 @@ class MySQLPersistenceWrapper(ApplicationBase):
         self.DB_CONFIG["host"] = self.DATABASE["connection"]["config"]["host"]
         self.DB_CONFIG["port"] = self.DATABASE["connection"]["config"]["port"]
 
+        # %s args: the dict is only rendered if debug logging is on
         self._logger.log_debug(
-            f'{inspect.currentframe().f_code.co_name}: '
-            f'DB Connection Config Dict: {self.DB_CONFIG}'
+            '%s: DB Connection Config Dict: %s',
+            inspect.currentframe().f_code.co_name, self.DB_CONFIG
         )
 
+        # ---------- Query Profiling ----------
+        # Shared by everything that runs SQL through this wrapper
+        self.profiler = QueryProfiler(config.get("profiling"), self._logger)
+
         # ---------- Database Connection ----------
-        # Create the pool and expose it both as _connection_pool and connection_pool
-        self._connection_pool = self._initialize_database_connection_pool(
-            self.DB_CONFIG
-        )
-        # This is what AppServices is using: self.db.connection_pool
-        self.connection_pool = self._connection_pool
+        # The pool is created on first use (see _connection_pool), so
+        # startup and commands that never touch MySQL don't pay for it.
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+        # ---------- Read Replicas ----------
+        # Optional database.replicas section; without endpoints every read
+        # goes to the primary as before. Reads in a session stay on the
+        # primary for sticky_seconds after its last write (read-your-writes).
+        self.REPLICAS = self.DATABASE.get("replicas", {})
+        self.sticky_seconds = self.REPLICAS.get("sticky_seconds", 5)
+        self._router = None
+        # A session is a thread, or an asyncio task (see write_session)
+        self._write_session = contextvars.ContextVar(f"write_session_{id(self)}")
 
         # (Old constant from the framework – not used right now, but harmless)
         self.SELECT_ALL_EMPLOYEES = (
             "SELECT id, first_name, middle_name, last_name"
         )
 
+    @property
+    def _connection_pool(self):
+        """The connection pool, created on first access."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = self._initialize_database_connection_pool(
+                        self.DB_CONFIG
+                    )
+        return self._pool
+
+    @property
+    def connection_pool(self):
+        """Public alias of _connection_pool."""
+        return self._connection_pool
+
+    @property
+    def replica_router(self):
+        """The ReplicaRouter, created on first access; None without replicas."""
+        if self._router is None and self.REPLICAS.get("endpoints"):
+            with self._pool_lock:
+                if self._router is None:
+                    from legal_case_app.persistence_layer.replica_router import (
+                        ReplicaRouter,
+                    )
+
+                    self._router = ReplicaRouter(
+                        self.REPLICAS, self.DATABASE["pool"], self.DB_CONFIG,
+                        logger=self._logger,
+                    )
+        return self._router
+
     # ---------- Private Utility Methods ----------
 
-    def _initialize_database_connection_pool(
-        self, config: dict
-    ) -> MySQLConnectionPool:
-        """Initializes database connection pool."""
+    def _initialize_database_connection_pool(self, config: dict):
+        """
+        Initializes database connection pool.
+
+        Startup is retried with backoff by ConnectionPoolManager; if the
+        database still can't be reached the error is logged and re-raised
+        rather than leaving the wrapper without a pool.
+        """
+        # Imported here so mysql.connector only loads when a pool is needed
+        from legal_case_app.persistence_layer.connection_pool_manager import (
+            ConnectionPoolManager,
+        )
+        from mysql import connector
+
         try:
             self._logger.log_debug("Creating connection pool...")
-            cnx_pool = MySQLConnectionPool(
-                pool_name=self.DATABASE["pool"]["name"],
-                pool_size=self.DATABASE["pool"]["size"],
-                pool_reset_session=self.DATABASE["pool"]["reset_session"],
-                use_pure=self.DATABASE["pool"]["use_pure"],
-                **config,
+            cnx_pool = ConnectionPoolManager(
+                self.DATABASE["pool"], config, logger=self._logger
             )
             self._logger.log_debug(
                 f"{inspect.currentframe().f_code.co_name}: "
@@ -79,8 +134,9 @@ class MySQLPersistenceWrapper(ApplicationBase):
             )
             self._logger.log_error(
                 f"{inspect.currentframe().f_code.co_name}: "
-                f"Check DB cnfg:\n{json.dumps(self.DATABASE)}"
+                f"Check DB cnfg:\n{json.dumps(self._redacted_database_config())}"
             )
+            raise
         except Exception as e:
             self._logger.log_error(
                 f"{inspect.currentframe().f_code.co_name}: "
@@ -88,8 +144,99 @@ class MySQLPersistenceWrapper(ApplicationBase):
             )
             self._logger.log_error(
                 f"{inspect.currentframe().f_code.co_name}: "
-                f"Check DB conf:\n{json.dumps(self.DATABASE)}"
+                f"Check DB conf:\n{json.dumps(self._redacted_database_config())}"
             )
+            raise
+
+    def _redacted_database_config(self) -> dict:
+        """Return the database config section with the password masked."""
+        redacted = json.loads(json.dumps(self.DATABASE))
+        if "password" in redacted.get("connection", {}).get("config", {}):
+            redacted["connection"]["config"]["password"] = "********"
+        for endpoint in redacted.get("replicas", {}).get("endpoints", []):
+            if "password" in endpoint:
+                endpoint["password"] = "********"
+        return redacted
+
+    def _is_sticky(self) -> bool:
+        session = self._write_session.get(None)
+        return (
+            session is not None
+            and session[0] is not None
+            and time.monotonic() - session[0] < self.sticky_seconds
+        )
+
+    # ---------- Public Methods ----------
+
+    def get_connection(self, timeout=None):
+        """
+        Check out a connection from the pool (close() returns it).
+
+        Waits up to timeout seconds (default database.pool.timeout_seconds)
+        when every connection is busy.
+        """
+        return self._connection_pool.get_connection(timeout)
+
+    def get_read_connection(self, timeout=None):
+        """
+        Check out a connection for a read-only query.
+
+        Comes from a healthy replica when replicas are configured, unless
+        this session wrote in the last sticky_seconds; otherwise (and when
+        every replica is ejected or busy) from the primary pool.
+        """
+        router = self.replica_router
+        if router is not None and not self._is_sticky():
+            connection = router.get_connection(timeout)
+            if connection is not None:
+                return connection
+        return self.get_connection(timeout)
+
+    def write_session(self) -> list:
+        """
+        The current session's [time of last write], created on first use.
+
+        It is a mutable list so that copies of the context (a call run on
+        an executor thread with contextvars.copy_context) share it.
+        """
+        session = self._write_session.get(None)
+        if session is None:
+            session = [None]
+            self._write_session.set(session)
+        return session
+
+    def note_write(self):
+        """Record that this session just committed a write (see sticky_seconds)."""
+        self.write_session()[0] = time.monotonic()
+
+    def report_read_failure(self, connection, error) -> bool:
+        """
+        Tell the router a read failed; ejects the replica if it is unreachable.
+
+        :return: True if the read ran on a replica that was ejected, so it
+                 is safe to retry it on the primary
+        """
+        if self._router is None:
+            return False
+        return self._router.report_failure(connection, error)
+
+    def pool_metrics(self) -> dict:
+        """Return checkout, wait-time, in-use, timeout and reconnect metrics."""
+        if self._pool is None:
+            metrics = {"pool_size": self.DATABASE["pool"]["size"], "open": 0,
+                       "checkouts": 0, "wait_histogram": {}}
+        else:
+            metrics = self._connection_pool.metrics()
+        if self._router is not None:
+            metrics["replicas"] = self._router.metrics()
+        return metrics
+
+    def close(self):
+        """Close the idle connections of the primary and replica pools."""
+        if self._pool is not None:
+            self._pool.close_all()
+        if self._router is not None:
+            self._router.close_all()
 
     # ---------- Convenience Methods (optional, for debugging/demo) ----------
 
@@ -99,10 +246,19 @@ class MySQLPersistenceWrapper(ApplicationBase):
         Used by AppServices or directly in tests if needed.
         """
         query = "SELECT first_name, last_name FROM lawyer LIMIT 3;"
+        started = time.perf_counter()
         cnx = self._connection_pool.get_connection()
+        checked_out = time.perf_counter()
         cursor = cnx.cursor()
         cursor.execute(query)
         results = cursor.fetchall()
         cursor.close()
         cnx.close()
+        self.profiler.record(
+            query,
+            wall_seconds=time.perf_counter() - checked_out,
+            pool_wait_seconds=checked_out - started,
+            rows=len(results),
+            nbytes=self.profiler.estimate_bytes(results),
+        )
         return results
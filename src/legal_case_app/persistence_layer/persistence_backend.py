@@ -0,0 +1,81 @@
+"""Defines the PersistenceBackend interface and the backend factory."""
+
+from legal_case_app.application_base import ApplicationBase
+from abc import abstractmethod
+import importlib
+
+
+# database.backend -> (module, class), imported only when selected
+BACKENDS = {
+    "mysql": (
+        "legal_case_app.persistence_layer.mysql_persistence_wrapper",
+        "MySQLPersistenceWrapper",
+    ),
+    "sqlite": (
+        "legal_case_app.persistence_layer.sqlite_persistence_wrapper",
+        "SQLitePersistenceWrapper",
+    ),
+}
+
+
+class PersistenceBackend(ApplicationBase):
+    """
+    What AppServices needs from a database.
+
+    Connections behave like mysql.connector connections: cursor()
+    (with dictionary/prepared/buffered options), commit(), rollback(),
+    and close() to hand them back. The SQL is the MySQL dialect used
+    throughout the service layer; other backends translate it.
+    Subclasses set DB_CONFIG (connection details, for logging) and
+    profiler (a QueryProfiler).
+    """
+
+    name = None
+
+    @abstractmethod
+    def get_connection(self, timeout=None):
+        """Check out a connection for reads and writes."""
+
+    def get_read_connection(self, timeout=None):
+        """Check out a connection for a read-only query."""
+        return self.get_connection(timeout)
+
+    def write_session(self) -> list:
+        """The current session's [time of last write] (see note_write)."""
+        return [None]
+
+    def note_write(self):
+        """Record that this session just committed a write."""
+
+    def report_read_failure(self, connection, error) -> bool:
+        """
+        Called when a read failed; True if it is safe to retry the read
+        on get_connection() instead.
+        """
+        return False
+
+    @abstractmethod
+    def pool_metrics(self) -> dict:
+        """Return connection pool metrics (at least pool_size, open, wait_histogram)."""
+
+    @abstractmethod
+    def test_connection(self):
+        """Run a small query and return its rows."""
+
+    def close(self):
+        """Close idle connections."""
+
+
+def create_backend(config: dict) -> PersistenceBackend:
+    """
+    Build the backend named by database.backend (default "mysql").
+
+    :param config: application config dict
+    """
+    name = config["database"].get("backend", "mysql")
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown database.backend '{name}'. Expected one of: {', '.join(BACKENDS)}."
+        )
+    module_name, class_name = BACKENDS[name]
+    return getattr(importlib.import_module(module_name), class_name)(config)
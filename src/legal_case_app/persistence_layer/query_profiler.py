@@ -0,0 +1,182 @@
+
+"""Defines the QueryProfiler class."""
+
+from collections import deque, namedtuple
+from collections.abc import Mapping
+import re
+import threading
+
+
+# One executed statement, as passed to QueryProfiler listeners
+QueryEvent = namedtuple(
+    "QueryEvent",
+    ["statement", "normalized", "wall_seconds", "pool_wait_seconds", "rows", "bytes"],
+)
+
+
+class QueryProfiler():
+    """
+    Collects per-statement latency, pool wait, row and byte counts.
+
+    Statements are aggregated by a normalized form (whitespace collapsed,
+    literals replaced by ?, IN lists folded), keeping the last
+    samples_per_statement wall times of each for p50/p95/p99. Statements
+    slower than slow_query_ms are logged as warnings. Extra listeners added
+    with add_listener() receive every QueryEvent, so other sinks (metrics
+    exporters, tracing) can plug in without touching the call sites.
+    """
+
+    _WHITESPACE = re.compile(r"\s+")
+    _STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+    _NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+    _IN_LIST = re.compile(r"\bIN\s*\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)", re.I)
+
+    def __init__(self, config: dict = None, logger=None) -> None:
+        """
+        Initialize instance.
+
+        :param config: the "profiling" section of the app config
+        :param logger: LoggingService used for slow-query warnings
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.slow_query_ms = config.get("slow_query_ms", 200)
+        self.samples_per_statement = config.get("samples_per_statement", 1000)
+        self._logger = logger
+        self._listeners = []
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    # ---------- Public API ----------
+
+    def add_listener(self, listener) -> None:
+        """Call listener(event) for every recorded QueryEvent."""
+        self._listeners.append(listener)
+
+    def record(self, statement: str, wall_seconds: float, pool_wait_seconds: float = 0.0,
+               rows: int = 0, nbytes: int = 0) -> None:
+        """Record one executed statement."""
+        if not self.enabled:
+            return
+
+        normalized = self.normalize(statement)
+        with self._lock:
+            stats = self._stats.get(normalized)
+            if stats is None:
+                stats = {
+                    "count": 0,
+                    "total_seconds": 0.0,
+                    "pool_wait_seconds": 0.0,
+                    "rows": 0,
+                    "bytes": 0,
+                    "samples": deque(maxlen=self.samples_per_statement),
+                }
+                self._stats[normalized] = stats
+            stats["count"] += 1
+            stats["total_seconds"] += wall_seconds
+            stats["pool_wait_seconds"] += pool_wait_seconds
+            stats["rows"] += rows
+            stats["bytes"] += nbytes
+            stats["samples"].append(wall_seconds)
+
+        if self._logger is not None and wall_seconds * 1000 >= self.slow_query_ms:
+            self._logger.log_warning(
+                f"Slow query ({wall_seconds * 1000:.1f} ms, "
+                f"pool wait {pool_wait_seconds * 1000:.1f} ms, {rows} rows): "
+                f"{normalized}"
+            )
+
+        if self._listeners:
+            event = QueryEvent(
+                statement, normalized, wall_seconds, pool_wait_seconds, rows, nbytes
+            )
+            for listener in self._listeners:
+                listener(event)
+
+    def summary(self) -> list:
+        """
+        Return one dict per normalized statement, slowest total time first,
+        with count, mean/p50/p95/p99 ms, pool wait, rows and bytes.
+        """
+        with self._lock:
+            snapshot = [
+                (statement, dict(stats, samples=sorted(stats["samples"])))
+                for statement, stats in self._stats.items()
+            ]
+
+        summary = []
+        for statement, stats in snapshot:
+            samples = stats["samples"]
+            summary.append(
+                {
+                    "statement": statement,
+                    "count": stats["count"],
+                    "total_ms": stats["total_seconds"] * 1000,
+                    "mean_ms": stats["total_seconds"] * 1000 / stats["count"],
+                    "p50_ms": self._percentile(samples, 50) * 1000,
+                    "p95_ms": self._percentile(samples, 95) * 1000,
+                    "p99_ms": self._percentile(samples, 99) * 1000,
+                    "pool_wait_ms": stats["pool_wait_seconds"] * 1000,
+                    "rows": stats["rows"],
+                    "bytes": stats["bytes"],
+                }
+            )
+        summary.sort(key=lambda row: row["total_ms"], reverse=True)
+        return summary
+
+    def format_report(self) -> str:
+        """Return summary() as a printable table."""
+        summary = self.summary()
+        if not summary:
+            return "(No queries recorded.)"
+
+        lines = [
+            f"{'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'wait ms':>9} {'rows':>9} {'bytes':>11}  statement"
+        ]
+        for row in summary:
+            statement = row["statement"]
+            if len(statement) > 100:
+                statement = statement[:97] + "..."
+            lines.append(
+                f"{row['count']:>7} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+                f"{row['p99_ms']:>9.2f} {row['pool_wait_ms']:>9.1f} "
+                f"{row['rows']:>9} {row['bytes']:>11}  {statement}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Forget every recorded statement."""
+        with self._lock:
+            self._stats.clear()
+
+    @classmethod
+    def normalize(cls, statement: str) -> str:
+        """Collapse whitespace, replace literals with ? and fold IN lists."""
+        normalized = cls._WHITESPACE.sub(" ", statement).strip().rstrip(";").strip()
+        normalized = cls._STRING_LITERAL.sub("?", normalized)
+        normalized = cls._NUMBER_LITERAL.sub("?", normalized)
+        return cls._IN_LIST.sub("IN (...)", normalized)
+
+    @staticmethod
+    def estimate_bytes(rows) -> int:
+        """Rough size of fetched data: string/bytes lengths, 8 bytes otherwise."""
+        total = 0
+        for row in rows:
+            values = row.values() if isinstance(row, Mapping) else row
+            for value in values:
+                if isinstance(value, (str, bytes, bytearray)):
+                    total += len(value)
+                elif value is not None:
+                    total += 8
+        return total
+
+    # ---------- Private helpers ----------
+
+    @staticmethod
+    def _percentile(sorted_samples, percent: float) -> float:
+        """Nearest-rank percentile of an already sorted list."""
+        if not sorted_samples:
+            return 0.0
+        rank = max(1, -(-len(sorted_samples) * percent // 100))
+        return sorted_samples[int(rank) - 1]
@@ -0,0 +1,174 @@
+"""Defines the ReplicaRouter class."""
+
+from legal_case_app.persistence_layer.connection_pool_manager import ConnectionPoolManager
+from mysql import connector
+from mysql.connector.errors import InterfaceError, OperationalError, PoolError
+import itertools
+import threading
+import time
+
+
+class Replica():
+    """One read replica endpoint: its pool (opened lazily) and health state."""
+
+    def __init__(self, name: str, pool_config: dict, db_config: dict) -> None:
+        """Initialize instance."""
+        self.name = name
+        self.pool_config = pool_config
+        self.db_config = db_config
+        self.pool = None
+        self.pool_lock = threading.Lock()
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.last_error = None
+
+    @property
+    def in_use(self) -> int:
+        return self.pool.in_use if self.pool is not None else 0
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+
+class ReplicaRouter():
+    """
+    Hands out read connections from a set of MySQL replicas.
+
+    Each replica has its own ConnectionPoolManager, opened on first use.
+    Replicas are picked round-robin or by fewest connections in use
+    (least_busy). A replica that can't be reached, or whose connection
+    drops mid-query, is ejected for eject_seconds and skipped; after that
+    the next read tries it again. get_connection() returns None when no
+    replica is usable, and the caller reads from the primary instead.
+    """
+
+    STRATEGIES = ("round_robin", "least_busy")
+
+    def __init__(self, replica_config: dict, pool_config: dict, db_config: dict,
+                 logger=None) -> None:
+        """
+        Initialize instance (no connections are opened yet).
+
+        :param replica_config: the "database.replicas" section of the app config
+        :param pool_config: the primary's "database.pool" section, used as
+                            the template for every replica pool
+        :param db_config: the primary's connect arguments; each endpoint
+                          overrides them (usually just host and port)
+        :param logger: LoggingService for warnings (optional)
+        """
+        self.strategy = replica_config.get("strategy", "round_robin")
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(
+                f"database.replicas.strategy must be one of "
+                f"{', '.join(self.STRATEGIES)}, got '{self.strategy}'."
+            )
+        self.eject_seconds = replica_config.get("eject_seconds", 30)
+        self._logger = logger
+
+        self.replicas = []
+        for number, endpoint in enumerate(replica_config.get("endpoints", []), start=1):
+            connect_args = dict(db_config, **endpoint)
+            name = f"{connect_args['host']}:{connect_args['port']}"
+            replica_pool_config = dict(
+                pool_config,
+                name=f"{pool_config['name']}_replica_{number}",
+                size=replica_config.get("pool_size", pool_config["size"]),
+                # Fail fast: an unreachable replica is ejected, not retried
+                startup_retries=0,
+            )
+            self.replicas.append(Replica(name, replica_pool_config, connect_args))
+
+        self._lock = threading.Lock()
+        self._next = itertools.count()
+
+    # ---------- Public API ----------
+
+    def get_connection(self, timeout=None):
+        """
+        Check out a connection from a healthy replica, or return None.
+
+        The returned connection's replica attribute names the endpoint.
+        A replica whose pool is exhausted is skipped (not ejected).
+        """
+        for replica in self._candidates():
+            try:
+                connection = self._pool(replica).get_connection(timeout)
+            except PoolError:
+                continue
+            except connector.Error as err:
+                self.eject(replica, err)
+                continue
+            connection.replica = replica.name
+            return connection
+        return None
+
+    def report_failure(self, connection, error) -> bool:
+        """
+        Eject the replica behind connection if error means it is unreachable.
+
+        :return: True if the connection came from a replica that was ejected
+        """
+        name = getattr(connection, "replica", None)
+        if name is None or not isinstance(error, (InterfaceError, OperationalError)):
+            return False
+        for replica in self.replicas:
+            if replica.name == name:
+                self.eject(replica, error)
+                return True
+        return False
+
+    def eject(self, replica: Replica, error):
+        """Skip replica for eject_seconds."""
+        with self._lock:
+            replica.ejected_until = time.monotonic() + self.eject_seconds
+            replica.ejections += 1
+            replica.last_error = str(error)
+        if self._logger is not None:
+            self._logger.log_warning(
+                "Replica %s ejected for %ss: %s", replica.name, self.eject_seconds, error
+            )
+
+    def metrics(self) -> dict:
+        """Return {replica name: health, ejections and pool counters}."""
+        now = time.monotonic()
+        snapshot = {}
+        for replica in self.replicas:
+            snapshot[replica.name] = {
+                "healthy": replica.is_healthy(now),
+                "ejections": replica.ejections,
+                "last_error": replica.last_error,
+                "in_use": replica.in_use,
+                "checkouts": (
+                    replica.pool.metrics()["checkouts"] if replica.pool is not None else 0
+                ),
+            }
+        return snapshot
+
+    def close_all(self):
+        """Close the idle connections of every replica pool."""
+        for replica in self.replicas:
+            if replica.pool is not None:
+                replica.pool.close_all()
+
+    # ---------- Private helpers ----------
+
+    def _candidates(self) -> list:
+        """Healthy replicas in the order they should be tried."""
+        now = time.monotonic()
+        healthy = [replica for replica in self.replicas if replica.is_healthy(now)]
+        if not healthy:
+            return []
+        if self.strategy == "least_busy":
+            return sorted(healthy, key=lambda replica: replica.in_use)
+        start = next(self._next) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def _pool(self, replica: Replica) -> ConnectionPoolManager:
+        """The replica's pool, created on first use."""
+        if replica.pool is None:
+            with replica.pool_lock:
+                if replica.pool is None:
+                    replica.pool = ConnectionPoolManager(
+                        replica.pool_config, replica.db_config, logger=self._logger
+                    )
+        return replica.pool
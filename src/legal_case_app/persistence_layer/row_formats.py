@@ -0,0 +1,102 @@
+"""Row formats for query results: tuples, dicts or __slots__ records."""
+
+from array import array
+from collections.abc import Mapping
+from functools import lru_cache
+
+
+ROW_FORMATS = ("tuple", "dict", "record")
+
+
+class Record(Mapping):
+    """
+    Base class of the generated record types.
+
+    A record stores one value per column in __slots__ (no per-row dict),
+    reads like an object (row.case_id) and also like a read-only dict
+    (row["case_id"], dict(row)), so code written for dict rows keeps working.
+    """
+
+    __slots__ = ()
+    _fields = ()
+
+    def __init__(self, values) -> None:
+        for name, value in zip(self._fields, values):
+            object.__setattr__(self, name, value)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+
+@lru_cache(maxsize=256)
+def record_type(columns: tuple) -> type:
+    """Return the (cached) Record subclass for a tuple of column names."""
+    return type("Record", (Record,), {"__slots__": columns, "_fields": columns})
+
+
+def convert_rows(rows, columns, row_format: str) -> list:
+    """
+    Convert tuples fetched with the given column names to row_format.
+
+    :param rows: list of tuples
+    :param columns: column names from cursor.description
+    :param row_format: 'tuple', 'dict' or 'record'
+    """
+    if row_format == "tuple":
+        return rows if isinstance(rows, list) else list(rows)
+    columns = tuple(columns)
+    if row_format == "dict":
+        return [dict(zip(columns, row)) for row in rows]
+    if row_format == "record":
+        make = record_type(columns)
+        return [make(row) for row in rows]
+    raise ValueError(
+        f"Unknown row format '{row_format}'. Expected one of: {', '.join(ROW_FORMATS)}."
+    )
+
+
+def to_columns(rows, columns) -> dict:
+    """
+    Pivot tuples into {column: values}.
+
+    Columns holding only ints (or only floats) become array.array('q')
+    (or 'd'): 8 bytes per value instead of a pointer plus a boxed object;
+    anything else (str, Decimal, date, None) stays a list.
+    """
+    pivoted = {}
+    for name, values in zip(columns, zip(*rows) if rows else [() for _ in columns]):
+        kinds = set(map(type, values))
+        if kinds == {int}:
+            pivoted[name] = array("q", values)
+        elif kinds == {float}:
+            pivoted[name] = array("d", values)
+        else:
+            pivoted[name] = list(values)
+    return pivoted
+
+
+def json_default(value):
+    """
+    json.dumps default= hook: records and row models become dicts, arrays
+    lists, anything else (dates, Decimals) a string.
+    """
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, array):
+        return value.tolist()
+    return str(value)
@@ -0,0 +1,324 @@
+"""Defines the SQLitePersistenceWrapper class."""
+
+from legal_case_app.persistence_layer.persistence_backend import PersistenceBackend
+from legal_case_app.persistence_layer.query_profiler import QueryProfiler
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+import inspect
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+# Values go in and come out as the types mysql.connector uses. Every
+# DECIMAL column in the schema has two decimal places.
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+
+
+def _convert_date(value: bytes):
+    try:
+        return date.fromisoformat(value.decode())
+    except ValueError:
+        return value.decode()
+
+
+def _convert_timestamp(value: bytes):
+    try:
+        return datetime.fromisoformat(value.decode())
+    except ValueError:
+        return value.decode()
+
+
+def _convert_decimal(value: bytes):
+    return Decimal(value.decode()).quantize(Decimal("0.01"))
+
+
+sqlite3.register_converter("DATE", _convert_date)
+sqlite3.register_converter("TIMESTAMP", _convert_timestamp)
+sqlite3.register_converter("DECIMAL", _convert_decimal)
+
+
+_MATCH_AGAINST = re.compile(
+    r"MATCH\s*\(([^)]*)\)\s*AGAINST\s*\(\s*%s\s+IN\s+BOOLEAN\s+MODE\s*\)", re.I
+)
+_DATE_FORMAT = re.compile(r"DATE_FORMAT\(\s*([^,]+?)\s*,\s*('[^']*')\s*\)", re.I)
+_VALUES_COLUMN = re.compile(r"\bVALUES\((\w+)\)", re.I)
+_WORD = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=512)
+def translate(query: str) -> str:
+    """
+    Rewrite the MySQL dialect used by the service layer for SQLite.
+
+    Handles %s placeholders, CURDATE(), DATE_FORMAT(x, fmt),
+    INSERT ... ON DUPLICATE KEY UPDATE col = VALUES(col),
+    SELECT ... FOR UPDATE (dropped: access is already serialized) and
+    MATCH (cols) AGAINST (%s IN BOOLEAN MODE), which becomes the
+    ft_match() function registered on every connection.
+    """
+    query = _MATCH_AGAINST.sub(r"ft_match(%s, \1)", query)
+    query = _DATE_FORMAT.sub(r"strftime(\2, \1)", query)
+    query = re.sub(r"\bCURDATE\(\)", "date('now')", query, flags=re.I)
+    query = re.sub(r"\s+FOR\s+UPDATE\b", "", query, flags=re.I)
+    if re.search(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", query, re.I):
+        query = re.sub(
+            r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", "ON CONFLICT DO UPDATE SET", query,
+            flags=re.I,
+        )
+        query = _VALUES_COLUMN.sub(r"excluded.\1", query)
+    return query.replace("%s", "?")
+
+
+def ft_match(boolean_query, *columns) -> float:
+    """
+    MySQL BOOLEAN MODE matching for the query shapes AppServices builds:
+    "+word*" terms (required prefix), plain words, "-word" (excluded).
+    Returns the number of matched terms, or 0 if the row does not match.
+    """
+    words = set()
+    for value in columns:
+        if value is not None:
+            words.update(_WORD.findall(str(value).lower()))
+
+    score = 0
+    for term in str(boolean_query or "").split():
+        required, excluded = term.startswith("+"), term.startswith("-")
+        prefix = term.endswith("*")
+        term = term.strip('+-*"').lower()
+        if not term:
+            continue
+        found = any(word.startswith(term) if prefix else word == term for word in words)
+        if excluded and found or required and not found:
+            return 0
+        if found and not excluded:
+            score += 1
+    return float(score)
+
+
+class SQLiteCursor():
+    """mysql.connector-style cursor on top of a sqlite3 cursor."""
+
+    def __init__(self, cursor, dictionary: bool) -> None:
+        """Initialize instance."""
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    def execute(self, query: str, params=None):
+        if (query.lstrip()[:9].upper() == "SAVEPOINT"
+                and not self._cursor.connection.in_transaction):
+            # As on MySQL, the savepoint nests in the open transaction; one
+            # that started the transaction would commit it on RELEASE
+            self._cursor.execute("BEGIN;")
+        self._cursor.execute(translate(query), tuple(params or ()))
+
+    def executemany(self, query: str, seq_params):
+        self._cursor.executemany(translate(query), [tuple(params) for params in seq_params])
+
+    def fetchall(self) -> list:
+        return self._rows(self._cursor.fetchall())
+
+    def fetchmany(self, size: int) -> list:
+        return self._rows(self._cursor.fetchmany(size))
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._rows([row])[0] if row is not None else None
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+    def _rows(self, rows) -> list:
+        if not self._dictionary or not rows:
+            return rows
+        columns = [column[0] for column in self._cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+
+
+class SQLiteConnection():
+    """
+    A checked-out connection: the backend's one sqlite3 connection, held
+    under its lock until close().
+    """
+
+    # AppServices looks for these on mysql.connector connections
+    statement_cache = None
+    unread_result = False
+    replica = None
+
+    def __init__(self, backend, cnx) -> None:
+        """Initialize instance."""
+        self._backend = backend
+        self._cnx = cnx
+
+    def cursor(self, dictionary: bool = False, prepared: bool = False,
+               buffered: bool = True) -> SQLiteCursor:
+        # sqlite3 caches compiled statements itself, and never buffers
+        return SQLiteCursor(self._cnx.cursor(), dictionary)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._cnx.in_transaction
+
+    def commit(self):
+        self._cnx.commit()
+
+    def rollback(self):
+        self._cnx.rollback()
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        """Hand the connection back (safe to call twice)."""
+        if self._backend is not None:
+            backend, self._backend = self._backend, None
+            backend._release()
+
+
+class SQLitePersistenceWrapper(PersistenceBackend):
+    """
+    Embedded SQLite backend (database.backend "sqlite").
+
+    Runs the same service-layer SQL against a file or ":memory:" database,
+    translating the MySQL dialect (see translate). The schema in
+    database/sqlite/create_tables.sql is applied when the database is
+    opened. There is one connection; a checkout holds it (and a reentrant
+    lock) until close(), so access is serialized: a fast local
+    single-user mode, not a server replacement.
+    """
+
+    name = "sqlite"
+
+    DEFAULT_SCHEMA_PATH = os.path.join("database", "sqlite", "create_tables.sql")
+
+    def __init__(self, config: dict) -> None:
+        """Initializes object."""
+        self._config_dict = config
+        self.META = config["meta"]
+        self.DATABASE = config["database"]
+        sqlite_config = self.DATABASE.get("sqlite", {})
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.path = sqlite_config.get("path", ":memory:")
+        self.schema_path = sqlite_config.get("schema", self.DEFAULT_SCHEMA_PATH)
+        self.timeout_seconds = sqlite_config.get("timeout_seconds", 5.0)
+        self.DB_CONFIG = {"database": self.path}
+
+        # Shared by everything that runs SQL through this wrapper
+        self.profiler = QueryProfiler(config.get("profiling"), self._logger)
+
+        # Opened on first use, like the MySQL pool
+        self._cnx = None
+        self._lock = threading.RLock()
+        self._open_lock = threading.Lock()
+        self._metrics = {"checkouts": 0, "timeouts": 0, "wait_seconds_total": 0.0}
+        self._in_use = 0
+
+        self._logger.log_debug(
+            f"{inspect.currentframe().f_code.co_name}: SQLite database {self.path}"
+        )
+
+    # ---------- Public Methods ----------
+
+    def get_connection(self, timeout=None) -> SQLiteConnection:
+        """
+        Check out the connection, waiting up to timeout seconds (default
+        database.sqlite.timeout_seconds) while another thread holds it.
+        """
+        cnx = self._connection()
+        timeout = self.timeout_seconds if timeout is None else timeout
+        started = time.monotonic()
+        if not self._lock.acquire(timeout=timeout):
+            self._metrics["timeouts"] += 1
+            raise TimeoutError(f"SQLite database busy: waited {timeout:.1f}s")
+        self._metrics["checkouts"] += 1
+        self._metrics["wait_seconds_total"] += time.monotonic() - started
+        self._in_use += 1
+        return SQLiteConnection(self, cnx)
+
+    def pool_metrics(self) -> dict:
+        """Return checkout counters in the shape of the MySQL pool metrics."""
+        metrics = dict(self._metrics)
+        metrics.update(
+            {
+                "backend": self.name,
+                "database": self.path,
+                "pool_size": 1,
+                "open": 0 if self._cnx is None else 1,
+                "in_use": self._in_use,
+                "wait_histogram": {},
+            }
+        )
+        return metrics
+
+    def test_connection(self):
+        """Simple test query to validate the database."""
+        connection = self.get_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT first_name, last_name FROM lawyer LIMIT 3;")
+            return cursor.fetchall()
+        finally:
+            connection.close()
+
+    def close(self):
+        """Close the database (a ":memory:" database is discarded)."""
+        with self._lock:
+            if self._cnx is not None:
+                self._cnx.close()
+                self._cnx = None
+
+    # ---------- Private Utility Methods ----------
+
+    def _connection(self):
+        """The sqlite3 connection, opened (and the schema applied) on first use."""
+        if self._cnx is None:
+            with self._open_lock:
+                if self._cnx is None:
+                    cnx = sqlite3.connect(
+                        self.path,
+                        detect_types=sqlite3.PARSE_DECLTYPES,
+                        check_same_thread=False,
+                    )
+                    cnx.execute("PRAGMA foreign_keys = ON;")
+                    cnx.create_function("ft_match", -1, ft_match, deterministic=True)
+                    with open(self.schema_path, "r") as file:
+                        cnx.executescript(file.read())
+                    self._cnx = cnx
+                    self._logger.log_debug(
+                        f"{inspect.currentframe().f_code.co_name}: "
+                        f"opened {self.path} with schema {self.schema_path}"
+                    )
+        return self._cnx
+
+    def _release(self):
+        """Take the connection back; the last release rolls back an open transaction."""
+        # _in_use only changes while this thread holds the lock
+        self._in_use -= 1
+        try:
+            if self._in_use == 0 and self._cnx is not None and self._cnx.in_transaction:
+                self._cnx.rollback()
+        finally:
+            self._lock.release()
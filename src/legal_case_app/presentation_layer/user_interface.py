@@ -3,6 +3,11 @@
 
 from legal_case_app.application_base import ApplicationBase
 from legal_case_app.service_layer.app_services import AppServices
+from legal_case_app.service_layer.validation import (
+    parse_assignment,
+    validate_case,
+    validate_lawyer,
+)
 import inspect
 
 
@@ -32,27 +37,61 @@ class UserInterface(ApplicationBase):
             f"{inspect.currentframe().f_code.co_name}: User interface started!"
         )
 
-        while True:
-            self._print_menu()
-            choice = input("Select an option: ").strip()
-
-            if choice == "1":
-                self._handle_list_lawyers()
-            elif choice == "2":
-                self._handle_list_cases()
-            elif choice == "3":
-                self._handle_view_case_with_lawyers()
-            elif choice == "4":
-                self._handle_add_lawyer()
-            elif choice == "5":
-                self._handle_add_case()
-            elif choice == "6":
-                self._handle_assign_lawyer_to_case()
-            elif choice == "0":
-                print("\nExiting Legal Case Roster. Goodbye!")
-                break
-            else:
-                print("\n[!] Invalid option. Please try again.")
+        try:
+            while True:
+                self._print_menu()
+                choice = input("Select an option: ").strip()
+
+                if choice == "1":
+                    self._handle_list_lawyers()
+                elif choice == "2":
+                    self._handle_list_cases()
+                elif choice == "3":
+                    self._handle_view_case_with_lawyers()
+                elif choice == "4":
+                    self._handle_add_lawyer()
+                elif choice == "5":
+                    self._handle_add_case()
+                elif choice == "6":
+                    self._handle_assign_lawyer_to_case()
+                elif choice == "7":
+                    self._handle_billable_hours_report("by-lawyer", "Billable Hours by Lawyer")
+                elif choice == "8":
+                    self._handle_billable_hours_report("by-case", "Billable Hours by Case")
+                elif choice == "9":
+                    self._handle_billable_hours_report("by-role", "Billable Hours by Role")
+                elif choice == "10":
+                    self._handle_billable_hours_report(
+                        "by-status-month", "Billable Hours by Case Status and Start Month"
+                    )
+                elif choice == "11":
+                    self._handle_pool_metrics()
+                elif choice == "12":
+                    self._handle_query_profile()
+                elif choice == "13":
+                    self._handle_search_lawyers()
+                elif choice == "14":
+                    self._handle_search_cases()
+                elif choice == "15":
+                    self._handle_staff_case()
+                elif choice == "16":
+                    self._handle_record_hours()
+                elif choice == "17":
+                    self._handle_billable_hours_report(
+                        "ledger-by-lawyer", "Hours Ledger Totals by Lawyer"
+                    )
+                elif choice == "18":
+                    self._handle_billable_hours_report(
+                        "ledger-by-case", "Hours Ledger Totals by Case"
+                    )
+                elif choice == "0":
+                    print("\nExiting Legal Case Roster. Goodbye!")
+                    break
+                else:
+                    print("\n[!] Invalid option. Please try again.")
+        finally:
+            # Queued write-behind assignments must reach the database before exit
+            self._handle_shutdown()
 
     # ---------- Menu + small helpers ----------
 
@@ -64,41 +103,62 @@ class UserInterface(ApplicationBase):
         print("4. Add a new lawyer")
         print("5. Add a new case")
         print("6. Assign a lawyer to a case")
+        print("7. Report: billable hours by lawyer")
+        print("8. Report: billable hours by case")
+        print("9. Report: billable hours by role")
+        print("10. Report: billable hours by case status and month")
+        print("11. Connection pool metrics")
+        print("12. Query latency stats (p50/p95/p99)")
+        print("13. Search lawyers")
+        print("14. Search cases")
+        print("15. Staff a case (assign several lawyers at once)")
+        print("16. Record hours worked (hours ledger)")
+        print("17. Report: ledger hours by lawyer")
+        print("18. Report: ledger hours by case")
         print("0. Exit")
         print("=====================================")
 
     # ---------- Listing handlers ----------
 
     def _handle_list_lawyers(self):
-        """List all lawyers in a friendly format."""
-        lawyers = self.DB.get_all_lawyers()
-        if not lawyers:
+        """List all lawyers in a friendly format, one page at a time."""
+        count = 0
+        for page in self.DB.iter_lawyers():
+            if count == 0:
+                print("\n--- Lawyers ---")
+            for lawyer in page:
+                print(
+                    f"[{lawyer.lawyer_id}] "
+                    f"{lawyer.first_name} {lawyer.last_name} "
+                    f"- {lawyer.specialization} "
+                    f"({lawyer.email})"
+                )
+            count += len(page)
+
+        if not count:
             print("\n(No lawyers found.)")
-            return
-
-        print("\n--- Lawyers ---")
-        for row in lawyers:
-            print(
-                f"[{row['lawyer_id']}] "
-                f"{row['first_name']} {row['last_name']} "
-                f"- {row['specialization']} "
-                f"({row['email']})"
-            )
+        return count
 
     def _handle_list_cases(self):
-        """Helper to print all cases (used by option 2 and 3)."""
-        cases = self.DB.get_all_cases()
-        if not cases:
+        """
+        Helper to print all cases (used by option 2 and 3).
+
+        Cases are streamed page by page; returns the number printed.
+        """
+        count = 0
+        for page in self.DB.iter_cases():
+            if count == 0:
+                print("\n--- Cases ---")
+            for c in page:
+                print(
+                    f"[{c.case_id}] {c.case_name} "
+                    f"(Client: {c.client_name}, Status: {c.case_status})"
+                )
+            count += len(page)
+
+        if not count:
             print("\n(No cases found.)")
-            return []
-
-        print("\n--- Cases ---")
-        for c in cases:
-            print(
-                f"[{c['case_id']}] {c['case_name']} "
-                f"(Client: {c['client_name']}, Status: {c['case_status']})"
-            )
-        return cases
+        return count
 
     def _handle_view_case_with_lawyers(self):
         """Allow the user to pick a case and see all its assigned lawyers."""
@@ -122,15 +182,15 @@ class UserInterface(ApplicationBase):
             print("Invalid case_id. Please enter a number.")
             return
 
-        # 3. Retrieve case + lawyers from service layer
-        rows = self.DB.get_case_with_lawyers(case_id)
+        # 3. Retrieve the case grouped with its lawyers from service layer
+        roster = self.DB.get_case_roster(case_id)
 
-        if not rows:
+        if roster is None:
             print(f"No case found with case_id = {case_id}.")
             return
 
-        # 4. Print case details (use the first row for case-level info)
-        case = rows[0]
+        # 4. Print case details
+        case = roster["case"]
         print("\n--- Case Details ---")
         print(f"Case ID: {case['case_id']}")
         print(f"Case Name: {case['case_name']}")
@@ -138,12 +198,7 @@ class UserInterface(ApplicationBase):
         print(f"Status: {case['case_status']}")
 
         print("\nAssigned Lawyers:")
-        has_lawyer = False
-        for row in rows:
-            # If no lawyer yet, the LEFT JOIN will give None values
-            if row["lawyer_id"] is None:
-                continue
-            has_lawyer = True
+        for row in roster["lawyers"]:
             print(
                 f" - {row['first_name']} {row['last_name']} "
                 f"({row['specialization']}) "
@@ -151,7 +206,7 @@ class UserInterface(ApplicationBase):
                 f"| Billable Hours: {row['billable_hours']}"
             )
 
-        if not has_lawyer:
+        if not roster["lawyers"]:
             print(" (No lawyers assigned yet.)")
 
     # ---------- Add lawyer ----------
@@ -165,14 +220,11 @@ class UserInterface(ApplicationBase):
         email = input("Email: ").strip()
         phone = input("Phone (optional, press Enter to skip): ").strip()
 
-        # Basic validation:names must contain letters 
-        if not first.isalpha() or not last.isalpha():
-            print("[!] First and last name must contain letters only.")
-            return
-        
-        # Basic validation: email must contain '@'
-        if "@" not in email:
-            print("[!] Email address must contain '@'.")
+        # Basic validation: letters-only names, email must contain '@'
+        try:
+            validate_lawyer(first, last, email)
+        except ValueError as e:
+            print(f"[!] {e}")
             return
 
         phone_value = phone if phone else None
@@ -204,8 +256,10 @@ class UserInterface(ApplicationBase):
         if description == "":
             description = None
 
-        if not case_name or not client_name or not case_status or not start_date:
-            print("[!] Case name, client name, status, and start date are required.")
+        try:
+            validate_case(case_name, client_name, case_status, start_date)
+        except ValueError as e:
+            print(f"[!] {e}")
             return
 
         try:
@@ -237,19 +291,233 @@ class UserInterface(ApplicationBase):
         hours_raw = input("Billable hours (e.g., 5.0): ").strip()
 
         try:
-            lawyer_id = int(lawyer_raw)
-            case_id = int(case_raw)
-            billable_hours = float(hours_raw)
+            case_id, lawyer_id, role, billable_hours = parse_assignment(
+                case_raw, lawyer_raw, role, hours_raw
+            )
+        except ValueError as e:
+            print(f"[!] {e}")
+            return
+
+        try:
+            self.DB.assign_lawyer_to_case(case_id, lawyer_id, role, billable_hours)
+            if self.DB.write_behind is not None:
+                print("\n[✓] Assignment saved; it will show up once the queue is flushed.")
+            else:
+                print("\n[✓] Lawyer assigned to case successfully.")
+        except Exception as e:
+            print(f"[!] Error assigning lawyer to case: {e}")
+
+    def _handle_record_hours(self):
+        """Append one time entry to the billable hours ledger."""
+        print("\n--- Record Hours Worked ---")
+        case_raw = input("Enter case_id: ").strip()
+        lawyer_raw = input("Enter lawyer_id: ").strip()
+        hours_raw = input("Hours worked (negative to correct an entry): ").strip()
+        work_date = input("Work date YYYY-MM-DD (optional, default today): ").strip() or None
+        note = input("Note (optional): ").strip() or None
+
+        try:
+            case_id, lawyer_id = int(case_raw), int(lawyer_raw)
         except ValueError:
-            print("[!] Please enter valid numeric values for IDs and hours.")
+            print("[!] case_id and lawyer_id must be whole numbers.")
+            return
+
+        try:
+            entry_id = self.DB.hours_ledger.record_hours(
+                case_id, lawyer_id, hours_raw, work_date, note
+            )
+            totals = self.DB.hours_ledger.get_case_hours(case_id)
+            print(
+                f"\n[✓] Entry {entry_id} recorded; case {case_id} now has "
+                f"{totals['total_hours']} h over {totals['entry_count']} entries."
+            )
+        except ValueError as e:
+            print(f"[!] {e}")
+        except Exception as e:
+            print(f"[!] Error recording hours: {e}")
+
+    # ---------- Shutdown ----------
+
+    def _handle_shutdown(self):
+        """Flush the write-behind queue (if enabled) and stop its thread."""
+        if self.DB.write_behind is None:
             return
+        pending = self.DB.write_behind.pending_count()
+        if pending:
+            print(f"Saving {pending} queued assignment(s)...")
+        try:
+            self.DB.close()
+        except Exception as e:
+            print(f"[!] Could not save queued assignments, they will be retried on next start: {e}")
+
+    # ---------- Staff a case ----------
+
+    def _handle_staff_case(self):
+        """Assign several lawyers to one case, all or nothing."""
+        print("\n--- Staff a Case ---")
+        case_raw = input("Enter case_id to staff: ").strip()
+        print("Enter one lawyer per line as: lawyer_id, role, billable hours")
+        print("(e.g. 12, Lead, 5.0). Press Enter on an empty line when done.")
+
+        assignments = []
+        while True:
+            line = input(f"Lawyer {len(assignments) + 1}: ").strip()
+            if not line:
+                break
+            fields = [field.strip() for field in line.split(",")]
+            if len(fields) != 3:
+                print("[!] Expected: lawyer_id, role, billable hours")
+                continue
+            try:
+                case_id, lawyer_id, role, billable_hours = parse_assignment(
+                    case_raw, fields[0], fields[1], fields[2]
+                )
+            except ValueError as e:
+                print(f"[!] {e}")
+                continue
+            assignments.append((lawyer_id, role, billable_hours))
 
-        if not role:
-            print("[!] Role is required.")
+        if not assignments:
+            print("[!] No lawyers entered; nothing was saved.")
             return
 
         try:
-            self.DB.assign_lawyer_to_case(case_id, lawyer_id, role, billable_hours)
-            print("\n[✓] Lawyer assigned to case successfully.")
+            result = self.DB.staff_case(case_id, assignments)
         except Exception as e:
-            print(f"[!] Error assigning lawyer to case: {e}")
+            print(f"[!] Error staffing case, no assignments were saved: {e}")
+            return
+
+        print(
+            f"\n[✓] Case {case_id} staffed: {len(result['inserted'])} lawyer(s) added, "
+            f"{len(result['updated'])} existing assignment(s) updated."
+        )
+
+    # ---------- Billable hours reports ----------
+
+    def _handle_billable_hours_report(self, name: str, title: str):
+        """Print one of the server-side aggregated billable hours reports."""
+        try:
+            headers, rows = self.DB.get_billable_hours_report(name)
+        except Exception as e:
+            print(f"[!] Error running report: {e}")
+            return
+
+        print(f"\n--- {title} ---")
+        if not rows:
+            print("(No billable hours recorded.)")
+            return
+
+        # Size each column to its widest value
+        table = [headers] + [tuple(str(v) for v in row) for row in rows]
+        widths = [max(len(row[i]) for row in table) for i in range(len(headers))]
+        for i, row in enumerate(table):
+            print(
+                "  ".join(value.ljust(widths[j]) for j, value in enumerate(row)).rstrip()
+            )
+            if i == 0:
+                print("  ".join("-" * width for width in widths))
+
+    # ---------- Search ----------
+
+    def _handle_search_lawyers(self):
+        """Full-text search over lawyers, one page of matches at a time."""
+        self._run_search(
+            "Lawyers",
+            self.DB.search_lawyers,
+            self.DB.typeahead_lawyers,
+            lambda lawyer: (
+                f"[{lawyer.lawyer_id}] {lawyer.full_name} "
+                f"- {lawyer.specialization} ({lawyer.email})"
+            ),
+        )
+
+    def _handle_search_cases(self):
+        """Full-text search over cases, one page of matches at a time."""
+        self._run_search(
+            "Cases",
+            self.DB.search_cases,
+            self.DB.typeahead_cases,
+            lambda c: (
+                f"[{c.case_id}] {c.case_name} "
+                f"(Client: {c.client_name}, Status: {c.case_status})"
+            ),
+        )
+
+    def _run_search(self, title: str, search, typeahead, describe):
+        """Prompt for a query, then print pages until the user stops."""
+        query = input("\nSearch for (or press Enter to cancel): ").strip()
+        if not query:
+            print("Cancelled.")
+            return
+
+        page = 1
+        while True:
+            try:
+                rows = search(query, page)
+            except Exception as e:
+                print(f"[!] Error searching: {e}")
+                return
+
+            if not rows:
+                if page == 1:
+                    print("\n(No matches found.)")
+                    self._print_suggestions(query, typeahead)
+                else:
+                    print("\n(No more matches.)")
+                return
+
+            print(f"\n--- {title} matching '{query}' (page {page}) ---")
+            for row in rows:
+                print(describe(row))
+
+            if len(rows) < self.DB.search_page_size:
+                return
+            if input("\nPress n for the next page, Enter to stop: ").strip().lower() != "n":
+                return
+            page += 1
+
+    def _print_suggestions(self, query: str, typeahead):
+        """Offer prefix matches on the last word typed."""
+        words = query.split()
+        try:
+            suggestions = typeahead(words[-1]) if words else []
+        except Exception:
+            return
+        if suggestions:
+            print("Did you mean:")
+            for item_id, label in suggestions:
+                print(f"  [{item_id}] {label}")
+
+    # ---------- Diagnostics ----------
+
+    def _handle_pool_metrics(self):
+        """Print the connection pool counters and wait-time histogram."""
+        metrics = self.DB.get_pool_metrics()
+        histogram = metrics.pop("wait_histogram")
+        replicas = metrics.pop("replicas", {})
+
+        print("\n--- Connection Pool ---")
+        for key, value in metrics.items():
+            if isinstance(value, float):
+                value = f"{value:.4f}"
+            print(f"{key}: {value}")
+
+        print("\nCheckout wait times:")
+        for bucket, count in histogram.items():
+            print(f"  {bucket:>9}: {count}")
+
+        if replicas:
+            print("\nRead replicas:")
+            for name, replica in replicas.items():
+                state = "healthy" if replica["healthy"] else "ejected"
+                print(
+                    f"  {name}: {state}, {replica['checkouts']} checkouts, "
+                    f"{replica['in_use']} in use, {replica['ejections']} ejections"
+                )
+                if replica["last_error"]:
+                    print(f"    last error: {replica['last_error']}")
+
+    def _handle_query_profile(self):
+        """Print per-statement latency percentiles recorded this session."""
+        print("\n--- Query Latency (this session) ---")
+        print(self.DB.get_query_profile_report())
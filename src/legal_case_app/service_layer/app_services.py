@@ -2,13 +2,183 @@
 """Implements AppServices Class."""
 
 from legal_case_app.application_base import ApplicationBase
-from legal_case_app.persistence_layer.mysql_persistence_wrapper import MySQLPersistenceWrapper
+from legal_case_app.models import CaseAssignment, LegalCase, Lawyer
+from legal_case_app.persistence_layer.persistence_backend import create_backend
+from legal_case_app.persistence_layer.row_formats import (
+    ROW_FORMATS,
+    convert_rows,
+    to_columns,
+)
+from legal_case_app.service_layer.prefix_index import PrefixIndex
+from legal_case_app.service_layer.roster_cache import RosterCache
+from legal_case_app.service_layer.hours_ledger_service import HoursLedgerService
+from legal_case_app.service_layer.write_behind_buffer import WriteBehindBuffer
+from contextlib import contextmanager
 import inspect
+import itertools
+import threading
+import time
 
 
 class AppServices(ApplicationBase):
     """AppServices Class Definition."""
 
+    # Explicit column lists (instead of SELECT *) for each table, in the
+    # field order of the row models they are loaded into.
+    LAWYER_COLUMNS = Lawyer.COLUMNS
+    CASE_COLUMNS = LegalCase.COLUMNS
+    CASE_LAWYER_COLUMNS = CaseAssignment.COLUMNS
+
+    DEFAULT_PAGE_SIZE = 500
+    DEFAULT_MAX_PREPARED_STATEMENTS = 64
+    DEFAULT_STREAM_BATCH_SIZE = 1000
+
+    # INSERT statements shared by the single-row add_* methods and bulk import
+    INSERT_LAWYER_SQL = """
+        INSERT INTO lawyer (first_name, last_name, specialization, email, phone, hire_date)
+        VALUES (%s, %s, %s, %s, %s, CURDATE());
+        """
+    INSERT_CASE_SQL = """
+        INSERT INTO legal_case
+            (case_name, client_name, case_status, start_date, end_date, description)
+        VALUES (%s, %s, %s, %s, %s, %s);
+        """
+    INSERT_CASE_LAWYER_SQL = """
+        INSERT INTO case_lawyer_xref (case_id, lawyer_id, role, billable_hours)
+        VALUES (%s, %s, %s, %s);
+        """
+    # Insert or, on the unique (case_id, lawyer_id) key, update the assignment
+    UPSERT_CASE_LAWYER_SQL = """
+        INSERT INTO case_lawyer_xref (case_id, lawyer_id, role, billable_hours)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            role = VALUES(role),
+            billable_hours = VALUES(billable_hours);
+        """
+    # One round trip for staff_case: which of the ids exist and which
+    # lawyers are already on the case. {lawyer_ids} is a list of %s.
+    STAFFING_CHECK_SQL = """
+        SELECT 'case' AS kind, case_id AS id
+        FROM legal_case
+        WHERE case_id = %s
+        UNION ALL
+        SELECT 'lawyer', lawyer_id
+        FROM lawyer
+        WHERE lawyer_id IN ({lawyer_ids})
+        UNION ALL
+        SELECT 'assigned', lawyer_id
+        FROM case_lawyer_xref
+        WHERE case_id = %s AND lawyer_id IN ({lawyer_ids});
+        """
+
+    # Case + assigned lawyers LEFT JOIN. {source} is legal_case or a derived
+    # table with the same columns, {where} filters/orders the result.
+    ROSTER_SQL = """
+        SELECT
+            lc.case_id,
+            lc.case_name,
+            lc.client_name,
+            lc.case_status,
+            lc.start_date,
+            l.lawyer_id,
+            l.first_name,
+            l.last_name,
+            l.specialization,
+            cl.role,
+            cl.billable_hours
+        FROM {source} lc
+        LEFT JOIN case_lawyer_xref cl
+            ON lc.case_id = cl.case_id
+        LEFT JOIN lawyer l
+            ON cl.lawyer_id = l.lawyer_id
+        {where};
+        """
+    # ROSTER_SQL for archived cases (migration 007)
+    ARCHIVE_ROSTER_SQL = ROSTER_SQL.replace(
+        "JOIN case_lawyer_xref cl", "JOIN case_lawyer_xref_archive cl"
+    )
+    # Hot table -> archive table, for the include_archive reads
+    ARCHIVE_TABLES = {
+        "legal_case": "legal_case_archive",
+        "case_lawyer_xref": "case_lawyer_xref_archive",
+    }
+    # One keyset page of cases with a given status (params: status, last
+    # case_id, limit), used as the {source} of ROSTER_SQL.
+    CASES_BY_STATUS_SOURCE = (
+        "(SELECT case_id, case_name, client_name, case_status, start_date "
+        "FROM legal_case WHERE case_status = %s AND case_id > %s "
+        "ORDER BY case_id LIMIT %s)"
+    )
+    # The same for cases in a case_id range (params: last case_id of the
+    # range, last case_id read, limit)
+    CASES_IN_RANGE_SOURCE = (
+        "(SELECT case_id, case_name, client_name, case_status, start_date "
+        "FROM legal_case WHERE case_id <= %s AND case_id > %s "
+        "ORDER BY case_id LIMIT %s)"
+    )
+    ROSTER_CASE_KEYS = (
+        "case_id",
+        "case_name",
+        "client_name",
+        "case_status",
+        "start_date",
+    )
+    ROSTER_LAWYER_KEYS = (
+        "lawyer_id",
+        "first_name",
+        "last_name",
+        "specialization",
+        "role",
+        "billable_hours",
+    )
+
+    DEFAULT_ROSTER_CHUNK_SIZE = 1000
+
+    # Ranked FULLTEXT search (migration 003). {match} must list exactly the
+    # columns of the table's FULLTEXT index.
+    SEARCH_SQL = """
+        SELECT {columns},
+            MATCH ({match}) AGAINST (%s IN BOOLEAN MODE) AS score
+        FROM {table}
+        WHERE MATCH ({match}) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY score DESC, {key}
+        LIMIT %s OFFSET %s;
+        """
+    LAWYER_SEARCH_MATCH = "first_name, last_name, specialization, email"
+    CASE_SEARCH_MATCH = "case_name, client_name, description"
+
+    DEFAULT_SEARCH_PAGE_SIZE = 20
+    DEFAULT_SEARCH_MAX_RESULTS = 1000
+
+    # Report name -> (method, column headers), shared by the UI and main.py
+    BILLABLE_HOURS_REPORTS = {
+        "by-lawyer": (
+            "get_billable_hours_by_lawyer",
+            ("lawyer_id", "first_name", "last_name", "total_hours", "avg_hours", "assignments"),
+        ),
+        "by-case": (
+            "get_billable_hours_by_case",
+            ("case_id", "case_name", "case_status", "total_hours", "avg_hours", "assignments"),
+        ),
+        "by-role": (
+            "get_billable_hours_by_role",
+            ("role", "total_hours", "avg_hours", "assignments"),
+        ),
+        "by-status-month": (
+            "get_billable_hours_by_status_month",
+            ("case_status", "start_month", "total_hours", "avg_hours", "assignments"),
+        ),
+        # Hours ledger (migration 004), read from its running totals
+        "ledger-by-lawyer": (
+            "get_ledger_hours_by_lawyer",
+            ("lawyer_id", "first_name", "last_name", "total_hours", "entries"),
+        ),
+        "ledger-by-case": (
+            "get_ledger_hours_by_case",
+            ("case_id", "case_name", "case_status", "total_hours", "entries"),
+        ),
+    }
+
     def __init__(self, config: dict) -> None:
         """Initialize AppServices and wire it to the DB wrapper."""
         self._config_dict = config
@@ -20,114 +190,1042 @@ class AppServices(ApplicationBase):
             logfile_prefix_name=self.META["log_prefix"],
         )
 
-        # Create the DB wrapper (this sets up the connection pool)
-        self.db = MySQLPersistenceWrapper(config)
+        # Create the DB backend named by database.backend (MySQL by default;
+        # its connection pool opens on first query)
+        self.db = create_backend(config)
         self.DB = self.db
-        self._connection_pool = self.db._connection_pool
+
+        # Rows per page for the keyset-paginated iter_* methods
+        self.page_size = config.get("service", {}).get(
+            "page_size", self.DEFAULT_PAGE_SIZE
+        )
+        # Default fetch_all row format ('dict' or 'record'; service methods
+        # read rows by column name, so 'tuple' is only for direct callers)
+        self.row_format = config.get("service", {}).get("row_format", "dict")
+        if self.row_format not in ("dict", "record"):
+            raise ValueError(
+                f"service.row_format must be 'dict' or 'record', got '{self.row_format}'."
+            )
+        # Prepared statements, cached per pooled connection (LRU)
+        self.prepared_statements = config.get("service", {}).get(
+            "prepared_statements", False
+        )
+        self.max_prepared_statements = config.get("service", {}).get(
+            "max_prepared_statements", self.DEFAULT_MAX_PREPARED_STATEMENTS
+        )
+        if self.prepared_statements and config.get("database", {}).get(
+                "pool", {}).get("reset_session", True):
+            self._logger.log_warning(
+                "%s: service.prepared_statements is on but database.pool.reset_session "
+                "is true; every check-in drops the prepared statements, so they are "
+                "re-prepared on each use",
+                inspect.currentframe().f_code.co_name,
+            )
+        # Case ids per IN (...) query for the batched roster fetches
+        self.roster_chunk_size = config.get("service", {}).get(
+            "roster_chunk_size", self.DEFAULT_ROSTER_CHUNK_SIZE
+        )
+
+        # Read-through cache for get_case_with_lawyers; every write path
+        # below invalidates the case_id it touched.
+        cache_config = config.get("cache", {}).get("case_roster", {})
+        self.roster_cache = RosterCache(
+            max_entries=cache_config.get("max_entries", 1024),
+            ttl_seconds=cache_config.get("ttl_seconds", 60),
+        )
+
+        # Search paging limits and the optional typeahead prefix indexes,
+        # built on first use unless the table has more than max_rows rows
+        search_config = config.get("search", {})
+        self.search_page_size = search_config.get(
+            "page_size", self.DEFAULT_SEARCH_PAGE_SIZE
+        )
+        self.search_max_results = search_config.get(
+            "max_results", self.DEFAULT_SEARCH_MAX_RESULTS
+        )
+        typeahead_config = search_config.get("typeahead", {})
+        self.typeahead_enabled = typeahead_config.get("enabled", False)
+        self.typeahead_max_rows = typeahead_config.get("max_rows", 500000)
+        self._prefix_indexes = {}
+        self._prefix_index_lock = threading.Lock()
+
+        # Connection of the transaction() open on the current thread, if any
+        self._local = threading.local()
+
+        # Billable hours ledger (migration 004); add_billable_hours and the
+        # write-behind queue record hours through it
+        self.hours_ledger = HoursLedgerService(config, self)
+
+        # Optional write-behind queue for assignments and hours (off by default)
+        self.write_behind = None
+        if config.get("write_behind", {}).get("enabled", False):
+            self.write_behind = WriteBehindBuffer(config, self)
 
         self._logger.log_debug(
-            f'{inspect.currentframe().f_code.co_name}: '
-            f'AppServices initialized. DB Config: {self.db.DB_CONFIG}'
+            '%s: AppServices initialized. DB Config: %s',
+            inspect.currentframe().f_code.co_name, self.db.DB_CONFIG
         )
 
+    # ---------- Write-behind ----------
+
+    def _buffering(self) -> bool:
+        """Queue writes in write_behind? Not inside transaction(), which must stay atomic."""
+        return (self.write_behind is not None
+                and getattr(self._local, "connection", None) is None)
+
+    def flush_writes(self) -> int:
+        """Write everything queued in write_behind now; returns the entries written."""
+        if self.write_behind is None:
+            return 0
+        return self.write_behind.flush()
+
+    def close(self):
+        """Flush and stop write_behind. Call before the process exits."""
+        if self.write_behind is not None:
+            self.write_behind.close()
+
     # ---------- Low-level helpers ----------
 
-    def fetch_all(self, query: str, params=None):
+    @contextmanager
+    def transaction(self, flush_queued: bool = True):
+        """
+        Run every statement on this thread inside one transaction.
+
+        fetch_all/execute/execute_many called inside the block share one
+        pooled connection and nothing is committed until the block exits.
+        An exception rolls everything back (and clears the roster cache and
+        typeahead indexes, which may hold rows written or read inside the
+        transaction) and is re-raised.
+        Nested blocks join the outer transaction.
+
+        :param flush_queued: first write whatever write_behind has queued,
+            so a queued write to the same assignment cannot land after
+            (and overwrite) this one. Only the write-behind flush itself
+            passes False.
+        """
+        if getattr(self._local, "connection", None) is not None:
+            yield
+            return
+
+        if flush_queued and self.write_behind is not None and self.write_behind.pending_count():
+            self.write_behind.flush()
+
+        connection = self.db.get_connection()
+        self._local.connection = connection
+        self._local.touched_case_ids = set()
+        try:
+            yield
+            connection.commit()
+            self.db.note_write()
+        except BaseException:
+            connection.rollback()
+            self.roster_cache.clear()
+            with self._prefix_index_lock:
+                self._prefix_indexes.clear()
+            raise
+        finally:
+            touched = self._local.touched_case_ids
+            self._local.connection = None
+            self._local.touched_case_ids = None
+            connection.close()
+            # Other threads may have cached the pre-commit rows meanwhile
+            self.roster_cache.invalidate(*touched)
+
+    @contextmanager
+    def savepoint(self, name: str):
+        """
+        Inside transaction(): if the block raises, undo only the statements
+        run in it (ROLLBACK TO SAVEPOINT) and re-raise; the enclosing
+        transaction carries on.
+
+        :param name: savepoint name, a plain identifier
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            raise RuntimeError("savepoint() must be used inside transaction().")
+
+        def run(statement):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(statement)
+            finally:
+                cursor.close()
+
+        run(f"SAVEPOINT {name};")
+        try:
+            yield
+        except BaseException:
+            run(f"ROLLBACK TO SAVEPOINT {name};")
+            raise
+        run(f"RELEASE SAVEPOINT {name};")
+
+    def _checkout(self, read: bool = False):
+        """
+        Return (connection, owned). owned is False inside transaction(),
+        where the caller must neither commit nor close the connection.
+
+        :param read: the statement only reads, so it may run on a replica
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection, False
+        if read:
+            return self.db.get_read_connection(), True
+        return self.db.get_connection(), True
+
+    def fetch_all(self, query: str, params=None, dictionary: bool = True,
+                  row_format=None, read: bool = True):
         """
         Run a SELECT and return all rows as dictionaries.
 
+        Outside transaction() the query runs on a read replica when
+        database.replicas is configured (see get_read_connection), and
+        is retried on the primary if that replica has just gone away.
+
         :param query: SQL SELECT statement
         :param params: tuple of parameters or None
+        :param dictionary: False to return plain tuples instead
+        :param row_format: 'tuple', 'dict' or 'record' (overrides dictionary;
+            default service.row_format)
+        :param read: False to always read from the primary
         """
-        connection = self._connection_pool.get_connection()
-        cursor = connection.cursor(dictionary=True)
+        if row_format is None:
+            row_format = self.row_format if dictionary else "tuple"
+        return self._fetch_all(query, params, row_format, read=read)
+
+    def _fetch_all(self, query: str, params, row_format: str, read: bool):
+        """fetch_all on a replica (read=True, if configured) or the primary."""
+        started = time.perf_counter()
+        connection, owned = self._checkout(read)
+        checked_out = time.perf_counter()
+        cursor, statement, cached = self._cursor(connection, query, row_format)
+        failed_over = False
         try:
             if params:
-                cursor.execute(query, params)
+                cursor.execute(statement, params)
             else:
-                cursor.execute(query)
+                cursor.execute(statement)
             results = cursor.fetchall()
-            return results
+            if cursor.description and (cached or row_format == "record"):
+                results = convert_rows(
+                    results, [column[0] for column in cursor.description], row_format
+                )
+        except Exception as e:
+            # A replica that dropped the query is ejected and the read rerun
+            # on the primary; any other error is the caller's
+            if not (read and owned and self.db.report_read_failure(connection, e)):
+                raise
+            failed_over = True
         finally:
-            cursor.close()
-            connection.close()
+            if not cached:
+                cursor.close()
+            if owned:
+                connection.close()
+
+        if failed_over:
+            return self._fetch_all(query, params, row_format, read=False)
+        self._profile(query, started, checked_out, len(results), results)
+        return results
 
-    def execute(self, query: str, params=None):
+    def stream_rows(self, query: str, params=None, row_format: str = "tuple",
+                    batch_size=None):
+        """
+        Yield lists of rows from an unbuffered cursor, batch_size at a time.
+
+        Rows are read from the socket as they are consumed instead of being
+        buffered in full, so results far larger than memory can be walked.
+        The connection stays checked out until the generator is exhausted
+        or closed.
+
+        :param row_format: 'tuple' (default), 'dict' or 'record'
+        :param batch_size: rows per yielded list (fetchmany size)
+        """
+        if row_format not in ROW_FORMATS:
+            raise ValueError(
+                f"Unknown row format '{row_format}'. Expected one of: {', '.join(ROW_FORMATS)}."
+            )
+        batch_size = batch_size or self.DEFAULT_STREAM_BATCH_SIZE
+        started = time.perf_counter()
+        connection, owned = self._checkout(read=True)
+        checked_out = time.perf_counter()
+        cursor = connection.cursor(buffered=False)
+        rows = 0
+        try:
+            cursor.execute(query, params or ())
+            columns = [column[0] for column in cursor.description]
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                rows += len(batch)
+                yield convert_rows(batch, columns, row_format)
+        except Exception as e:
+            # Batches were already handed out, so no failover; just eject
+            if owned:
+                self.db.report_read_failure(connection, e)
+            raise
+        finally:
+            try:
+                # Drain anything unread so the connection can be reused
+                if getattr(connection, "unread_result", False):
+                    connection.consume_results()
+            finally:
+                cursor.close()
+                if owned:
+                    connection.close()
+            self._profile(query, started, checked_out, rows)
+
+    def _cursor(self, connection, query: str, row_format: str):
+        """
+        Return (cursor, statement, cached) for query on connection.
+
+        With prepared_statements on, the prepared cursor for query is
+        reused from the connection's statement cache (cached is True and
+        the caller must not close it); it returns tuples, and statement is
+        query without its trailing ';' (not allowed in a prepared
+        statement). Otherwise a fresh cursor, returning dicts for
+        row_format 'dict'.
+        """
+        cache = getattr(connection, "statement_cache", None)
+        if not self.prepared_statements or cache is None:
+            return connection.cursor(dictionary=(row_format == "dict")), query, False
+
+        entry = cache.get(query)
+        if entry is not None:
+            cache.move_to_end(query)
+            return entry[0], entry[1], True
+
+        entry = (connection.cursor(prepared=True), query.strip().rstrip(";"))
+        cache[query] = entry
+        while len(cache) > self.max_prepared_statements:
+            _, (evicted, _) = cache.popitem(last=False)
+            try:
+                evicted.close()
+            except Exception:
+                pass
+        return entry[0], entry[1], True
+
+    def execute(self, query: str, params=None, rowcount: bool = False):
         """
         Run an INSERT/UPDATE/DELETE.
 
         :param query: SQL statement
         :param params: tuple of parameters or None
+        :param rowcount: return the number of affected rows instead
+        :return: the AUTO_INCREMENT id of an inserted row, if any
         """
-        connection = self._connection_pool.get_connection()
-        cursor = connection.cursor()
+        started = time.perf_counter()
+        connection, owned = self._checkout()
+        checked_out = time.perf_counter()
+        cursor, statement, cached = self._cursor(connection, query, "tuple")
         try:
             if params:
-                cursor.execute(query, params)
+                cursor.execute(statement, params)
             else:
-                cursor.execute(query)
-            connection.commit()
+                cursor.execute(statement)
+            if owned:
+                connection.commit()
+                self.db.note_write()
+            affected, lastrowid = cursor.rowcount, cursor.lastrowid
+        finally:
+            if not cached:
+                cursor.close()
+            if owned:
+                connection.close()
+
+        self._profile(query, started, checked_out, affected)
+        return affected if rowcount else lastrowid
+
+    def execute_many(self, query: str, seq_params):
+        """
+        Run one INSERT/UPDATE/DELETE for many parameter tuples.
+
+        All rows are written with a single executemany call (which the
+        connector rewrites into a multi-row INSERT) and committed as one
+        transaction. On error the whole batch is rolled back and the
+        exception is re-raised. Inside transaction() the batch is left for
+        the enclosing block to commit or roll back.
+
+        :param query: SQL statement
+        :param seq_params: list of parameter tuples
+        :return: number of affected rows
+        """
+        started = time.perf_counter()
+        connection, owned = self._checkout()
+        checked_out = time.perf_counter()
+        cursor = connection.cursor()
+        try:
+            cursor.executemany(query, seq_params)
+            if owned:
+                connection.commit()
+                self.db.note_write()
+            rowcount = cursor.rowcount
+        except Exception:
+            if owned:
+                connection.rollback()
+            raise
         finally:
             cursor.close()
-            connection.close()
+            if owned:
+                connection.close()
+
+        self._profile(query, started, checked_out, rowcount)
+        return rowcount
+
+    def _profile(self, query: str, started: float, checked_out: float, rows: int,
+                 results=None):
+        """
+        Hand timings for one statement to the wrapper's QueryProfiler.
+
+        :param started: perf_counter() before the pool checkout
+        :param checked_out: perf_counter() once a connection was obtained
+        :param rows: rows returned (SELECT) or affected (writes)
+        :param results: fetched rows, used to estimate bytes transferred
+        """
+        profiler = self.db.profiler
+        if not profiler.enabled:
+            return
+        finished = time.perf_counter()
+        profiler.record(
+            query,
+            wall_seconds=finished - checked_out,
+            pool_wait_seconds=checked_out - started,
+            rows=rows,
+            nbytes=profiler.estimate_bytes(results) if results else 0,
+        )
+
+    def get_query_profile_report(self) -> str:
+        """Return p50/p95/p99 latency per normalized statement as a table."""
+        return self.db.profiler.format_report()
+
+    def fetch_models(self, query: str, params, model) -> list:
+        """
+        Run a SELECT of model.COLUMNS (in that order) and return one model
+        per row, built straight from tuples (no per-row dict).
+        """
+        return model.from_rows(self.fetch_all(query, params, row_format="tuple"))
+
+    def fetch_columns(self, query: str, params=None) -> dict:
+        """
+        Run a SELECT and return it column-oriented: {column: values}.
+        Integer and float columns come back as compact array.array values.
+        """
+        started = time.perf_counter()
+        connection, owned = self._checkout(read=True)
+        checked_out = time.perf_counter()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(query, params or ())
+            rows = cursor.fetchall()
+            columns = [column[0] for column in cursor.description]
+        except Exception as e:
+            if owned:
+                self.db.report_read_failure(connection, e)
+            raise
+        finally:
+            cursor.close()
+            if owned:
+                connection.close()
+
+        self._profile(query, started, checked_out, len(rows))
+        return to_columns(rows, columns)
+
+    def _iter_pages(self, table: str, key: str, model, page_size=None):
+        """
+        Yield lists of models from a table, one page at a time.
+
+        Uses keyset pagination on the primary key (WHERE key > last seen
+        ORDER BY key LIMIT n), so every page is a short index range scan
+        and only one page is held in memory at a time.
+
+        :param table: table name
+        :param key: integer primary key column to page on
+        :param model: row model whose COLUMNS are selected (must include key)
+        :param page_size: rows per page, defaults to self.page_size
+        """
+        page_size = page_size or self.page_size
+        query = self._keyset_query(table, key, model.COLUMNS)
+        last_key = 0
+        while True:
+            page = self.fetch_models(query, (last_key, page_size), model)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            last_key = getattr(page[-1], key)
+
+    @staticmethod
+    def _keyset_query(table: str, key: str, columns: tuple) -> str:
+        """Return the SELECT for one keyset page (params: last key, limit)."""
+        return (
+            f"SELECT {', '.join(columns)} FROM {table} "
+            f"WHERE {key} > %s ORDER BY {key} LIMIT %s;"
+        )
 
     # ---------- Existing list methods ----------
 
     def get_all_lawyers(self):
-        """Return all lawyers."""
-        query = "SELECT * FROM lawyer;"
-        return self.fetch_all(query)
+        """Return all lawyers as Lawyer models."""
+        query = f"SELECT {', '.join(self.LAWYER_COLUMNS)} FROM lawyer;"
+        return self.fetch_models(query, None, Lawyer)
+
+    def get_all_cases(self, include_archive: bool = False):
+        """Return all cases as LegalCase models (archived ones last with include_archive)."""
+        query = f"SELECT {', '.join(self.CASE_COLUMNS)} FROM {{table}};"
+        return self._fetch_models_with_archive(query, "legal_case", LegalCase, include_archive)
+
+    def get_case_lawyers(self, include_archive: bool = False):
+        """Return all case_lawyer_xref rows as CaseAssignment models."""
+        query = f"SELECT {', '.join(self.CASE_LAWYER_COLUMNS)} FROM {{table}};"
+        return self._fetch_models_with_archive(
+            query, "case_lawyer_xref", CaseAssignment, include_archive
+        )
+
+    def get_case_lawyer_columns(self) -> dict:
+        """Return every case_lawyer_xref row column-oriented (see fetch_columns)."""
+        query = f"SELECT {', '.join(self.CASE_LAWYER_COLUMNS)} FROM case_lawyer_xref;"
+        return self.fetch_columns(query)
+
+    # ---------- Streaming (keyset-paginated) list methods ----------
 
-    def get_all_cases(self):
-        """Return all cases."""
-        query = "SELECT * FROM legal_case;"
-        return self.fetch_all(query)
+    def iter_lawyers(self, page_size=None):
+        """Yield pages of Lawyer models ordered by lawyer_id."""
+        return self._iter_pages("lawyer", "lawyer_id", Lawyer, page_size)
 
-    def get_case_lawyers(self):
-        """Return all rows from the case_lawyer_xref table."""
-        query = "SELECT * FROM case_lawyer_xref;"
-        return self.fetch_all(query)
+    def iter_cases(self, page_size=None, include_archive: bool = False):
+        """
+        Yield pages of LegalCase models ordered by case_id; with
+        include_archive the archived cases follow, also by case_id.
+        """
+        return self._iter_pages_with_archive(
+            "legal_case", "case_id", LegalCase, page_size, include_archive
+        )
+
+    def iter_case_lawyers(self, page_size=None, include_archive: bool = False):
+        """Yield pages of CaseAssignment models ordered by id (then archived ones)."""
+        return self._iter_pages_with_archive(
+            "case_lawyer_xref", "id", CaseAssignment, page_size, include_archive
+        )
+
+    # ---------- Archive (migration 007) ----------
+
+    def _fetch_models_with_archive(self, query: str, table: str, model,
+                                   include_archive: bool) -> list:
+        """Run query (FROM {table}) on table, and then on its archive if asked."""
+        models = self.fetch_models(query.format(table=table), None, model)
+        if include_archive:
+            models += self.fetch_models(
+                query.format(table=self.ARCHIVE_TABLES[table]), None, model
+            )
+        return models
+
+    def _iter_pages_with_archive(self, table: str, key: str, model, page_size,
+                                 include_archive: bool):
+        pages = self._iter_pages(table, key, model, page_size)
+        if not include_archive:
+            return pages
+        return itertools.chain(
+            pages, self._iter_pages(self.ARCHIVE_TABLES[table], key, model, page_size)
+        )
+
+    def _table_source(self, table: str, columns: tuple, include_archive: bool) -> str:
+        """table, or a derived table of table UNION ALL its archive."""
+        if not include_archive:
+            return table
+        columns = ", ".join(columns)
+        return (
+            f"(SELECT {columns} FROM {table} "
+            f"UNION ALL SELECT {columns} FROM {self.ARCHIVE_TABLES[table]})"
+        )
+
+    def invalidate_prefix_index(self, table: str):
+        """Drop a typeahead index after rows left its table; it is rebuilt on next use."""
+        with self._prefix_index_lock:
+            self._prefix_indexes.pop(table, None)
 
     # ---------- New feature methods ----------
 
-    def get_case_with_lawyers(self, case_id: int):
+    def get_case_with_lawyers(self, case_id: int, include_archive: bool = False):
         """
         Return a joined view of one case and its assigned lawyers.
 
         If there are no lawyers yet, we still return the case details
-        (because of the LEFT JOIN).
+        (because of the LEFT JOIN). With include_archive, a case that is not
+        in legal_case is looked up in the archive (not cached).
+        """
+        query = self.ROSTER_SQL.format(
+            source="legal_case", where="WHERE lc.case_id = %s"
+        )
+        # Loaded from the primary: a lagging replica could put the pre-write
+        # roster back in the cache right after a write invalidated it
+        rows = self.roster_cache.get_or_load(
+            case_id, lambda key: self.fetch_all(query, (key,), read=False)
+        )
+        if rows or not include_archive:
+            return rows
+        query = self.ARCHIVE_ROSTER_SQL.format(
+            source="legal_case_archive", where="WHERE lc.case_id = %s"
+        )
+        return self.fetch_all(query, (case_id,))
+
+    def get_case_roster(self, case_id: int, include_archive: bool = False):
+        """
+        Return one case grouped as {"case": {...}, "lawyers": [...]}.
+
+        Served from the roster cache; returns None if the case doesn't exist.
+        """
+        rows = self.get_case_with_lawyers(case_id, include_archive)
+        return self.group_roster_rows(rows).get(case_id)
+
+    def get_cases_with_lawyers(self, case_ids, chunk_size=None):
+        """
+        Return the rosters of many cases in a few chunked IN (...) queries.
+
+        :param case_ids: iterable of case_id values (duplicates are ignored)
+        :param chunk_size: ids per query, defaults to self.roster_chunk_size
+        :return: dict of case_id -> {"case": {...}, "lawyers": [...]};
+                 unknown ids are simply absent
+        """
+        chunk_size = chunk_size or self.roster_chunk_size
+        ids = sorted(set(case_ids))
+        rosters = {}
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            query = self.ROSTER_SQL.format(
+                source="legal_case",
+                where=f"WHERE lc.case_id IN ({placeholders}) ORDER BY lc.case_id",
+            )
+            self.group_roster_rows(self.fetch_all(query, tuple(chunk)), rosters)
+        return rosters
+
+    def get_cases_with_lawyers_by_status(self, case_status: str, chunk_size=None):
+        """
+        Return the rosters of every case with the given case_status.
+
+        Cases are read in keyset-paginated chunks of chunk_size, each chunk
+        joined to its lawyers in one query.
+
+        :return: dict of case_id -> {"case": {...}, "lawyers": [...]}
+        """
+        rosters = {}
+        for chunk in self.iter_case_rosters_by_status(case_status, chunk_size):
+            rosters.update(chunk)
+        return rosters
+
+    def iter_case_rosters_by_status(self, case_status: str, chunk_size=None):
+        """Yield grouped roster dicts for case_status, one chunk of cases at a time."""
+        return self._iter_case_rosters(
+            self.CASES_BY_STATUS_SOURCE, (case_status,), 0, chunk_size
+        )
+
+    def iter_case_rosters_in_range(self, after_case_id: int, last_case_id: int,
+                                   chunk_size=None):
+        """
+        Yield grouped roster dicts for the cases with
+        after_case_id < case_id <= last_case_id, one chunk of cases at a time.
+        """
+        return self._iter_case_rosters(
+            self.CASES_IN_RANGE_SOURCE, (last_case_id,), after_case_id, chunk_size
+        )
+
+    def _iter_case_rosters(self, source: str, params: tuple, after_case_id: int,
+                           chunk_size=None):
+        """
+        Keyset-page the cases of source (a CASES_*_SOURCE taking params,
+        then the last case_id read and the limit) joined to their lawyers.
+        """
+        chunk_size = chunk_size or self.roster_chunk_size
+        query = self.ROSTER_SQL.format(source=source, where="ORDER BY lc.case_id")
+        last_case_id = after_case_id
+        while True:
+            chunk = self.group_roster_rows(
+                self.fetch_all(query, (*params, last_case_id, chunk_size))
+            )
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last_case_id = max(chunk)
+
+    # ---------- Search ----------
+
+    def search_lawyers(self, query: str, page: int = 1, page_size=None):
+        """
+        Ranked full-text search over lawyer names, specialization and email.
+
+        Every word must match the start of a word in one of those columns.
+        Returns Lawyer models, best match first.
+
+        :param query: free text, e.g. "jor mil tax"
+        :param page: 1-based page number
+        :param page_size: rows per page, defaults to search.page_size
+        """
+        return self._search(
+            "lawyer", "lawyer_id", Lawyer, self.LAWYER_SEARCH_MATCH,
+            query, page, page_size,
+        )
+
+    def search_cases(self, query: str, page: int = 1, page_size=None):
+        """
+        Ranked full-text search over case name, client and description.
+        Same matching and paging as search_lawyers; returns LegalCase models.
+        """
+        return self._search(
+            "legal_case", "case_id", LegalCase, self.CASE_SEARCH_MATCH,
+            query, page, page_size,
+        )
+
+    def typeahead_lawyers(self, prefix: str, limit: int = 10):
+        """
+        Return up to limit (lawyer_id, "First Last") suggestions for prefix.
+
+        Uses the in-memory prefix index when search.typeahead is enabled,
+        otherwise (or for tables too large to index) a FULLTEXT prefix query.
+        """
+        index = self._prefix_index("lawyer")
+        if index is not None:
+            return index.search(prefix, limit)
+        return [
+            (lawyer.lawyer_id, lawyer.full_name)
+            for lawyer in self.search_lawyers(prefix, page_size=limit)
+        ]
+
+    def typeahead_cases(self, prefix: str, limit: int = 10):
+        """Return up to limit (case_id, case_name) suggestions for prefix."""
+        index = self._prefix_index("legal_case")
+        if index is not None:
+            return index.search(prefix, limit)
+        return [
+            (case.case_id, case.case_name)
+            for case in self.search_cases(prefix, page_size=limit)
+        ]
+
+    @staticmethod
+    def to_boolean_query(text: str) -> str:
+        """
+        Turn free text into a BOOLEAN MODE query requiring a prefix match
+        of every word ("jor mil" -> "+jor* +mil*"). Operators typed by the
+        user are dropped.
+        """
+        return " ".join(f"+{word}*" for word in PrefixIndex.words(text))
+
+    def _search(self, table: str, key: str, model, match: str,
+                query: str, page: int, page_size):
+        """Run SEARCH_SQL for one page; pages past search.max_results are empty."""
+        boolean_query = self.to_boolean_query(query)
+        if not boolean_query:
+            return []
+        page_size = min(page_size or self.search_page_size, self.search_max_results)
+        offset = (max(page, 1) - 1) * page_size
+        if offset >= self.search_max_results:
+            return []
+        sql = self.SEARCH_SQL.format(
+            columns=", ".join(model.COLUMNS), match=match, table=table, key=key
+        )
+        rows = self.fetch_all(
+            sql, (boolean_query, boolean_query, page_size, offset), row_format="tuple"
+        )
+        # The trailing score column only orders the rows
+        return [model(*row[:-1]) for row in rows]
+
+    def _prefix_index(self, table: str):
+        """The typeahead PrefixIndex for table, built on first use, or None."""
+        if not self.typeahead_enabled:
+            return None
+        with self._prefix_index_lock:
+            if table in self._prefix_indexes:
+                return self._prefix_indexes[table]
+
+            count = self.fetch_all(f"SELECT COUNT(*) AS n FROM {table};")[0]["n"]
+            index = None
+            if count > self.typeahead_max_rows:
+                self._logger.log_warning(
+                    "%s: %s has %d rows (> search.typeahead.max_rows %d); "
+                    "typeahead falls back to FULLTEXT",
+                    inspect.currentframe().f_code.co_name, table, count,
+                    self.typeahead_max_rows,
+                )
+            elif table == "lawyer":
+                index = PrefixIndex.from_items(
+                    (lawyer.lawyer_id, lawyer.full_name)
+                    for page in self.iter_lawyers() for lawyer in page
+                )
+            else:
+                index = PrefixIndex.from_items(
+                    (case.case_id, case.case_name)
+                    for page in self.iter_cases() for case in page
+                )
+            self._prefix_indexes[table] = index
+            return index
+
+    # ---------- Billable hours reports (aggregated in MySQL) ----------
+
+    def get_billable_hours_by_lawyer(self, include_archive: bool = False):
+        """
+        Return (lawyer_id, first_name, last_name, total_hours, avg_hours,
+        assignments) per lawyer with at least one assignment.
         """
         query = """
-        SELECT
-            lc.case_id,
-            lc.case_name,
-            lc.client_name,
-            lc.case_status,
-            lc.start_date,
-            l.lawyer_id,
-            l.first_name,
-            l.last_name,
-            l.specialization,
-            cl.role,
-            cl.billable_hours
-        FROM legal_case lc
-        LEFT JOIN case_lawyer_xref cl
-            ON lc.case_id = cl.case_id
-        LEFT JOIN lawyer l
-            ON cl.lawyer_id = l.lawyer_id
-        WHERE lc.case_id = %s;
+        SELECT l.lawyer_id, l.first_name, l.last_name,
+               t.total_hours, t.avg_hours, t.assignments
+        FROM (
+            SELECT lawyer_id,
+                   SUM(billable_hours) AS total_hours,
+                   ROUND(AVG(billable_hours), 2) AS avg_hours,
+                   COUNT(*) AS assignments
+            FROM {assignments} cl
+            GROUP BY lawyer_id
+        ) t
+        JOIN lawyer l ON l.lawyer_id = t.lawyer_id
+        ORDER BY t.total_hours DESC, l.lawyer_id;
         """
-        return self.fetch_all(query, (case_id,))
+        return self._report(query, include_archive)
 
-    def add_lawyer(self, first_name, last_name, specialization, email, phone=None):
+    def get_billable_hours_by_case(self, include_archive: bool = False):
         """
-        Insert a new lawyer. hire_date is set to today's date by MySQL.
+        Return (case_id, case_name, case_status, total_hours, avg_hours,
+        assignments) per case with at least one assignment.
         """
         query = """
-        INSERT INTO lawyer (first_name, last_name, specialization, email, phone, hire_date)
-        VALUES (%s, %s, %s, %s, %s, CURDATE());
+        SELECT lc.case_id, lc.case_name, lc.case_status,
+               t.total_hours, t.avg_hours, t.assignments
+        FROM (
+            SELECT case_id,
+                   SUM(billable_hours) AS total_hours,
+                   ROUND(AVG(billable_hours), 2) AS avg_hours,
+                   COUNT(*) AS assignments
+            FROM {assignments} cl
+            GROUP BY case_id
+        ) t
+        JOIN {cases} lc ON lc.case_id = t.case_id
+        ORDER BY t.total_hours DESC, lc.case_id;
+        """
+        return self._report(query, include_archive)
+
+    def get_billable_hours_by_role(self, include_archive: bool = False):
+        """Return (role, total_hours, avg_hours, assignments) per role."""
+        query = """
+        SELECT role,
+               SUM(billable_hours) AS total_hours,
+               ROUND(AVG(billable_hours), 2) AS avg_hours,
+               COUNT(*) AS assignments
+        FROM {assignments} cl
+        GROUP BY role
+        ORDER BY total_hours DESC, role;
+        """
+        return self._report(query, include_archive)
+
+    def get_billable_hours_by_status_month(self, include_archive: bool = False):
+        """
+        Return (case_status, start_month 'YYYY-MM', total_hours, avg_hours,
+        assignments) per case status and month of the case start_date.
+        """
+        query = """
+        SELECT lc.case_status,
+               DATE_FORMAT(lc.start_date, '%Y-%m') AS start_month,
+               SUM(cl.billable_hours) AS total_hours,
+               ROUND(AVG(cl.billable_hours), 2) AS avg_hours,
+               COUNT(*) AS assignments
+        FROM {assignments} cl
+        JOIN {cases} lc ON lc.case_id = cl.case_id
+        GROUP BY lc.case_status, start_month
+        ORDER BY lc.case_status, start_month;
+        """
+        return self._report(query, include_archive)
+
+    def get_ledger_hours_by_lawyer(self, include_archive: bool = False):
+        """
+        Return (lawyer_id, first_name, last_name, total_hours, entries) per
+        lawyer with time entries, one lawyer_hours_total row each.
+
+        include_archive is accepted for the report interface; cases with
+        time entries are never archived.
+        """
+        query = """
+        SELECT l.lawyer_id, l.first_name, l.last_name, t.total_hours, t.entry_count
+        FROM lawyer_hours_total t
+        JOIN lawyer l ON l.lawyer_id = t.lawyer_id
+        WHERE t.entry_count > 0
+        ORDER BY t.total_hours DESC, l.lawyer_id;
+        """
+        return self.fetch_all(query, dictionary=False)
+
+    def get_ledger_hours_by_case(self, include_archive: bool = False):
+        """
+        Return (case_id, case_name, case_status, total_hours, entries) per
+        case with time entries, one case_hours_total row each.
+        """
+        query = """
+        SELECT lc.case_id, lc.case_name, lc.case_status, t.total_hours, t.entry_count
+        FROM case_hours_total t
+        JOIN legal_case lc ON lc.case_id = t.case_id
+        WHERE t.entry_count > 0
+        ORDER BY t.total_hours DESC, lc.case_id;
+        """
+        return self.fetch_all(query, dictionary=False)
+
+    def get_billable_hours_report(self, name: str, columnar: bool = False,
+                                  include_archive: bool = False):
+        """
+        Return (headers, rows) for one of BILLABLE_HOURS_REPORTS.
+
+        :param name: report name, e.g. 'by-lawyer'
+        :param columnar: return (headers, {column: values}) instead of rows
+        :param include_archive: also count archived cases and assignments
+        """
+        if name not in self.BILLABLE_HOURS_REPORTS:
+            raise ValueError(
+                f"Unknown report '{name}'. "
+                f"Expected one of: {', '.join(self.BILLABLE_HOURS_REPORTS)}."
+            )
+        method_name, headers = self.BILLABLE_HOURS_REPORTS[name]
+        rows = getattr(self, method_name)(include_archive)
+        if columnar:
+            return headers, to_columns(rows, headers)
+        return headers, rows
+
+    def _report(self, query: str, include_archive: bool):
+        """Run a report query over {assignments} and {cases}, hot or hot + archive."""
+        query = query.format(
+            assignments=self._table_source(
+                "case_lawyer_xref", ("case_id", "lawyer_id", "role", "billable_hours"),
+                include_archive,
+            ),
+            cases=self._table_source(
+                "legal_case", ("case_id", "case_name", "case_status", "start_date"),
+                include_archive,
+            ),
+        )
+        return self.fetch_all(query, dictionary=False)
+
+    def plan_check_queries(self) -> list:
+        """
+        Return [(name, sql, params)] for the targeted service queries.
+
+        Used by QueryPlanChecker to EXPLAIN each access path. The legacy
+        unpaged get_all_* methods are full scans by design and not listed.
+        """
+        return [
+            (
+                "iter_lawyers",
+                self._keyset_query("lawyer", "lawyer_id", self.LAWYER_COLUMNS),
+                (0, self.page_size),
+            ),
+            (
+                "iter_cases",
+                self._keyset_query("legal_case", "case_id", self.CASE_COLUMNS),
+                (0, self.page_size),
+            ),
+            (
+                "iter_case_lawyers",
+                self._keyset_query("case_lawyer_xref", "id", self.CASE_LAWYER_COLUMNS),
+                (0, self.page_size),
+            ),
+            (
+                "get_case_with_lawyers",
+                self.ROSTER_SQL.format(
+                    source="legal_case", where="WHERE lc.case_id = %s"
+                ),
+                (1,),
+            ),
+            (
+                "get_cases_with_lawyers",
+                self.ROSTER_SQL.format(
+                    source="legal_case",
+                    where="WHERE lc.case_id IN (%s, %s, %s) ORDER BY lc.case_id",
+                ),
+                (1, 2, 3),
+            ),
+            (
+                "iter_case_rosters_by_status",
+                self.ROSTER_SQL.format(
+                    source=self.CASES_BY_STATUS_SOURCE, where="ORDER BY lc.case_id"
+                ),
+                ("Open", 0, self.roster_chunk_size),
+            ),
+            (
+                "iter_case_rosters_in_range",
+                self.ROSTER_SQL.format(
+                    source=self.CASES_IN_RANGE_SOURCE, where="ORDER BY lc.case_id"
+                ),
+                (self.roster_chunk_size, 0, self.roster_chunk_size),
+            ),
+            (
+                "staff_case",
+                self.STAFFING_CHECK_SQL.format(lawyer_ids="%s, %s, %s"),
+                (1, 1, 2, 3, 1, 1, 2, 3),
+            ),
+            (
+                "search_lawyers",
+                self.SEARCH_SQL.format(
+                    columns=", ".join(self.LAWYER_COLUMNS),
+                    match=self.LAWYER_SEARCH_MATCH, table="lawyer", key="lawyer_id",
+                ),
+                ("+smith*", "+smith*", self.search_page_size, 0),
+            ),
+            (
+                "search_cases",
+                self.SEARCH_SQL.format(
+                    columns=", ".join(self.CASE_COLUMNS),
+                    match=self.CASE_SEARCH_MATCH, table="legal_case", key="case_id",
+                ),
+                ("+smith*", "+smith*", self.search_page_size, 0),
+            ),
+        ]
+
+    @staticmethod
+    def group_roster_rows(rows, rosters=None) -> dict:
+        """
+        Group flat case/lawyer LEFT JOIN rows by case.
+
+        :param rows: rows shaped like ROSTER_SQL results
+        :param rosters: optional dict to add to
+        :return: dict of case_id -> {"case": {...}, "lawyers": [...]}
+        """
+        if rosters is None:
+            rosters = {}
+        for row in rows:
+            roster = rosters.get(row["case_id"])
+            if roster is None:
+                roster = {
+                    "case": {key: row[key] for key in AppServices.ROSTER_CASE_KEYS},
+                    "lawyers": [],
+                }
+                rosters[row["case_id"]] = roster
+            # A case with no lawyers yet comes back as one row of NULLs
+            if row["lawyer_id"] is not None:
+                roster["lawyers"].append(
+                    {key: row[key] for key in AppServices.ROSTER_LAWYER_KEYS}
+                )
+        return rosters
+
+    def get_pool_metrics(self) -> dict:
+        """Return connection pool metrics (checkouts, waits, in-use, ...)."""
+        return self.db.pool_metrics()
+
+    def invalidate_case_rosters(self, *case_ids):
+        """Drop cached rosters for case_ids after writing to them."""
+        self.roster_cache.invalidate(*case_ids)
+        touched = getattr(self._local, "touched_case_ids", None)
+        if touched is not None:
+            touched.update(case_ids)
+
+    def add_lawyer(self, first_name, last_name, specialization, email, phone=None):
+        """
+        Insert a new lawyer. hire_date is set to today's date by MySQL.
+        Returns the new lawyer_id.
         """
-        self.execute(query, (first_name, last_name, specialization, email, phone))
+        lawyer_id = self.execute(
+            self.INSERT_LAWYER_SQL,
+            (first_name, last_name, specialization, email, phone),
+        )
+        index = self._prefix_indexes.get("lawyer")
+        if index is not None:
+            index.add(lawyer_id, f"{first_name} {last_name}")
+        return lawyer_id
 
     def add_case(
         self,
@@ -145,15 +1243,15 @@ class AppServices(ApplicationBase):
         end_date is optional.
         description is optional.
         """
-        query = """
-        INSERT INTO legal_case
-            (case_name, client_name, case_status, start_date, end_date, description)
-        VALUES (%s, %s, %s, %s, %s, %s);
-        """
-        self.execute(
-            query,
+        case_id = self.execute(
+            self.INSERT_CASE_SQL,
             (case_name, client_name, case_status, start_date, end_date, description),
         )
+        self.invalidate_case_rosters(case_id)
+        index = self._prefix_indexes.get("legal_case")
+        if index is not None:
+            index.add(case_id, case_name)
+        return case_id
 
     def assign_lawyer_to_case(
         self,
@@ -164,9 +1262,93 @@ class AppServices(ApplicationBase):
     ):
         """
         Link a lawyer to a case with role + billable hours.
+
+        With write_behind enabled (and no transaction() open) the
+        assignment is only queued: it is written by a later flush, as an
+        upsert, and a missing case or lawyer ends up in the rejects file
+        instead of raising here.
         """
-        query = """
-        INSERT INTO case_lawyer_xref (case_id, lawyer_id, role, billable_hours)
-        VALUES (%s, %s, %s, %s);
+        if self._buffering():
+            self.write_behind.assign(case_id, lawyer_id, role, billable_hours)
+            return
+        try:
+            self.execute(
+                self.INSERT_CASE_LAWYER_SQL,
+                (case_id, lawyer_id, role, billable_hours),
+            )
+        finally:
+            self.invalidate_case_rosters(case_id)
+
+    def add_billable_hours(self, case_id: int, lawyer_id: int, hours, work_date=None,
+                           note=None):
+        """
+        Record hours worked (negative to correct) in the hours ledger.
+
+        Same as hours_ledger.record_hours, returning the new entry_id and
+        raising ValueError if the lawyer is not assigned to the case. With
+        write_behind enabled the entry is queued like assign_lawyer_to_case
+        and None is returned.
+        """
+        if self._buffering():
+            self.write_behind.add_hours(case_id, lawyer_id, hours, work_date, note)
+            return None
+        return self.hours_ledger.record_hours(case_id, lawyer_id, hours, work_date, note)
+
+    def staff_case(self, case_id: int, assignments):
+        """
+        Assign a whole team to a case in one transaction.
+
+        The case and every lawyer are checked in a single query before
+        anything is written; lawyers already on the case get their role
+        and hours updated instead of a second row. Either every
+        assignment is saved or none is.
+
+        :param case_id: case to staff
+        :param assignments: list of (lawyer_id, role, billable_hours)
+        :return: {"inserted": [lawyer_id, ...], "updated": [lawyer_id, ...]}
         """
-        self.execute(query, (case_id, lawyer_id, role, billable_hours))
+        assignments = list(assignments)
+        if not assignments:
+            raise ValueError("At least one assignment is required.")
+
+        lawyer_ids = [lawyer_id for lawyer_id, _, _ in assignments]
+        repeated = sorted({i for i in lawyer_ids if lawyer_ids.count(i) > 1})
+        if repeated:
+            raise ValueError(
+                f"Lawyer(s) listed more than once: {', '.join(map(str, repeated))}."
+            )
+
+        placeholders = ", ".join(["%s"] * len(lawyer_ids))
+        check_query = self.STAFFING_CHECK_SQL.format(lawyer_ids=placeholders)
+        check_params = (case_id, *lawyer_ids, case_id, *lawyer_ids)
+
+        with self.transaction():
+            found = {"case": set(), "lawyer": set(), "assigned": set()}
+            for kind, found_id in self.fetch_all(check_query, check_params, dictionary=False):
+                found[kind].add(found_id)
+
+            if case_id not in found["case"]:
+                raise ValueError(f"No case found with case_id = {case_id}.")
+            missing = [i for i in lawyer_ids if i not in found["lawyer"]]
+            if missing:
+                raise ValueError(
+                    f"No lawyer found with lawyer_id = {', '.join(map(str, missing))}."
+                )
+
+            self.execute_many(
+                self.UPSERT_CASE_LAWYER_SQL,
+                [
+                    (case_id, lawyer_id, role, billable_hours)
+                    for lawyer_id, role, billable_hours in assignments
+                ],
+            )
+            self.invalidate_case_rosters(case_id)
+
+        self._logger.log_debug(
+            "%s: staffed case %s with %d lawyer(s)",
+            inspect.currentframe().f_code.co_name, case_id, len(assignments),
+        )
+        return {
+            "inserted": [i for i in lawyer_ids if i not in found["assigned"]],
+            "updated": [i for i in lawyer_ids if i in found["assigned"]],
+        }
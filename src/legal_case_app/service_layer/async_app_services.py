@@ -0,0 +1,344 @@
+
+"""Implements AsyncAppServices Class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.service_layer.app_services import AppServices
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
+import inspect
+
+
+class AsyncAppServices(ApplicationBase):
+    """
+    asyncio front end for AppServices.
+
+    Every public AppServices method has an awaitable twin with the same SQL
+    and the same return shape. Calls run on a thread pool sized to the
+    MySQL connection pool (size + max_overflow), and an asyncio.Semaphore
+    bounds how many are in flight so callers queue in the event loop
+    rather than on the connection pool. iter_* methods become async generators.
+    """
+
+    def __init__(self, config: dict, services: AppServices = None, max_in_flight=None) -> None:
+        """
+        Initialize AsyncAppServices.
+
+        :param config: application config dict
+        :param services: optional AppServices to wrap (one is created otherwise)
+        :param max_in_flight: concurrent calls allowed, default the pool capacity
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.services = services or AppServices(config)
+
+        # More in-flight calls than the pool can hand out connections for
+        # would only queue on the pool, so cap the limit at its capacity.
+        pool_config = config["database"]["pool"]
+        pool_capacity = pool_config["size"] + pool_config.get("max_overflow", 0)
+        if max_in_flight and max_in_flight > pool_capacity:
+            self._logger.log_warning(
+                f"{inspect.currentframe().f_code.co_name}: "
+                f"max_in_flight={max_in_flight} exceeds the pool capacity; "
+                f"using {pool_capacity}."
+            )
+            max_in_flight = pool_capacity
+        self.max_in_flight = max_in_flight or pool_capacity
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="async-app-services"
+        )
+        self._semaphore = None
+
+        self._logger.log_debug(
+            f"{inspect.currentframe().f_code.co_name}: "
+            f"AsyncAppServices initialized, max_in_flight={self.max_in_flight}"
+        )
+
+    # ---------- Plumbing ----------
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking AppServices call on the executor, bounded by the semaphore."""
+        return await self._run_on(self._executor, func, *args, **kwargs)
+
+    async def _run_on(self, executor, func, *args, **kwargs):
+        """_run on the given executor."""
+        if self._semaphore is None:
+            # Created lazily so it binds to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        # Run in a copy of this task's context, so a write on one worker
+        # thread keeps the task's later reads on the primary (read-your-writes)
+        self.services.db.write_session()
+        context = contextvars.copy_context()
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, context.run, functools.partial(func, *args, **kwargs)
+            )
+
+    async def _iterate(self, generator, executor=None):
+        """Drive a blocking page generator, fetching each page on the executor."""
+        executor = executor or self._executor
+        done = object()
+        try:
+            while True:
+                page = await self._run_on(executor, next, generator, done)
+                if page is done:
+                    return
+                yield page
+        finally:
+            # A caller that stops early must still give back the connection
+            # (stream_rows keeps one checked out until it is closed)
+            await self._run_on(executor, generator.close)
+
+    def close(self):
+        """Shut down the worker threads, then flush and stop the wrapped AppServices."""
+        self._executor.shutdown(wait=True)
+        self.services.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---------- Low-level helpers ----------
+
+    async def fetch_all(self, query: str, params=None, dictionary: bool = True,
+                        row_format=None, read: bool = True):
+        """Async AppServices.fetch_all."""
+        return await self._run(
+            self.services.fetch_all, query, params, dictionary, row_format, read
+        )
+
+    async def fetch_models(self, query: str, params, model) -> list:
+        """Async AppServices.fetch_models."""
+        return await self._run(self.services.fetch_models, query, params, model)
+
+    async def fetch_columns(self, query: str, params=None) -> dict:
+        """Async AppServices.fetch_columns."""
+        return await self._run(self.services.fetch_columns, query, params)
+
+    async def stream_rows(self, query: str, params=None, row_format: str = "tuple",
+                          batch_size=None):
+        """Async generator version of AppServices.stream_rows."""
+        generator = self.services.stream_rows(query, params, row_format, batch_size)
+        # The stream keeps one connection checked out between batches; use
+        # it from a single thread (the SQLite backend's lock is per thread)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-stream-rows")
+        batches = self._iterate(generator, executor)
+        try:
+            async for rows in batches:
+                yield rows
+        finally:
+            await batches.aclose()
+            executor.shutdown(wait=False)
+
+    async def execute(self, query: str, params=None, rowcount: bool = False):
+        """Async AppServices.execute."""
+        return await self._run(self.services.execute, query, params, rowcount)
+
+    async def execute_many(self, query: str, seq_params):
+        """Async AppServices.execute_many."""
+        return await self._run(self.services.execute_many, query, seq_params)
+
+    # ---------- Metrics ----------
+
+    # In-memory reads, so they skip the executor and the semaphore and
+    # still answer while every connection is busy
+
+    async def get_pool_metrics(self) -> dict:
+        """Async AppServices.get_pool_metrics."""
+        return self.services.get_pool_metrics()
+
+    async def get_query_profile_report(self) -> str:
+        """Async AppServices.get_query_profile_report."""
+        return self.services.get_query_profile_report()
+
+    # ---------- List methods ----------
+
+    async def get_all_lawyers(self):
+        """Async AppServices.get_all_lawyers."""
+        return await self._run(self.services.get_all_lawyers)
+
+    async def get_all_cases(self, include_archive: bool = False):
+        """Async AppServices.get_all_cases."""
+        return await self._run(self.services.get_all_cases, include_archive)
+
+    async def get_case_lawyers(self, include_archive: bool = False):
+        """Async AppServices.get_case_lawyers."""
+        return await self._run(self.services.get_case_lawyers, include_archive)
+
+    async def get_case_lawyer_columns(self) -> dict:
+        """Async AppServices.get_case_lawyer_columns."""
+        return await self._run(self.services.get_case_lawyer_columns)
+
+    async def iter_lawyers(self, page_size=None):
+        """Async generator version of AppServices.iter_lawyers."""
+        async for page in self._iterate(self.services.iter_lawyers(page_size)):
+            yield page
+
+    async def iter_cases(self, page_size=None, include_archive: bool = False):
+        """Async generator version of AppServices.iter_cases."""
+        generator = self.services.iter_cases(page_size, include_archive)
+        async for page in self._iterate(generator):
+            yield page
+
+    async def iter_case_lawyers(self, page_size=None, include_archive: bool = False):
+        """Async generator version of AppServices.iter_case_lawyers."""
+        generator = self.services.iter_case_lawyers(page_size, include_archive)
+        async for page in self._iterate(generator):
+            yield page
+
+    # ---------- Rosters ----------
+
+    async def get_case_with_lawyers(self, case_id: int, include_archive: bool = False):
+        """Async AppServices.get_case_with_lawyers."""
+        return await self._run(self.services.get_case_with_lawyers, case_id, include_archive)
+
+    async def get_case_roster(self, case_id: int, include_archive: bool = False):
+        """Async AppServices.get_case_roster."""
+        return await self._run(self.services.get_case_roster, case_id, include_archive)
+
+    async def get_cases_with_lawyers(self, case_ids, chunk_size=None):
+        """Async AppServices.get_cases_with_lawyers."""
+        return await self._run(
+            self.services.get_cases_with_lawyers, list(case_ids), chunk_size
+        )
+
+    async def get_cases_with_lawyers_by_status(self, case_status: str, chunk_size=None):
+        """Async AppServices.get_cases_with_lawyers_by_status."""
+        return await self._run(
+            self.services.get_cases_with_lawyers_by_status, case_status, chunk_size
+        )
+
+    async def iter_case_rosters_by_status(self, case_status: str, chunk_size=None):
+        """Async generator version of AppServices.iter_case_rosters_by_status."""
+        generator = self.services.iter_case_rosters_by_status(case_status, chunk_size)
+        async for chunk in self._iterate(generator):
+            yield chunk
+
+    async def iter_case_rosters_in_range(self, after_case_id: int, last_case_id: int,
+                                         chunk_size=None):
+        """Async generator version of AppServices.iter_case_rosters_in_range."""
+        generator = self.services.iter_case_rosters_in_range(
+            after_case_id, last_case_id, chunk_size
+        )
+        async for chunk in self._iterate(generator):
+            yield chunk
+
+    def invalidate_case_rosters(self, *case_ids):
+        """Same as AppServices.invalidate_case_rosters (no I/O, so not async)."""
+        self.services.invalidate_case_rosters(*case_ids)
+
+    # ---------- Search ----------
+
+    async def search_lawyers(self, query: str, page: int = 1, page_size=None):
+        """Async AppServices.search_lawyers."""
+        return await self._run(self.services.search_lawyers, query, page, page_size)
+
+    async def search_cases(self, query: str, page: int = 1, page_size=None):
+        """Async AppServices.search_cases."""
+        return await self._run(self.services.search_cases, query, page, page_size)
+
+    async def typeahead_lawyers(self, prefix: str, limit: int = 10):
+        """Async AppServices.typeahead_lawyers."""
+        return await self._run(self.services.typeahead_lawyers, prefix, limit)
+
+    async def typeahead_cases(self, prefix: str, limit: int = 10):
+        """Async AppServices.typeahead_cases."""
+        return await self._run(self.services.typeahead_cases, prefix, limit)
+
+    # ---------- Billable hours reports ----------
+
+    async def get_billable_hours_by_lawyer(self, include_archive: bool = False):
+        """Async AppServices.get_billable_hours_by_lawyer."""
+        return await self._run(self.services.get_billable_hours_by_lawyer, include_archive)
+
+    async def get_billable_hours_by_case(self, include_archive: bool = False):
+        """Async AppServices.get_billable_hours_by_case."""
+        return await self._run(self.services.get_billable_hours_by_case, include_archive)
+
+    async def get_billable_hours_by_role(self, include_archive: bool = False):
+        """Async AppServices.get_billable_hours_by_role."""
+        return await self._run(self.services.get_billable_hours_by_role, include_archive)
+
+    async def get_billable_hours_by_status_month(self, include_archive: bool = False):
+        """Async AppServices.get_billable_hours_by_status_month."""
+        return await self._run(self.services.get_billable_hours_by_status_month, include_archive)
+
+    async def get_ledger_hours_by_lawyer(self, include_archive: bool = False):
+        """Async AppServices.get_ledger_hours_by_lawyer."""
+        return await self._run(self.services.get_ledger_hours_by_lawyer, include_archive)
+
+    async def get_ledger_hours_by_case(self, include_archive: bool = False):
+        """Async AppServices.get_ledger_hours_by_case."""
+        return await self._run(self.services.get_ledger_hours_by_case, include_archive)
+
+    async def get_billable_hours_report(self, name: str, columnar: bool = False,
+                                        include_archive: bool = False):
+        """Async AppServices.get_billable_hours_report."""
+        return await self._run(
+            self.services.get_billable_hours_report, name, columnar, include_archive
+        )
+
+    # ---------- Writes ----------
+
+    async def add_lawyer(self, first_name, last_name, specialization, email, phone=None):
+        """Async AppServices.add_lawyer."""
+        return await self._run(
+            self.services.add_lawyer, first_name, last_name, specialization, email, phone
+        )
+
+    async def add_case(
+        self,
+        case_name,
+        client_name,
+        case_status,
+        start_date,
+        end_date=None,
+        description=None,
+    ):
+        """Async AppServices.add_case."""
+        return await self._run(
+            self.services.add_case,
+            case_name,
+            client_name,
+            case_status,
+            start_date,
+            end_date,
+            description,
+        )
+
+    async def assign_lawyer_to_case(
+        self,
+        case_id: int,
+        lawyer_id: int,
+        role: str,
+        billable_hours: float,
+    ):
+        """Async AppServices.assign_lawyer_to_case."""
+        return await self._run(
+            self.services.assign_lawyer_to_case, case_id, lawyer_id, role, billable_hours
+        )
+
+    async def add_billable_hours(self, case_id: int, lawyer_id: int, hours, work_date=None,
+                                 note=None):
+        """Async AppServices.add_billable_hours."""
+        return await self._run(
+            self.services.add_billable_hours, case_id, lawyer_id, hours, work_date, note
+        )
+
+    async def flush_writes(self):
+        """Async AppServices.flush_writes."""
+        return await self._run(self.services.flush_writes)
+
+    async def staff_case(self, case_id: int, assignments):
+        """Async AppServices.staff_case."""
+        return await self._run(self.services.staff_case, case_id, assignments)
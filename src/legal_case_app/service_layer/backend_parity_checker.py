@@ -0,0 +1,251 @@
+"""Implements the BackendParityChecker class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.service_layer.app_services import AppServices
+from legal_case_app.service_layer.hours_ledger_service import HoursLedgerService
+from array import array
+from collections.abc import Mapping
+from datetime import date
+from decimal import Decimal
+import copy
+import inspect
+
+
+class _Ids():
+    """Maps one backend's AUTO_INCREMENT ids to stable names (L0, C1, ...)."""
+
+    def __init__(self) -> None:
+        self.lawyers = []
+        self.cases = []
+
+    def lawyer(self, index: int) -> int:
+        return self.lawyers[index]
+
+    def case(self, index: int) -> int:
+        return self.cases[index]
+
+    def name(self, key: str, value):
+        ids = self.lawyers if key == "lawyer_id" else self.cases
+        return f"{key[0].upper()}{ids.index(value)}" if value in ids else value
+
+
+class BackendParityChecker(ApplicationBase):
+    """
+    Runs the same AppServices / HoursLedgerService calls against two
+    backends and compares what they return.
+
+    The reference is the configured backend (normally MySQL); the other is
+    an in-memory SQLite database. Every step writes or reads through the
+    public service API, and results are compared after normalizing what
+    legitimately differs between engines: generated ids (compared by
+    creation order), numeric types (Decimal vs float, compared to two
+    decimals), dates, the order of search hits (MySQL relevance scores are
+    not reproduced) and error classes (only "raised ValueError" vs
+    "raised a database error" is compared).
+
+    The reference database must be empty: point the config at a scratch
+    database, as for the benchmark seeding.
+    """
+
+    TABLES = ("lawyer", "legal_case", "case_lawyer_xref", "time_entry")
+
+    # Result keys whose values are generated ids (staff_case returns lawyer ids)
+    ID_KEYS = {
+        "lawyer_id": "lawyer_id",
+        "case_id": "case_id",
+        "inserted": "lawyer_id",
+        "updated": "lawyer_id",
+    }
+
+    def __init__(self, config: dict, other_config: dict = None) -> None:
+        """
+        Initialize the checker.
+
+        :param config: application config dict of the reference backend
+        :param other_config: config of the backend to compare, default the
+                             same config with an in-memory SQLite database
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        if other_config is None:
+            other_config = copy.deepcopy(config)
+            other_config["database"]["backend"] = "sqlite"
+            other_config["database"]["sqlite"] = dict(
+                other_config["database"].get("sqlite", {}), path=":memory:"
+            )
+        # Writes must reach the database before the next step reads them back
+        self.configs = tuple(
+            dict(each, write_behind=dict(each.get("write_behind", {}), enabled=False))
+            for each in (config, other_config)
+        )
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Public API ----------
+
+    def check(self) -> list:
+        """
+        Run every step on both backends.
+
+        :return: list of (step name, ok, reference result, other result)
+        :raises ValueError: if the reference database is not empty
+        """
+        runs = []
+        for config in self.configs:
+            services = AppServices(config)
+            try:
+                self._require_empty(services)
+                runs.append(self._run_steps(services, HoursLedgerService(config, services)))
+            finally:
+                services.db.close()
+
+        results = []
+        for (name, expected), (_, actual) in zip(*runs):
+            ok = expected == actual
+            if not ok:
+                self._logger.log_warning(
+                    "%s: %s differs: %r != %r",
+                    inspect.currentframe().f_code.co_name, name, expected, actual,
+                )
+            results.append((name, ok, expected, actual))
+        return results
+
+    # ---------- Steps ----------
+
+    def _steps(self, services: AppServices, ledger: HoursLedgerService, ids: _Ids):
+        """
+        (name, call, unordered) for every step, in order. Later steps use
+        the ids returned by earlier ones; unordered results are sorted
+        before comparing.
+        """
+        def add_lawyer(*fields):
+            ids.lawyers.append(services.add_lawyer(*fields))
+            return ids.name("lawyer_id", ids.lawyers[-1])
+
+        def add_case(*fields):
+            ids.cases.append(services.add_case(*fields))
+            return ids.name("case_id", ids.cases[-1])
+
+        def record_hours(*entry):
+            # entry_id is generated; only success or the error is compared
+            ledger.record_hours(*entry)
+            return "recorded"
+
+        def roster_map(rosters):
+            return {ids.name("case_id", key): roster for key, roster in rosters.items()}
+
+        def report(name):
+            headers, rows = services.get_billable_hours_report(name)
+            return [dict(zip(headers, row)) for row in rows]
+
+        missing_lawyer = 10 ** 9
+        return [
+            # ---------- Writes ----------
+            ("add_lawyer", lambda: add_lawyer("Jordan", "Miles", "Tax Law", "jm@example.com", "555-0101"), False),
+            ("add_lawyer", lambda: add_lawyer("Sara", "Patel", "Family Law", "sp@example.com"), False),
+            ("add_lawyer", lambda: add_lawyer("Jane", "Jordan", "Corporate Law", "jj@example.com"), False),
+            ("add_lawyer duplicate email", lambda: add_lawyer("Dup", "Email", "Tax Law", "jm@example.com"), False),
+            ("add_case", lambda: add_case("Smith v. Jones", "Smith", "Open", "2024-03-01", None, "Contract dispute"), False),
+            ("add_case", lambda: add_case("Acme Merger", "Acme", "Open", "2024-05-15"), False),
+            ("add_case", lambda: add_case("Estate of Brown", "Brown", "Closed", "2023-01-10", "2023-12-20"), False),
+            ("add_case", lambda: add_case("Rossi Appeal", "Rossi", "Pending", "2024-05-02"), False),
+            ("assign_lawyer_to_case", lambda: services.assign_lawyer_to_case(ids.case(0), ids.lawyer(0), "Lead", 3.5), False),
+            ("assign_lawyer_to_case", lambda: services.assign_lawyer_to_case(ids.case(0), ids.lawyer(1), "Associate", 2), False),
+            ("assign_lawyer_to_case duplicate", lambda: services.assign_lawyer_to_case(ids.case(0), ids.lawyer(1), "Associate", 1), False),
+            ("staff_case", lambda: services.staff_case(ids.case(1), [(ids.lawyer(0), "Lead", 5), (ids.lawyer(2), "Consultant", 1.25)]), False),
+            ("staff_case update", lambda: services.staff_case(ids.case(1), [(ids.lawyer(0), "Partner", 6), (ids.lawyer(1), "Associate", 0.5)]), False),
+            ("staff_case missing lawyer", lambda: services.staff_case(ids.case(2), [(ids.lawyer(0), "Lead", 1), (missing_lawyer, "Lead", 1)]), False),
+            ("staff_case repeated lawyer", lambda: services.staff_case(ids.case(2), [(ids.lawyer(0), "Lead", 1), (ids.lawyer(0), "Lead", 2)]), False),
+            ("record_hours", lambda: record_hours(ids.case(0), ids.lawyer(0), "2.5", "2024-03-02"), False),
+            ("record_hours", lambda: record_hours(ids.case(0), ids.lawyer(1), 1, "2024-03-03", "Research"), False),
+            ("record_hours correction", lambda: record_hours(ids.case(0), ids.lawyer(0), "-0.5", "2024-03-04"), False),
+            ("record_hours_many", lambda: ledger.record_hours_many([
+                (ids.case(1), ids.lawyer(0), 4, "2024-05-16", None),
+                (ids.case(1), ids.lawyer(2), "1.75", "2024-05-16", None),
+                (ids.case(0), ids.lawyer(2), 2, "2024-05-17", None),
+            ]), False),
+            # ---------- Reads ----------
+            ("get_all_lawyers", services.get_all_lawyers, False),
+            ("get_all_cases", services.get_all_cases, False),
+            ("get_case_lawyers", services.get_case_lawyers, True),
+            ("iter_lawyers", lambda: [page for page in services.iter_lawyers(page_size=2)], False),
+            ("iter_cases", lambda: [page for page in services.iter_cases(page_size=3)], False),
+            ("iter_case_lawyers", lambda: [row for page in services.iter_case_lawyers(page_size=2) for row in page], True),
+            ("get_case_with_lawyers", lambda: services.get_case_with_lawyers(ids.case(0)), True),
+            ("get_case_with_lawyers no lawyers", lambda: services.get_case_with_lawyers(ids.case(3)), False),
+            ("get_case_roster", lambda: services.get_case_roster(ids.case(1)), False),
+            ("get_cases_with_lawyers", lambda: roster_map(services.get_cases_with_lawyers(ids.cases, chunk_size=2)), False),
+            ("get_cases_with_lawyers_by_status", lambda: roster_map(services.get_cases_with_lawyers_by_status("Open", chunk_size=1)), False),
+            ("search_lawyers", lambda: services.search_lawyers("jor"), True),
+            ("search_lawyers two words", lambda: services.search_lawyers("jor mil"), True),
+            ("search_cases", lambda: services.search_cases("smith contract"), True),
+            ("typeahead_lawyers", lambda: [label for _, label in services.typeahead_lawyers("jo")], True),
+            ("typeahead_cases", lambda: [label for _, label in services.typeahead_cases("ac")], True),
+            ("report by-lawyer", lambda: report("by-lawyer"), False),
+            ("report by-case", lambda: report("by-case"), False),
+            ("report by-role", lambda: report("by-role"), False),
+            ("report by-status-month", lambda: report("by-status-month"), False),
+            ("report columnar", lambda: services.get_billable_hours_report("by-role", columnar=True)[1], False),
+            ("get_case_lawyer_columns", services.get_case_lawyer_columns, False),
+            ("get_case_hours", lambda: [ledger.get_case_hours(case_id) for case_id in ids.cases], False),
+            ("get_lawyer_hours", lambda: [ledger.get_lawyer_hours(lawyer_id) for lawyer_id in ids.lawyers], False),
+            ("ledger verify", lambda: list(ledger.verify_totals()), False),
+        ]
+
+    def _run_steps(self, services: AppServices, ledger: HoursLedgerService) -> list:
+        """Run every step on one backend; returns [(name, normalized result)]."""
+        ids = _Ids()
+        results = []
+        for name, call, unordered in self._steps(services, ledger, ids):
+            try:
+                value = self._normalize(call(), ids)
+            except ValueError:
+                # Messages may quote generated ids
+                value = "raised ValueError"
+            except Exception:
+                # Driver exception classes differ (mysql.connector vs sqlite3)
+                value = "raised a database error"
+            if unordered and isinstance(value, list):
+                value = sorted(value, key=repr)
+            results.append((name, value))
+        return results
+
+    # ---------- Private helpers ----------
+
+    def _normalize(self, value, ids: _Ids, key=None):
+        """Make a result comparable across backends (see class docstring)."""
+        if hasattr(value, "to_dict"):
+            value = value.to_dict()
+        if isinstance(value, Mapping):
+            return {
+                k: self._normalize(v, ids, k)
+                for k, v in value.items()
+                if k not in ("id", "entry_id")
+            }
+        if isinstance(value, (list, tuple, array)):
+            return [self._normalize(item, ids, key) for item in value]
+        if key in self.ID_KEYS:
+            return ids.name(self.ID_KEYS[key], value)
+        if isinstance(value, (bool, str)) or value is None:
+            return value
+        if isinstance(value, (Decimal, float, int)):
+            # SUM() and friends come back as Decimal, float or int by engine
+            return f"{float(value):.2f}"
+        if isinstance(value, date):
+            return value.isoformat()
+        return value
+
+    def _require_empty(self, services: AppServices):
+        for table in self.TABLES:
+            count = services.fetch_all(f"SELECT COUNT(*) FROM {table};", dictionary=False)[0][0]
+            if count:
+                raise ValueError(
+                    f"{services.db.name} table {table} has {count} rows; "
+                    f"the parity check needs an empty scratch database."
+                )
@@ -0,0 +1,240 @@
+
+"""Implements the BulkImportService class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.service_layer.validation import (
+    parse_assignment,
+    validate_case,
+    validate_lawyer,
+)
+import csv
+import inspect
+import json
+import os
+import time
+
+
+class BulkImportService(ApplicationBase):
+    """
+    Streams lawyers, cases or assignments from a CSV/JSONL file into MySQL.
+
+    Rows are validated with the same rules as the interactive UI and written
+    in batches with executemany, one transaction per batch. Rows that fail
+    validation (or the database) are written to a rejects file instead of
+    aborting the load.
+    """
+
+    DEFAULT_BATCH_SIZE = 1000
+
+    # Input columns expected for each kind of import
+    FIELDS = {
+        "lawyers": ("first_name", "last_name", "specialization", "email", "phone"),
+        "cases": (
+            "case_name",
+            "client_name",
+            "case_status",
+            "start_date",
+            "end_date",
+            "description",
+        ),
+        "assignments": ("case_id", "lawyer_id", "role", "billable_hours"),
+    }
+
+    def __init__(self, config: dict, services) -> None:
+        """
+        Initialize the importer.
+
+        :param config: application config dict
+        :param services: AppServices instance used to write batches
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.DB = services
+        self.batch_size = config.get("bulk_import", {}).get(
+            "batch_size", self.DEFAULT_BATCH_SIZE
+        )
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Public API ----------
+
+    def import_file(self, kind: str, path: str, rejects_path=None, batch_size=None):
+        """
+        Load every row of path into the table for kind.
+
+        :param kind: 'lawyers', 'cases' or 'assignments'
+        :param path: .csv (with header row) or .jsonl input file
+        :param rejects_path: where rejected rows go, default <path>.rejects.jsonl
+        :param batch_size: rows per transaction, defaults to self.batch_size
+        :return: dict with read/loaded/rejected counts, seconds and rows_per_sec
+        """
+        if kind not in self.FIELDS:
+            raise ValueError(
+                f"Unknown import kind '{kind}'. "
+                f"Expected one of: {', '.join(self.FIELDS)}."
+            )
+
+        batch_size = batch_size or self.batch_size
+        rejects_path = rejects_path or f"{path}.rejects.jsonl"
+        query = self._insert_query(kind)
+
+        stats = {"read": 0, "loaded": 0, "rejected": 0}
+        started = time.perf_counter()
+
+        with open(rejects_path, "w") as rejects:
+            batch = []
+            for line_no, row in self._read_rows(path):
+                stats["read"] += 1
+                try:
+                    batch.append((line_no, row, self._convert_row(kind, row)))
+                except ValueError as e:
+                    self._reject(rejects, line_no, row, str(e), stats)
+                    continue
+
+                if len(batch) >= batch_size:
+                    self._write_batch(query, batch, rejects, stats)
+                    batch = []
+
+            if batch:
+                self._write_batch(query, batch, rejects, stats)
+
+        stats["seconds"] = time.perf_counter() - started
+        stats["rows_per_sec"] = (
+            stats["loaded"] / stats["seconds"] if stats["seconds"] else 0.0
+        )
+        stats["rejects_path"] = rejects_path
+
+        self._logger.log_info(
+            "%s: Imported %d %s from %s (%d rejected) in %.2fs, %.0f rows/sec",
+            inspect.currentframe().f_code.co_name, stats["loaded"], kind, path,
+            stats["rejected"], stats["seconds"], stats["rows_per_sec"],
+        )
+
+        # Don't leave an empty side file behind on a clean load
+        if not stats["rejected"]:
+            os.remove(rejects_path)
+            stats["rejects_path"] = None
+
+        return stats
+
+    # ---------- Private helpers ----------
+
+    def _insert_query(self, kind: str) -> str:
+        """Return the AppServices INSERT statement for kind."""
+        if kind == "lawyers":
+            return self.DB.INSERT_LAWYER_SQL
+        if kind == "cases":
+            return self.DB.INSERT_CASE_SQL
+        return self.DB.INSERT_CASE_LAWYER_SQL
+
+    def _read_rows(self, path: str):
+        """Yield (line_no, row dict) from a CSV or JSONL file, one at a time."""
+        if path.endswith(".jsonl") or path.endswith(".json"):
+            with open(path, "r") as f:
+                for line_no, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield line_no, {"_raw": line.rstrip("\n"), "_error": str(e)}
+                        continue
+                    if not isinstance(record, dict):
+                        record = {
+                            "_raw": line.rstrip("\n"),
+                            "_error": f"expected a JSON object, got {type(record).__name__}",
+                        }
+                    yield line_no, record
+        else:
+            with open(path, "r", newline="") as f:
+                # Line 1 is the header row
+                for line_no, row in enumerate(csv.DictReader(f), start=2):
+                    yield line_no, row
+
+    def _convert_row(self, kind: str, row: dict) -> tuple:
+        """Validate a raw row and return the INSERT parameter tuple."""
+        if "_error" in row:
+            raise ValueError(f"Malformed JSON: {row['_error']}")
+
+        values = {}
+        for field in self.FIELDS[kind]:
+            value = row.get(field)
+            if isinstance(value, str):
+                value = value.strip()
+            # Empty optional columns become NULL, as in the UI
+            values[field] = value if value != "" else None
+
+        if kind == "lawyers":
+            validate_lawyer(values["first_name"], values["last_name"], values["email"])
+            return (
+                values["first_name"],
+                values["last_name"],
+                values["specialization"] or "",
+                values["email"],
+                values["phone"],
+            )
+
+        if kind == "cases":
+            validate_case(
+                values["case_name"],
+                values["client_name"],
+                values["case_status"],
+                values["start_date"],
+            )
+            return tuple(values[field] for field in self.FIELDS["cases"])
+
+        return parse_assignment(
+            values["case_id"],
+            values["lawyer_id"],
+            values["role"],
+            values["billable_hours"],
+        )
+
+    def _write_batch(self, query: str, batch: list, rejects, stats: dict):
+        """
+        Write one batch in a single transaction.
+
+        If the batch fails (e.g. a duplicate email or an unknown case_id),
+        it is retried row by row so only the offending rows are rejected.
+        """
+        try:
+            self._write_batch_rows(query, batch, rejects, stats)
+        finally:
+            if query == self.DB.INSERT_CASE_LAWYER_SQL:
+                # New assignments change those cases' cached rosters
+                self.DB.invalidate_case_rosters(
+                    *{params[0] for _, _, params in batch}
+                )
+
+    def _write_batch_rows(self, query: str, batch: list, rejects, stats: dict):
+        """Try the batch as one executemany, then fall back to single rows."""
+        try:
+            self.DB.execute_many(query, [params for _, _, params in batch])
+            stats["loaded"] += len(batch)
+            return
+        except Exception as e:
+            self._logger.log_warning(
+                "%s: Batch of %d failed (%s); retrying row by row.",
+                inspect.currentframe().f_code.co_name, len(batch), e,
+            )
+
+        for line_no, row, params in batch:
+            try:
+                self.DB.execute(query, params)
+                stats["loaded"] += 1
+            except Exception as e:
+                self._reject(rejects, line_no, row, str(e), stats)
+
+    def _reject(self, rejects, line_no: int, row: dict, reason: str, stats: dict):
+        """Record a rejected row in the side file."""
+        stats["rejected"] += 1
+        rejects.write(
+            json.dumps({"line": line_no, "reason": reason, "row": row}, default=str)
+            + "\n"
+        )
@@ -0,0 +1,199 @@
+"""Implements the CaseArchiveService class."""
+
+from legal_case_app.application_base import ApplicationBase
+from datetime import date
+import inspect
+import time
+
+
+class CaseArchiveService(ApplicationBase):
+    """
+    Moves closed cases and their assignments to the archive tables
+    (migration 007).
+
+    A case is archived once its end_date is more than older_than_years
+    ago. Candidates are found by walking legal_case in case_id order
+    with plain (non-locking) reads; each batch of batch_size cases is
+    then moved in its own short transaction that locks only those rows:
+    copy the case and case_lawyer_xref rows to the archive, delete them
+    from the hot tables. Every batch commits on its own, so an
+    interrupted run loses nothing and the next run carries on with the
+    cases that are still in the hot tables.
+
+    Cases with billable hours ledger entries (migration 004) stay in the
+    hot tables: time_entry and case_hours_total reference them.
+    """
+
+    DEFAULT_OLDER_THAN_YEARS = 7
+    DEFAULT_BATCH_SIZE = 500
+
+    # Closed cases after case_id %s (params: last case_id, cutoff, limit)
+    CANDIDATES_SQL = """
+        SELECT lc.case_id
+        FROM legal_case lc
+        WHERE lc.case_id > %s
+          AND lc.end_date < %s
+          AND NOT EXISTS (SELECT 1 FROM time_entry te WHERE te.case_id = lc.case_id)
+          AND NOT EXISTS (SELECT 1 FROM case_hours_total ct WHERE ct.case_id = lc.case_id)
+        ORDER BY lc.case_id
+        LIMIT %s;
+        """
+    # {ids} is a list of %s. The conditions are checked again under the
+    # row locks, in case a case was reopened or got hours since it was picked.
+    LOCK_CASES_SQL = """
+        SELECT lc.case_id
+        FROM legal_case lc
+        WHERE lc.case_id IN ({ids})
+          AND lc.end_date < %s
+          AND NOT EXISTS (SELECT 1 FROM time_entry te WHERE te.case_id = lc.case_id)
+          AND NOT EXISTS (SELECT 1 FROM case_hours_total ct WHERE ct.case_id = lc.case_id)
+        ORDER BY lc.case_id
+        FOR UPDATE;
+        """
+    ARCHIVE_CASES_SQL = """
+        INSERT INTO legal_case_archive
+            (case_id, case_name, client_name, case_status, start_date, end_date,
+             description, updated_at)
+        SELECT case_id, case_name, client_name, case_status, start_date, end_date,
+               description, updated_at
+        FROM legal_case
+        WHERE case_id IN ({ids});
+        """
+    ARCHIVE_ASSIGNMENTS_SQL = """
+        INSERT INTO case_lawyer_xref_archive
+            (id, case_id, lawyer_id, role, billable_hours, updated_at)
+        SELECT id, case_id, lawyer_id, role, billable_hours, updated_at
+        FROM case_lawyer_xref
+        WHERE case_id IN ({ids});
+        """
+    DELETE_ASSIGNMENTS_SQL = "DELETE FROM case_lawyer_xref WHERE case_id IN ({ids});"
+    DELETE_CASES_SQL = "DELETE FROM legal_case WHERE case_id IN ({ids});"
+
+    def __init__(self, config: dict, services) -> None:
+        """
+        Initialize the archival job.
+
+        :param config: application config dict ("archive" section)
+        :param services: AppServices instance used for queries and transactions
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.DB = services
+        archive_config = config.get("archive", {})
+        self.older_than_years = archive_config.get(
+            "older_than_years", self.DEFAULT_OLDER_THAN_YEARS
+        )
+        self.batch_size = archive_config.get("batch_size", self.DEFAULT_BATCH_SIZE)
+        # Pause between batches so replicas and other writers keep up
+        self.pause_seconds = archive_config.get("pause_seconds", 0.1)
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Public API ----------
+
+    def archive(self, older_than_years=None, batch_size=None, max_batches=None,
+                progress=None) -> dict:
+        """
+        Move every case closed before the cutoff to the archive tables.
+
+        :param older_than_years: archive cases closed more than this many
+                                 years ago, default archive.older_than_years
+        :param batch_size: cases per transaction, default archive.batch_size
+        :param max_batches: stop after this many batches (run again to continue)
+        :param progress: optional callable, given a dict after every batch
+        :return: {"cutoff", "cases", "assignments", "batches", "finished", "seconds"}
+        """
+        older_than_years = self.older_than_years if older_than_years is None else older_than_years
+        batch_size = batch_size or self.batch_size
+        if older_than_years < 0:
+            raise ValueError("older_than_years must not be negative.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        started = time.perf_counter()
+        cutoff = self.cutoff_date(older_than_years).isoformat()
+        result = {"cutoff": cutoff, "cases": 0, "assignments": 0,
+                  "batches": 0, "finished": False}
+        last_case_id = 0
+        while max_batches is None or result["batches"] < max_batches:
+            candidates = [
+                row[0] for row in self.DB.fetch_all(
+                    self.CANDIDATES_SQL, (last_case_id, cutoff, batch_size), dictionary=False
+                )
+            ]
+            if not candidates:
+                result["finished"] = True
+                break
+            last_case_id = candidates[-1]
+
+            cases, assignments = self._move(candidates, cutoff)
+            result["cases"] += cases
+            result["assignments"] += assignments
+            result["batches"] += 1
+            result["seconds"] = time.perf_counter() - started
+            if progress is not None:
+                progress(dict(result, last_case_id=last_case_id))
+            if len(candidates) < batch_size:
+                result["finished"] = True
+                break
+            if self.pause_seconds:
+                time.sleep(self.pause_seconds)
+
+        if result["cases"]:
+            # Archived cases must no longer come up in typeahead
+            self.DB.invalidate_prefix_index("legal_case")
+        result["seconds"] = time.perf_counter() - started
+        self._logger.log_info(
+            "%s: archived %d cases closed before %s (%d assignments) in %d batches, %.2fs%s",
+            inspect.currentframe().f_code.co_name, result["cases"], result["cutoff"],
+            result["assignments"], result["batches"], result["seconds"],
+            "" if result["finished"] else ", more left",
+        )
+        return result
+
+    @staticmethod
+    def cutoff_date(older_than_years: int, today=None) -> date:
+        """The end_date before which cases are archived (Feb 29 becomes Feb 28)."""
+        today = today or date.today()
+        try:
+            return today.replace(year=today.year - older_than_years)
+        except ValueError:
+            return today.replace(year=today.year - older_than_years, day=28)
+
+    # ---------- Private helpers ----------
+
+    def _move(self, candidates: list, cutoff: str) -> tuple:
+        """Move one batch of cases in one transaction; returns (cases, assignments)."""
+        with self.DB.transaction():
+            query = self.LOCK_CASES_SQL.format(ids=self._placeholders(candidates))
+            case_ids = [
+                row[0] for row in
+                self.DB.fetch_all(query, (*candidates, cutoff), dictionary=False)
+            ]
+            if not case_ids:
+                return 0, 0
+            ids, params = self._placeholders(case_ids), tuple(case_ids)
+            self.DB.execute(self.ARCHIVE_CASES_SQL.format(ids=ids), params)
+            self.DB.execute(self.ARCHIVE_ASSIGNMENTS_SQL.format(ids=ids), params)
+            assignments = self.DB.execute(
+                self.DELETE_ASSIGNMENTS_SQL.format(ids=ids), params, rowcount=True
+            )
+            self.DB.execute(self.DELETE_CASES_SQL.format(ids=ids), params)
+            self.DB.invalidate_case_rosters(*case_ids)
+
+        self._logger.log_debug(
+            "%s: archived cases %d..%d (%d cases, %d assignments)",
+            inspect.currentframe().f_code.co_name, case_ids[0], case_ids[-1],
+            len(case_ids), assignments,
+        )
+        return len(case_ids), assignments
+
+    @staticmethod
+    def _placeholders(ids: list) -> str:
+        return ", ".join(["%s"] * len(ids))
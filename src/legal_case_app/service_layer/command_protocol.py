@@ -0,0 +1,93 @@
+"""
+Implements the CommandClient class and the message framing it shares with
+CommandServer.
+
+Only standard library imports here: the --socket client path of main.py
+imports this module and nothing from the service layer.
+"""
+
+import json
+import socket
+import struct
+
+
+# Every message is a 4-byte big-endian length followed by that many bytes
+# of UTF-8 JSON.
+_HEADER = struct.Struct("!I")
+
+
+def send_message(sock, message: dict, default=None) -> None:
+    """
+    Send one length-prefixed JSON message.
+
+    :param default: json.dumps default for values JSON cannot encode
+    """
+    payload = json.dumps(message, default=default).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock, max_bytes: int = None):
+    """
+    Receive one length-prefixed JSON message.
+
+    Returns None if the peer closed the connection before a new message.
+    Raises ValueError if the message is larger than max_bytes.
+    """
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if max_bytes is not None and length > max_bytes:
+        raise ValueError(f"Message of {length} bytes exceeds the {max_bytes} byte limit.")
+    payload = _recv_exactly(sock, length)
+    if payload is None:
+        raise ConnectionError("Connection closed in the middle of a message.")
+    return json.loads(payload.decode("utf-8"))
+
+
+def _recv_exactly(sock, size: int):
+    """Read exactly size bytes, or None on a clean EOF before the first byte."""
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ConnectionError("Connection closed in the middle of a message.")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+class CommandClient():
+    """Sends batch commands to a running CommandServer over its socket."""
+
+    def __init__(self, socket_path: str, timeout_seconds: float = 30.0) -> None:
+        """
+        Connect to the server.
+
+        :param socket_path: the server's Unix socket
+        :param timeout_seconds: per-request timeout
+        """
+        self.socket_path = socket_path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout_seconds)
+        self._sock.connect(socket_path)
+
+    def request(self, message: dict) -> dict:
+        """Send one request and return the server's reply."""
+        send_message(self._sock, message)
+        reply = recv_message(self._sock)
+        if reply is None:
+            raise ConnectionError(f"Server on {self.socket_path} closed the connection.")
+        return reply
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,176 @@
+"""Implements the CommandRunner class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.service_layer.validation import (
+    parse_assignment,
+    validate_case,
+    validate_lawyer,
+)
+import inspect
+
+
+class CommandRunner(ApplicationBase):
+    """
+    Runs the non-interactive batch commands against AppServices.
+
+    Each command returns (headers, rows), where rows is an iterable of
+    dicts keyed by headers, so main.py can write any result as JSON or CSV.
+    List commands stream keyset pages instead of loading whole tables.
+    Input is validated with the same rules as the interactive menu; a
+    broken rule raises ValueError.
+    """
+
+    # Command name -> method name, shared with main.py's argument parser
+    COMMANDS = {
+        "list-lawyers": "list_lawyers",
+        "list-cases": "list_cases",
+        "view-case": "view_case",
+        "search-lawyers": "search_lawyers",
+        "search-cases": "search_cases",
+        "add-lawyer": "add_lawyer",
+        "add-case": "add_case",
+        "assign": "assign",
+    }
+
+    def __init__(self, config: dict, services) -> None:
+        """
+        Initialize the runner.
+
+        :param config: application config dict
+        :param services: AppServices instance the commands call
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.DB = services
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Public API ----------
+
+    def run(self, command: str, args: dict):
+        """
+        Run one command.
+
+        :param command: a key of COMMANDS
+        :param args: the command's parsed arguments
+        :return: (headers, rows)
+        """
+        if command not in self.COMMANDS:
+            raise ValueError(
+                f"Unknown command '{command}'. "
+                f"Expected one of: {', '.join(self.COMMANDS)}."
+            )
+        return getattr(self, self.COMMANDS[command])(args)
+
+    def run_script(self, commands):
+        """
+        Run many commands in one transaction on one pooled connection.
+
+        Results are yielded as they are produced, so callers must consume
+        the generator to the end for the transaction to commit. The first
+        error rolls back every command of the script and is re-raised
+        (validation errors as ValueError naming the script line).
+
+        :param commands: iterable of (line_number, command, args)
+        :return: generator of (line_number, command, headers, rows)
+        """
+        with self.DB.transaction():
+            for line_number, command, args in commands:
+                try:
+                    headers, rows = self.run(command, args)
+                    # Materialize here so list commands read inside the transaction
+                    rows = list(rows)
+                except ValueError as e:
+                    raise ValueError(f"line {line_number} ({command}): {e}") from e
+                except Exception as e:
+                    self._logger.log_error(
+                        f"{inspect.currentframe().f_code.co_name}: "
+                        f"line {line_number} ({command}) failed: {e}"
+                    )
+                    raise
+                yield line_number, command, headers, rows
+
+    # ---------- Commands ----------
+
+    def list_lawyers(self, args: dict):
+        """Every lawyer, streamed a page at a time."""
+        return self.DB.LAWYER_COLUMNS, self._stream(self.DB.iter_lawyers())
+
+    def list_cases(self, args: dict):
+        """Every case, streamed a page at a time."""
+        cases = self.DB.iter_cases(include_archive=bool(args.get("include_archive")))
+        return self.DB.CASE_COLUMNS, self._stream(cases)
+
+    def view_case(self, args: dict):
+        """One case joined with its assigned lawyers (one row per lawyer)."""
+        rows = self.DB.get_case_with_lawyers(
+            int(args["case_id"]), bool(args.get("include_archive"))
+        )
+        if not rows:
+            raise ValueError(f"No case found with case_id = {args['case_id']}.")
+        return self.DB.ROSTER_CASE_KEYS + self.DB.ROSTER_LAWYER_KEYS, rows
+
+    def search_lawyers(self, args: dict):
+        """One page of ranked full-text lawyer matches."""
+        lawyers = self.DB.search_lawyers(
+            args["query"], args.get("page") or 1, args.get("page_size")
+        )
+        return self.DB.LAWYER_COLUMNS, [lawyer.to_dict() for lawyer in lawyers]
+
+    def search_cases(self, args: dict):
+        """One page of ranked full-text case matches."""
+        cases = self.DB.search_cases(
+            args["query"], args.get("page") or 1, args.get("page_size")
+        )
+        return self.DB.CASE_COLUMNS, [case.to_dict() for case in cases]
+
+    def add_lawyer(self, args: dict):
+        """Insert a lawyer; returns the new lawyer_id."""
+        validate_lawyer(args["first_name"], args["last_name"], args["email"])
+        lawyer_id = self.DB.add_lawyer(
+            args["first_name"],
+            args["last_name"],
+            args["specialization"],
+            args["email"],
+            args.get("phone"),
+        )
+        return ("lawyer_id",), [{"lawyer_id": lawyer_id}]
+
+    def add_case(self, args: dict):
+        """Insert a case; returns the new case_id."""
+        validate_case(
+            args["case_name"], args["client_name"], args["case_status"], args["start_date"]
+        )
+        case_id = self.DB.add_case(
+            args["case_name"],
+            args["client_name"],
+            args["case_status"],
+            args["start_date"],
+            args.get("end_date"),
+            args.get("description"),
+        )
+        return ("case_id",), [{"case_id": case_id}]
+
+    def assign(self, args: dict):
+        """Assign a lawyer to a case with a role and billable hours."""
+        case_id, lawyer_id, role, billable_hours = parse_assignment(
+            args["case_id"], args["lawyer_id"], args["role"], args["billable_hours"]
+        )
+        self.DB.assign_lawyer_to_case(case_id, lawyer_id, role, billable_hours)
+        headers = ("case_id", "lawyer_id", "role", "billable_hours")
+        return headers, [dict(zip(headers, (case_id, lawyer_id, role, billable_hours)))]
+
+    # ---------- Private helpers ----------
+
+    @staticmethod
+    def _stream(pages):
+        """Flatten an iterator of pages of models into an iterator of dicts."""
+        for page in pages:
+            for model in page:
+                yield model.to_dict()
@@ -0,0 +1,200 @@
+"""Implements the CommandServer class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.persistence_layer.row_formats import json_default
+from legal_case_app.service_layer.command_protocol import recv_message, send_message
+from legal_case_app.service_layer.command_runner import CommandRunner
+from concurrent.futures import ThreadPoolExecutor
+import inspect
+import os
+import socket
+import threading
+
+
+class CommandServer(ApplicationBase):
+    """
+    Serves the batch commands over a Unix domain socket.
+
+    One long-running process keeps the connection pool and roster cache
+    warm for every client. Each client connection is handled by a worker
+    thread and may send any number of requests:
+
+        {"command": "view-case", "args": {"case_id": 42}}
+        {"script": [{"line": 1, "command": "add-lawyer", "args": {...}}, ...]}
+        {"command": "ping"}
+
+    Replies are {"ok": true, "headers": [...], "rows": [...]} (a script
+    gets {"ok": true, "results": [...]}), or {"ok": false, "error": "..."}.
+    """
+
+    DEFAULT_SOCKET_PATH = "/tmp/legal_case_app.sock"
+    DEFAULT_MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+    DEFAULT_IDLE_TIMEOUT_SECONDS = 300
+
+    def __init__(self, config: dict, services, socket_path=None, workers=None) -> None:
+        """
+        Initialize the server (call serve_forever() to start listening).
+
+        :param config: application config dict
+        :param services: AppServices instance shared by every client
+        :param socket_path: overrides server.socket_path from config
+        :param workers: overrides server.workers (default: pool size)
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        server_config = config.get("server", {})
+        self.DB = services
+        self.runner = CommandRunner(config, services)
+        self.socket_path = socket_path or server_config.get(
+            "socket_path", self.DEFAULT_SOCKET_PATH
+        )
+        # More workers than pooled connections would only wait on the pool
+        self.workers = workers or server_config.get(
+            "workers", config["database"]["pool"]["size"]
+        )
+        self.max_message_bytes = server_config.get(
+            "max_message_bytes", self.DEFAULT_MAX_MESSAGE_BYTES
+        )
+        self.idle_timeout_seconds = server_config.get(
+            "idle_timeout_seconds", self.DEFAULT_IDLE_TIMEOUT_SECONDS
+        )
+        self._listener = None
+        self._stopping = threading.Event()
+        self._clients = set()
+        self._clients_lock = threading.Lock()
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Public API ----------
+
+    def serve_forever(self) -> None:
+        """Listen on the socket until shutdown() or KeyboardInterrupt."""
+        self._remove_stale_socket()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Owner-only: the socket gives full read/write access to the data
+        old_umask = os.umask(0o177)
+        try:
+            listener.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        listener.listen(self.workers * 4)
+        # Wake up regularly so shutdown() from another thread is noticed
+        listener.settimeout(0.5)
+        self._listener = listener
+        self._stopping.clear()
+
+        self._logger.log_info(
+            f"{inspect.currentframe().f_code.co_name}: listening on "
+            f"{self.socket_path} with {self.workers} workers"
+        )
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="command-server"
+        )
+        try:
+            while not self._stopping.is_set():
+                try:
+                    connection, _ = listener.accept()
+                except socket.timeout:
+                    continue
+                connection.settimeout(self.idle_timeout_seconds)
+                executor.submit(self._handle_connection, connection)
+        finally:
+            self._stopping.set()
+            self._disconnect_clients()
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._close_listener()
+
+    def shutdown(self) -> None:
+        """Stop accepting clients; serve_forever() returns once workers finish."""
+        self._stopping.set()
+
+    def handle_request(self, request: dict) -> dict:
+        """Run one decoded request and return the reply message."""
+        try:
+            if request.get("command") == "ping":
+                return {"ok": True, "headers": [], "rows": []}
+            if "script" in request:
+                commands = (
+                    (item.get("line", n), item["command"], item.get("args", {}))
+                    for n, item in enumerate(request["script"], start=1)
+                )
+                results = [
+                    {"line": line, "command": command, "headers": list(headers), "rows": rows}
+                    for line, command, headers, rows in self.runner.run_script(commands)
+                ]
+                return {"ok": True, "results": results}
+
+            headers, rows = self.runner.run(request.get("command"), request.get("args", {}))
+            return {"ok": True, "headers": list(headers), "rows": list(rows)}
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            self._logger.log_error(
+                f"{inspect.currentframe().f_code.co_name}: {request.get('command')}: {e}"
+            )
+            return {"ok": False, "error": f"Database error: {e}"}
+
+    # ---------- Private helpers ----------
+
+    def _handle_connection(self, connection) -> None:
+        """Answer requests from one client until it disconnects."""
+        with self._clients_lock:
+            self._clients.add(connection)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    request = recv_message(connection, self.max_message_bytes)
+                except ValueError as e:
+                    send_message(connection, {"ok": False, "error": str(e)}, default=json_default)
+                    return
+                if request is None:
+                    return
+                send_message(connection, self.handle_request(request), default=json_default)
+        except (OSError, ConnectionError) as e:
+            self._logger.log_warning(
+                f"{inspect.currentframe().f_code.co_name}: client dropped: {e}"
+            )
+        finally:
+            with self._clients_lock:
+                self._clients.discard(connection)
+            connection.close()
+
+    def _disconnect_clients(self) -> None:
+        """Unblock workers waiting on idle clients so shutdown is prompt."""
+        with self._clients_lock:
+            clients = list(self._clients)
+        for connection in clients:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _remove_stale_socket(self) -> None:
+        """Delete a socket file left by a dead server; refuse if one is live."""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"A server is already listening on {self.socket_path}.")
+
+    def _close_listener(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        listener.close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
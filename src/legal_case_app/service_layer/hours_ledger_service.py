@@ -0,0 +1,245 @@
+"""Implements the HoursLedgerService class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.service_layer.validation import parse_hours, validate_note
+import inspect
+
+
+class HoursLedgerService(ApplicationBase):
+    """
+    Append-only billable hours ledger (time_entry, migration 004).
+
+    Every entry also adds its hours to case_hours_total and
+    lawyer_hours_total in the same transaction, so a total is one primary
+    key lookup however many entries it covers. verify_totals recomputes the
+    totals from the entries, one id range at a time, and can correct drift.
+    """
+
+    DEFAULT_VERIFY_CHUNK_SIZE = 10000
+
+    # scope -> (id column, totals table, parent table)
+    SCOPES = {
+        "case": ("case_id", "case_hours_total", "legal_case"),
+        "lawyer": ("lawyer_id", "lawyer_hours_total", "lawyer"),
+    }
+
+    # Locks the assignment so it cannot be removed while hours go in
+    ASSIGNED_SQL = """
+        SELECT 1
+        FROM case_lawyer_xref
+        WHERE case_id = %s AND lawyer_id = %s
+        FOR UPDATE;
+        """
+    INSERT_ENTRY_SQL = """
+        INSERT INTO time_entry (case_id, lawyer_id, hours, work_date, note)
+        VALUES (%s, %s, %s, COALESCE(%s, CURDATE()), %s);
+        """
+    # Add (hours, entries) to one totals row, creating it on first use
+    ADD_TO_TOTALS_SQL = """
+        INSERT INTO {totals} ({key}, total_hours, entry_count)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            total_hours = total_hours + VALUES(total_hours),
+            entry_count = entry_count + VALUES(entry_count);
+        """
+    SELECT_TOTALS_SQL = """
+        SELECT total_hours, entry_count
+        FROM {totals}
+        WHERE {key} = %s;
+        """
+    # Totals that disagree with their entries for ids in (%s, %s]:
+    # (id, stored hours, stored count, actual hours, actual count)
+    DRIFT_SQL = """
+        SELECT e.{key}, COALESCE(t.total_hours, 0), COALESCE(t.entry_count, 0),
+               e.actual_hours, e.actual_count
+        FROM (
+            SELECT {key}, SUM(hours) AS actual_hours, COUNT(*) AS actual_count
+            FROM time_entry
+            WHERE {key} > %s AND {key} <= %s
+            GROUP BY {key}
+        ) AS e
+        LEFT JOIN {totals} AS t ON t.{key} = e.{key}
+        WHERE t.{key} IS NULL
+           OR t.total_hours <> e.actual_hours
+           OR t.entry_count <> e.actual_count
+        UNION ALL
+        SELECT t.{key}, t.total_hours, t.entry_count, 0, 0
+        FROM {totals} AS t
+        WHERE t.{key} > %s AND t.{key} <= %s
+          AND (t.total_hours <> 0 OR t.entry_count <> 0)
+          AND NOT EXISTS (SELECT 1 FROM time_entry AS x WHERE x.{key} = t.{key});
+        """
+
+    def __init__(self, config: dict, services) -> None:
+        """
+        Initialize the ledger.
+
+        :param config: application config dict
+        :param services: AppServices instance used for queries and transactions
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.DB = services
+        self.verify_chunk_size = config.get("hours_ledger", {}).get(
+            "verify_chunk_size", self.DEFAULT_VERIFY_CHUNK_SIZE
+        )
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Recording hours ----------
+
+    def record_hours(self, case_id: int, lawyer_id: int, hours, work_date=None,
+                     note=None) -> int:
+        """
+        Append one time entry and add it to the case and lawyer totals.
+
+        :param hours: hours worked; negative hours correct an earlier entry
+        :param work_date: 'YYYY-MM-DD', defaults to today
+        :param note: optional free text
+        :return: the new entry_id
+        :raises ValueError: if the lawyer is not assigned to the case
+        """
+        hours = parse_hours(hours)
+        validate_note(note)
+        with self.DB.transaction():
+            self._check_assigned(case_id, lawyer_id)
+            entry_id = self.DB.execute(
+                self.INSERT_ENTRY_SQL, (case_id, lawyer_id, hours, work_date, note)
+            )
+            # Always case before lawyer, so concurrent entries lock in one order
+            self.DB.execute(self._add_to_totals_sql("case"), (case_id, hours, 1))
+            self.DB.execute(self._add_to_totals_sql("lawyer"), (lawyer_id, hours, 1))
+        return entry_id
+
+    def record_hours_many(self, entries) -> int:
+        """
+        Append many time entries in one transaction.
+
+        Totals get one upsert per distinct case and lawyer, not one per entry.
+
+        :param entries: iterable of (case_id, lawyer_id, hours, work_date, note)
+        :return: number of entries written
+        :raises ValueError: if any lawyer is not assigned to its case (nothing
+                            is written)
+        """
+        rows = []
+        deltas = {"case": {}, "lawyer": {}}
+        for case_id, lawyer_id, hours, work_date, note in entries:
+            hours = parse_hours(hours)
+            validate_note(note)
+            rows.append((case_id, lawyer_id, hours, work_date, note))
+            for scope, item_id in (("case", case_id), ("lawyer", lawyer_id)):
+                total, count = deltas[scope].get(item_id, (0, 0))
+                deltas[scope][item_id] = (total + hours, count + 1)
+        if not rows:
+            return 0
+
+        with self.DB.transaction():
+            for case_id, lawyer_id in sorted({(row[0], row[1]) for row in rows}):
+                self._check_assigned(case_id, lawyer_id)
+            self.DB.execute_many(self.INSERT_ENTRY_SQL, rows)
+            for scope in ("case", "lawyer"):
+                self.DB.execute_many(
+                    self._add_to_totals_sql(scope),
+                    [(item_id, *delta) for item_id, delta in sorted(deltas[scope].items())],
+                )
+
+        self._logger.log_debug(
+            "%s: recorded %d time entries",
+            inspect.currentframe().f_code.co_name, len(rows),
+        )
+        return len(rows)
+
+    # ---------- Totals ----------
+
+    def get_case_hours(self, case_id: int) -> dict:
+        """Return {"total_hours", "entry_count"} for one case."""
+        return self._get_totals("case", case_id)
+
+    def get_lawyer_hours(self, lawyer_id: int) -> dict:
+        """Return {"total_hours", "entry_count"} for one lawyer."""
+        return self._get_totals("lawyer", lawyer_id)
+
+    def verify_totals(self, fix: bool = False, chunk_size=None):
+        """
+        Recompute every total from time_entry and yield the ones that drifted.
+
+        Ids are checked in ranges of chunk_size, each with one query that
+        sums the entries in MySQL and returns only mismatches, so memory
+        does not grow with the ledger. With fix=True each mismatch is
+        corrected in the same transaction by adding the difference (not
+        overwriting), which keeps hours recorded concurrently.
+
+        :param fix: correct the totals that drifted
+        :param chunk_size: ids per range, defaults to verify_chunk_size
+        :return: iterator of dicts (scope, id, stored_hours, actual_hours,
+                 stored_entries, actual_entries)
+        """
+        chunk_size = chunk_size or self.verify_chunk_size
+        for scope, (key, totals, parent) in self.SCOPES.items():
+            max_id = self.DB.fetch_all(
+                f"SELECT MAX({key}) FROM {parent};", dictionary=False
+            )[0][0] or 0
+            drift_sql = self.DRIFT_SQL.format(key=key, totals=totals)
+
+            for low in range(0, max_id, chunk_size):
+                high = low + chunk_size
+                with self.DB.transaction():
+                    drifted = [
+                        row
+                        for batch in self.DB.stream_rows(drift_sql, (low, high, low, high))
+                        for row in batch
+                    ]
+                    if fix and drifted:
+                        self.DB.execute_many(
+                            self._add_to_totals_sql(scope),
+                            [
+                                (item_id, actual_hours - stored_hours,
+                                 actual_count - stored_count)
+                                for item_id, stored_hours, stored_count,
+                                actual_hours, actual_count in drifted
+                            ],
+                        )
+
+                for item_id, stored_hours, stored_count, actual_hours, actual_count in drifted:
+                    self._logger.log_warning(
+                        "%s: %s %s total drifted: stored %s h / %s entries, "
+                        "ledger %s h / %s entries%s",
+                        inspect.currentframe().f_code.co_name, scope, item_id,
+                        stored_hours, stored_count, actual_hours, actual_count,
+                        " (fixed)" if fix else "",
+                    )
+                    yield {
+                        "scope": scope,
+                        "id": item_id,
+                        "stored_hours": stored_hours,
+                        "actual_hours": actual_hours,
+                        "stored_entries": stored_count,
+                        "actual_entries": actual_count,
+                    }
+
+    # ---------- Private helpers ----------
+
+    def _check_assigned(self, case_id: int, lawyer_id: int) -> None:
+        """Caller holds a transaction."""
+        if not self.DB.fetch_all(self.ASSIGNED_SQL, (case_id, lawyer_id), dictionary=False):
+            raise ValueError(f"Lawyer {lawyer_id} is not assigned to case {case_id}.")
+
+    def _add_to_totals_sql(self, scope: str) -> str:
+        key, totals, _ = self.SCOPES[scope]
+        return self.ADD_TO_TOTALS_SQL.format(key=key, totals=totals)
+
+    def _get_totals(self, scope: str, item_id: int) -> dict:
+        key, totals, _ = self.SCOPES[scope]
+        rows = self.DB.fetch_all(
+            self.SELECT_TOTALS_SQL.format(key=key, totals=totals), (item_id,)
+        )
+        if not rows:
+            return {"total_hours": 0, "entry_count": 0}
+        return {"total_hours": rows[0]["total_hours"], "entry_count": rows[0]["entry_count"]}
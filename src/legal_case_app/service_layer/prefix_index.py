@@ -0,0 +1,97 @@
+"""Implements the PrefixIndex class."""
+
+from array import array
+import bisect
+import re
+import threading
+
+
+class PrefixIndex():
+    """
+    In-memory word-prefix index for typeahead suggestions.
+
+    Every word of every label is kept in one sorted list next to a parallel
+    array of ids, so a prefix lookup is a binary search plus a short scan.
+    That holds millions of words in far less memory than a node-per-letter
+    trie while answering the same prefix queries.
+    """
+
+    _WORD = re.compile(r"\w+")
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._words = []
+        self._ids = array("q")
+        self._labels = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    # ---------- Public API ----------
+
+    @classmethod
+    def from_items(cls, items):
+        """
+        Build an index from (id, label) pairs in one sort.
+
+        :param items: iterable of (id, label)
+        """
+        index = cls()
+        pairs = []
+        for item_id, label in items:
+            index._labels[item_id] = label
+            pairs.extend((word, item_id) for word in cls.words(label))
+        pairs.sort()
+        index._words = [word for word, _ in pairs]
+        index._ids = array("q", (item_id for _, item_id in pairs))
+        return index
+
+    def add(self, item_id: int, label: str) -> None:
+        """Index one new (or renamed) item."""
+        with self._lock:
+            self._labels[item_id] = label
+            for word in self.words(label):
+                position = bisect.bisect_left(self._words, word)
+                self._words.insert(position, word)
+                self._ids.insert(position, item_id)
+
+    def search(self, text: str, limit: int = 10) -> list:
+        """
+        Return up to limit (id, label) pairs whose words start with every
+        word of text, e.g. "jo mi" matches "Jordan Miles".
+        """
+        prefixes = self.words(text)
+        if not prefixes:
+            return []
+
+        # Scan the range of the longest prefix, it is the most selective
+        first = max(prefixes, key=len)
+        results = []
+        seen = set()
+        with self._lock:
+            position = bisect.bisect_left(self._words, first)
+            while position < len(self._words) and len(results) < limit:
+                if not self._words[position].startswith(first):
+                    break
+                item_id = self._ids[position]
+                position += 1
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                label = self._labels.get(item_id)
+                if label is not None and self._matches_all(label, prefixes):
+                    results.append((item_id, label))
+        return results
+
+    @classmethod
+    def words(cls, text) -> list:
+        """Lowercase words of text (letters, digits and underscores)."""
+        return cls._WORD.findall(str(text or "").lower())
+
+    # ---------- Private helpers ----------
+
+    @classmethod
+    def _matches_all(cls, label: str, prefixes) -> bool:
+        words = cls.words(label)
+        return all(any(word.startswith(prefix) for word in words) for prefix in prefixes)
@@ -0,0 +1,63 @@
+
+"""Implements the QueryPlanChecker class."""
+
+from legal_case_app.application_base import ApplicationBase
+import inspect
+
+
+class QueryPlanChecker(ApplicationBase):
+    """
+    Runs EXPLAIN on every query in AppServices.plan_check_queries().
+
+    A query fails the check if any base table in its plan is read with a
+    full table scan (access type ALL). Scans of derived tables (<derivedN>)
+    are allowed, since those are already-limited intermediate results.
+
+    MySQL picks full scans for tiny tables no matter which indexes exist,
+    so run this against a realistically sized database (e.g. one seeded by
+    the benchmark package), not the three-row sample data.
+    """
+
+    def __init__(self, config: dict, services) -> None:
+        """
+        Initialize the checker.
+
+        :param config: application config dict
+        :param services: AppServices instance whose queries are checked
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.DB = services
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    def check(self) -> list:
+        """
+        EXPLAIN each service query.
+
+        :return: list of (name, ok, problems) where problems lists the
+                 tables that were full-scanned
+        """
+        results = []
+        for name, query, params in self.DB.plan_check_queries():
+            plan = self.DB.fetch_all(f"EXPLAIN {query.strip().rstrip(';')}", params)
+            problems = [
+                f"{row['table']} (type=ALL, rows={row['rows']})"
+                for row in plan
+                if row["type"] == "ALL"
+                and row["table"]
+                and not row["table"].startswith("<")
+            ]
+            if problems:
+                self._logger.log_warning(
+                    f"{inspect.currentframe().f_code.co_name}: "
+                    f"{name} does a full table scan on {', '.join(problems)}"
+                )
+            results.append((name, not problems, problems))
+        return results
@@ -0,0 +1,100 @@
+"""Implements the RosterCache class."""
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class RosterCache():
+    """
+    In-process LRU + TTL cache of case rosters keyed by case_id.
+
+    Entries expire ttl_seconds after they were loaded and the least recently
+    used entry is evicted once max_entries is reached. Writers call
+    invalidate() for the case they touched; a load that raced with an
+    invalidation is not stored, so a roster read before a write can never
+    be cached after it.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0) -> None:
+        """Initialize instance. max_entries <= 0 disables caching."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """True if the cache will store anything."""
+        return self.max_entries > 0
+
+    def get_or_load(self, case_id: int, loader):
+        """
+        Return the cached roster for case_id, calling loader(case_id) on a miss.
+
+        Empty results (unknown case_id) are returned but not cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(case_id)
+            if entry is not None:
+                expires_at, rows = entry
+                if expires_at > now:
+                    self._entries.move_to_end(case_id)
+                    self.hits += 1
+                    return list(rows)
+                del self._entries[case_id]
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation
+
+        rows = loader(case_id)
+
+        if rows and self.enabled:
+            with self._lock:
+                # Skip the store if a write invalidated anything meanwhile
+                if generation == self._generation:
+                    self._entries[case_id] = (now + self.ttl_seconds, list(rows))
+                    self._entries.move_to_end(case_id)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+        return rows
+
+    def invalidate(self, *case_ids) -> None:
+        """Drop the cached rosters for the given case_ids."""
+        with self._lock:
+            self._generation += 1
+            for case_id in case_ids:
+                if self._entries.pop(case_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every cached roster."""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return the current size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
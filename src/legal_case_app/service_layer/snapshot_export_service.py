@@ -0,0 +1,252 @@
+"""Implements the SnapshotExportService class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.persistence_layer.columnar_store import open_writer, resolve_format
+from datetime import datetime, timedelta
+import inspect
+import json
+import os
+import shutil
+import time
+
+
+class SnapshotExportService(ApplicationBase):
+    """
+    Copies lawyer, legal_case and case_lawyer_xref to a columnar snapshot
+    on disk, for analytics that should not run against the live database.
+
+    Tables are read in primary key order, chunk_size rows per keyset page
+    (on a read replica when one is configured), and each page is appended
+    to the snapshot as it arrives. A snapshot directory holds a
+    manifest.json and one part-NNNN directory per export: a full export
+    replaces every part, an incremental export adds a part with only the
+    rows whose updated_at (migration 005) is at or after the previous
+    export's watermark, minus overlap_seconds. SnapshotReader merges the
+    parts, the newest copy of a row winning.
+
+    Rows never change updated_at on their way out, so an incremental part
+    also records tombstones: the keys of the legal_case and
+    case_lawyer_xref rows archived since the previous export (their
+    archived_at in the archive tables, migration 007). The reader drops
+    every older copy of those keys.
+    """
+
+    DEFAULT_DIRECTORY = os.path.join("snapshots", "roster")
+    DEFAULT_CHUNK_SIZE = 10000
+    DEFAULT_OVERLAP_SECONDS = 60
+    MANIFEST = "manifest.json"
+    VERSION = 2
+
+    # table -> (primary key, ((column, kind), ...)); the key comes first
+    TABLES = {
+        "lawyer": ("lawyer_id", (
+            ("lawyer_id", "int"),
+            ("first_name", "str"),
+            ("last_name", "str"),
+            ("specialization", "str"),
+            ("email", "str"),
+            ("phone", "str"),
+            ("hire_date", "date"),
+            ("updated_at", "timestamp"),
+        )),
+        "legal_case": ("case_id", (
+            ("case_id", "int"),
+            ("case_name", "str"),
+            ("client_name", "str"),
+            ("case_status", "str"),
+            ("start_date", "date"),
+            ("end_date", "date"),
+            ("description", "str"),
+            ("updated_at", "timestamp"),
+        )),
+        "case_lawyer_xref": ("id", (
+            ("id", "int"),
+            ("case_id", "int"),
+            ("lawyer_id", "int"),
+            ("role", "str"),
+            ("billable_hours", "decimal"),
+            ("updated_at", "timestamp"),
+        )),
+    }
+
+    # table -> (archive table its rows move to, its key there)
+    TOMBSTONES = {
+        "legal_case": ("legal_case_archive", "case_id"),
+        "case_lawyer_xref": ("case_lawyer_xref_archive", "id"),
+    }
+
+    # One keyset page of a table; {changed} filters an incremental export
+    CHUNK_SQL = """
+        SELECT {columns}
+        FROM {table}
+        WHERE {key} > %s{changed}
+        ORDER BY {key}
+        LIMIT %s;
+        """
+
+    def __init__(self, config: dict, services, directory=None) -> None:
+        """
+        Initialize the exporter.
+
+        :param config: application config dict
+        :param services: AppServices instance used for queries
+        :param directory: snapshot directory, default snapshot.directory in config
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.DB = services
+        snapshot_config = config.get("snapshot", {})
+        self.directory = directory or snapshot_config.get("directory", self.DEFAULT_DIRECTORY)
+        self.format = snapshot_config.get("format", "auto")
+        self.compression = snapshot_config.get("compression", "zstd")
+        self.chunk_size = snapshot_config.get("chunk_size", self.DEFAULT_CHUNK_SIZE)
+        self.overlap_seconds = snapshot_config.get(
+            "overlap_seconds", self.DEFAULT_OVERLAP_SECONDS
+        )
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Public API ----------
+
+    def export(self, incremental: bool = False) -> dict:
+        """
+        Write one part of the snapshot.
+
+        :param incremental: only copy rows changed since the last export
+                            (a full export when there is no snapshot yet)
+        :return: {"part", "kind", "format", "rows": {table: n}, "seconds"}
+        """
+        started = time.perf_counter()
+        manifest = self.load_manifest()
+        incremental = incremental and manifest is not None
+
+        if incremental:
+            fmt = manifest["format"]
+            since = (
+                datetime.fromisoformat(manifest["watermark"])
+                - timedelta(seconds=self.overlap_seconds)
+            )
+            number = manifest["parts"][-1]["part"] + 1
+        else:
+            fmt = resolve_format(self.format)
+            since = None
+            number = manifest["parts"][-1]["part"] + 1 if manifest else 1
+
+        # Taken before reading: anything changed from here on is in the next export
+        watermark = self._database_now()
+        part_name = f"part-{number:04d}"
+        part_dir = os.path.join(self.directory, part_name)
+        os.makedirs(part_dir, exist_ok=True)
+
+        rows = {}
+        for table, (key, columns) in self.TABLES.items():
+            writer = open_writer(fmt, part_dir, table, columns, self._compression(fmt))
+            try:
+                for chunk in self._chunks(table, key, columns, since):
+                    writer.write_batch(chunk)
+            finally:
+                rows[table] = writer.close()
+
+        # Read after the rows: a row archived while they were read is both
+        # in this part and tombstoned by it, and the tombstone wins
+        deleted = {}
+        if incremental:
+            for table, (archive, archive_key) in self.TOMBSTONES.items():
+                key = self.TABLES[table][0]
+                writer = open_writer(
+                    fmt, part_dir, self.tombstone_table(table), ((key, "int"),),
+                    self._compression(fmt),
+                )
+                try:
+                    for chunk in self._chunks(archive, archive_key, ((archive_key, "int"),),
+                                              since, changed_column="archived_at"):
+                        writer.write_batch(chunk)
+                finally:
+                    deleted[table] = writer.close()
+
+        part = {
+            "part": number,
+            "directory": part_name,
+            "kind": "incremental" if incremental else "full",
+            "since": since.isoformat(" ") if since else None,
+            "rows": rows,
+            "deleted": deleted,
+        }
+        old_parts = [] if incremental or not manifest else manifest["parts"]
+        self._write_manifest({
+            "version": self.VERSION,
+            "format": fmt,
+            "watermark": watermark.isoformat(" "),
+            "tables": {
+                table: {"key": key, "columns": [list(column) for column in columns]}
+                for table, (key, columns) in self.TABLES.items()
+            },
+            "parts": (manifest["parts"] if incremental else []) + [part],
+        })
+        # Only after the new manifest is in place; open readers keep their mappings
+        for old in old_parts:
+            shutil.rmtree(os.path.join(self.directory, old["directory"]), ignore_errors=True)
+
+        seconds = time.perf_counter() - started
+        self._logger.log_info(
+            "%s: wrote %s %s part %d of %s in %.2fs: %s, deleted %s",
+            inspect.currentframe().f_code.co_name, part["kind"], fmt, number,
+            self.directory, seconds, rows, deleted,
+        )
+        return dict(part, format=fmt, seconds=seconds)
+
+    def load_manifest(self):
+        """Return the snapshot's manifest dict, or None if there is no snapshot yet."""
+        path = os.path.join(self.directory, self.MANIFEST)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as file:
+            return json.load(file)
+
+    @staticmethod
+    def tombstone_table(table: str) -> str:
+        """Name under which a part stores the keys deleted from table."""
+        return f"{table}.deleted"
+
+    # ---------- Private helpers ----------
+
+    def _chunks(self, table: str, key: str, columns: tuple, since=None,
+                changed_column: str = "updated_at"):
+        """Yield lists of row tuples in key order, chunk_size rows at a time."""
+        query = self.CHUNK_SQL.format(
+            columns=", ".join(name for name, _ in columns),
+            table=table,
+            key=key,
+            changed=f" AND {changed_column} >= %s" if since else "",
+        )
+        last_key = 0
+        while True:
+            params = (last_key, since, self.chunk_size) if since else (last_key, self.chunk_size)
+            chunk = self.DB.fetch_all(query, params, row_format="tuple")
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < self.chunk_size:
+                return
+            last_key = chunk[-1][0]
+
+    def _database_now(self) -> datetime:
+        """The database clock (the same clock that sets updated_at), to the second."""
+        now = self.DB.fetch_all("SELECT CURRENT_TIMESTAMP;", dictionary=False)[0][0]
+        return datetime.fromisoformat(str(now)).replace(microsecond=0, tzinfo=None)
+
+    def _compression(self, fmt: str):
+        return self.compression if fmt == "arrow" else None
+
+    def _write_manifest(self, manifest: dict):
+        """Replace manifest.json atomically, so readers never see half of one."""
+        path = os.path.join(self.directory, self.MANIFEST)
+        with open(path + ".tmp", "w") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(path + ".tmp", path)
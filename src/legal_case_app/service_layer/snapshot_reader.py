@@ -0,0 +1,283 @@
+"""Implements the SnapshotReader class."""
+
+from legal_case_app.persistence_layer.columnar_store import NULL_CODE, NULL_INT, read_table
+from legal_case_app.service_layer.app_services import AppServices
+from decimal import Decimal
+import json
+import os
+
+
+class SnapshotReader():
+    """
+    Reads a snapshot written by SnapshotExportService and answers the
+    billable hours reports with NumPy instead of SQL.
+
+    Column files are memory-mapped (.npy, and uncompressed Arrow IPC) so
+    only the pages a report touches are read. When the snapshot has
+    incremental parts, each table is merged once on first use: the parts
+    are concatenated, only the newest copy of every primary key kept, and
+    keys tombstoned (archived) by the same or a later part dropped.
+    Needs numpy (and pyarrow for the arrow format); nothing here touches
+    the database.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Open a snapshot directory.
+
+        :param directory: directory holding manifest.json
+        """
+        import numpy
+
+        self._np = numpy
+        self.directory = directory
+        with open(os.path.join(directory, "manifest.json"), "r") as file:
+            self.manifest = json.load(file)
+        self.format = self.manifest["format"]
+        self.watermark = self.manifest["watermark"]
+        self._tables = {}
+
+    # ---------- Public API ----------
+
+    def table(self, name: str) -> dict:
+        """
+        Return one table, sorted by primary key, as {column: values}.
+
+        int, decimal (hundredths), date and timestamp columns are NumPy
+        arrays with NULL as NULL_INT / NaT; str columns are (int32 codes,
+        sorted list of values), NULL_CODE for NULL, so code order is value
+        order.
+        """
+        if name not in self._tables:
+            self._tables[name] = self._load(name)
+        return self._tables[name]
+
+    def billable_hours_report(self, name: str, columnar: bool = False):
+        """
+        Return (headers, rows) for one of AppServices.BILLABLE_HOURS_REPORTS,
+        with the same rows and order as the SQL version.
+
+        :param name: report name, e.g. 'by-lawyer'
+        :param columnar: return (headers, {column: ndarray}) instead of rows;
+                         hours are then float64 with NaN for NULL
+        """
+        if name not in AppServices.BILLABLE_HOURS_REPORTS:
+            raise ValueError(
+                f"Unknown report '{name}'. "
+                f"Expected one of: {', '.join(AppServices.BILLABLE_HOURS_REPORTS)}."
+            )
+        if name.startswith("ledger-"):
+            raise ValueError(
+                f"Report '{name}' reads the hours ledger totals, which snapshots do not copy."
+            )
+        headers = AppServices.BILLABLE_HOURS_REPORTS[name][1]
+        columns = getattr(self, "_by_" + name[len("by-"):].replace("-", "_"))()
+        if columnar:
+            return headers, self._hours_as_float(columns)
+        return headers, self._to_rows(headers, columns)
+
+    # ---------- Reports ----------
+
+    def _by_lawyer(self) -> dict:
+        return self._by_parent("lawyer", "lawyer_id", ("first_name", "last_name"))
+
+    def _by_case(self) -> dict:
+        return self._by_parent("legal_case", "case_id", ("case_name", "case_status"))
+
+    def _by_parent(self, parent: str, key: str, labels: tuple) -> dict:
+        """Hours per parent row with at least one assignment, biggest total first."""
+        np = self._np
+        xref = self.table("case_lawyer_xref")
+        ids, stats = self._aggregate(xref[key], xref["billable_hours"])
+
+        parent_table = self.table(parent)
+        position, found = self._lookup(parent_table[key], ids)
+        ids, position = ids[found], position[found]
+        stats = {name: values[found] for name, values in stats.items()}
+
+        order = np.lexsort((ids, -stats["total_hours"], stats["total_hours"] == NULL_INT))
+        result = {key: ids[order]}
+        for label in labels:
+            codes, values = parent_table[label]
+            result[label] = (codes[position[order]], values)
+        result.update({name: values[order] for name, values in stats.items()})
+        return result
+
+    def _by_role(self) -> dict:
+        np = self._np
+        xref = self.table("case_lawyer_xref")
+        codes, values = xref["role"]
+        roles, stats = self._aggregate(codes, xref["billable_hours"])
+        order = np.lexsort((roles, -stats["total_hours"], stats["total_hours"] == NULL_INT))
+        result = {"role": (roles[order], values)}
+        result.update({name: column[order] for name, column in stats.items()})
+        return result
+
+    def _by_status_month(self) -> dict:
+        np = self._np
+        xref = self.table("case_lawyer_xref")
+        cases = self.table("legal_case")
+        position, found = self._lookup(cases["case_id"], xref["case_id"])
+        position = position[found]
+
+        status_codes, status_values = cases["case_status"]
+        months = cases["start_date"][position].astype("M8[M]").astype(np.int64)
+        keys = np.stack([status_codes[position].astype(np.int64), months], axis=1)
+        groups, stats = self._aggregate(keys, xref["billable_hours"][found])
+        # np.unique sorts the (status, month) pairs: already in report order
+        return dict(
+            {
+                "case_status": (groups[:, 0], status_values),
+                "start_month": np.datetime_as_string(groups[:, 1].astype("M8[M]"), unit="M"),
+            },
+            **stats,
+        )
+
+    # ---------- Private helpers ----------
+
+    def _aggregate(self, keys, hours):
+        """
+        GROUP BY keys: SUM, ROUND(AVG, 2) and COUNT(*) of hours (hundredths).
+
+        :return: (sorted distinct keys, {"total_hours", "avg_hours",
+                 "assignments"}), NULL_INT where every hour is NULL
+        """
+        np = self._np
+        if keys.ndim == 1:
+            groups, inverse = np.unique(keys, return_inverse=True)
+        else:
+            groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        size = len(groups)
+
+        present = hours != NULL_INT
+        # float64 sums are exact up to 2**53 hundredths
+        totals = np.rint(
+            np.bincount(inverse, weights=np.where(present, hours, 0), minlength=size)
+        ).astype(np.int64)
+        counts = np.bincount(inverse, minlength=size)
+        summed = np.bincount(inverse, weights=present, minlength=size).astype(np.int64)
+
+        # ROUND(AVG(x), 2) rounds half away from zero
+        divisor = np.maximum(summed, 1)
+        averages = np.sign(totals) * ((2 * np.abs(totals) + divisor) // (2 * divisor))
+        return groups, {
+            "total_hours": np.where(summed > 0, totals, NULL_INT),
+            "avg_hours": np.where(summed > 0, averages, NULL_INT),
+            "assignments": counts.astype(np.int64),
+        }
+
+    def _lookup(self, sorted_keys, keys):
+        """(positions of keys in sorted_keys, mask of keys that were found)."""
+        np = self._np
+        if len(sorted_keys) == 0:
+            return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+        position = np.searchsorted(sorted_keys, keys)
+        position = np.minimum(position, len(sorted_keys) - 1)
+        return position, sorted_keys[position] == keys
+
+    def _to_rows(self, headers: tuple, columns: dict) -> list:
+        """Report columns -> tuples typed like the SQL rows (Decimal hours, str labels)."""
+        converted = []
+        for name in headers:
+            column = columns[name]
+            if isinstance(column, tuple):
+                codes, values = column
+                converted.append([None if code == NULL_CODE else values[code] for code in codes.tolist()])
+            elif name in ("total_hours", "avg_hours"):
+                converted.append([
+                    None if value == NULL_INT else Decimal(value).scaleb(-2)
+                    for value in column.tolist()
+                ])
+            else:
+                converted.append(column.tolist())
+        return list(zip(*converted))
+
+    def _hours_as_float(self, columns: dict) -> dict:
+        np = self._np
+        result = {}
+        for name, column in columns.items():
+            if isinstance(column, tuple):
+                codes, values = column
+                labels = np.array(values + [None], dtype=object)
+                result[name] = labels[codes]
+            elif name in ("total_hours", "avg_hours"):
+                result[name] = np.where(column == NULL_INT, np.nan, column / 100)
+            else:
+                result[name] = column
+        return result
+
+    def _load(self, name: str) -> dict:
+        """Read every part of one table and merge them."""
+        np = self._np
+        spec = self.manifest["tables"][name]
+        columns = tuple((column, kind) for column, kind in spec["columns"])
+        parts = [
+            read_table(self.format, os.path.join(self.directory, part["directory"]), name, columns)
+            for part in self.manifest["parts"]
+        ]
+
+        merged = {}
+        for column, kind in columns:
+            pieces = [part[column] for part in parts]
+            if kind == "str":
+                merged[column] = self._merge_dictionaries(pieces)
+            elif len(pieces) == 1:
+                merged[column] = pieces[0]
+            else:
+                merged[column] = np.concatenate(pieces)
+        if len(parts) == 1:
+            # One part was exported in key order and has no repeats
+            return merged
+
+        # Newest copy of each key: first occurrence in the reversed concatenation
+        keys = merged[spec["key"]]
+        _, first = np.unique(keys[::-1], return_index=True)
+        keep = len(keys) - 1 - first
+        keep = keep[self._not_deleted(name, spec["key"], keys[keep], parts, keep)]
+        return {
+            column: (values[0][keep], values[1]) if isinstance(values, tuple) else values[keep]
+            for column, values in merged.items()
+        }
+
+    def _not_deleted(self, name: str, key: str, keys, parts: list, rows):
+        """
+        Boolean mask over keys (at positions rows of the concatenation):
+        False where a part at or after the row's own part tombstoned the key.
+        """
+        np = self._np
+        # The last part that deleted each key (parts are oldest first)
+        deleted = {}
+        for number, part in enumerate(self.manifest["parts"]):
+            if not part.get("deleted", {}).get(name):
+                continue
+            part_dir = os.path.join(self.directory, part["directory"])
+            tombstones = read_table(
+                self.format, part_dir, f"{name}.deleted", ((key, "int"),)
+            )[key]
+            deleted.update(dict.fromkeys(np.asarray(tombstones).tolist(), number))
+        if not deleted:
+            return np.ones(len(keys), dtype=bool)
+
+        part_of_row = np.repeat(
+            np.arange(len(parts)), [len(part[key]) for part in parts]
+        )[rows]
+        deleted_keys = np.fromiter(deleted.keys(), dtype=np.int64, count=len(deleted))
+        deleted_in = np.fromiter(deleted.values(), dtype=np.int64, count=len(deleted))
+        order = np.argsort(deleted_keys)
+        deleted_keys, deleted_in = deleted_keys[order], deleted_in[order]
+        position = np.minimum(np.searchsorted(deleted_keys, keys), len(deleted_keys) - 1)
+        tombstoned = (deleted_keys[position] == keys) & (deleted_in[position] >= part_of_row)
+        return ~tombstoned
+
+    def _merge_dictionaries(self, pieces: list) -> tuple:
+        """Concatenate (codes, values) pieces over one sorted list of values."""
+        np = self._np
+        values = sorted(set().union(*(piece_values for _, piece_values in pieces)))
+        index = {value: code for code, value in enumerate(values)}
+        codes = []
+        for piece_codes, piece_values in pieces:
+            # Last slot maps NULL_CODE (-1) to itself
+            remap = np.array([index[value] for value in piece_values] + [NULL_CODE], dtype=np.int32)
+            codes.append(remap[piece_codes])
+        return np.concatenate(codes) if len(codes) > 1 else codes[0], values
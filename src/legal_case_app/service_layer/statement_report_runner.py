@@ -0,0 +1,331 @@
+"""Implements the StatementReportRunner class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.persistence_layer.row_formats import json_default
+from legal_case_app.service_layer.app_services import AppServices
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal
+import copy
+import csv
+import inspect
+import json
+import multiprocessing
+import os
+import shutil
+import time
+
+
+STATEMENT_FORMATS = ("jsonl", "csv")
+
+# One csv row per case and lawyer (a case without lawyers gets one row)
+CSV_HEADERS = (
+    AppServices.ROSTER_CASE_KEYS + AppServices.ROSTER_LAWYER_KEYS + ("case_total_hours",)
+)
+
+
+# ---------- Worker processes ----------
+
+# Each worker process builds its own AppServices, and so its own pool
+_worker_services = None
+
+
+def _init_worker(config: dict):
+    global _worker_services
+    _worker_services = AppServices(config)
+
+
+def case_statement(roster: dict) -> dict:
+    """
+    One case's statement: the case columns, its lawyers (by lawyer_id)
+    and the total of their billable hours.
+
+    :param roster: {"case": {...}, "lawyers": [...]} from group_roster_rows
+    """
+    lawyers = sorted(roster["lawyers"], key=lambda lawyer: lawyer["lawyer_id"])
+    total = sum(
+        (lawyer["billable_hours"] for lawyer in lawyers if lawyer["billable_hours"] is not None),
+        Decimal("0.00"),
+    )
+    return dict(roster["case"], lawyers=lawyers, total_hours=total)
+
+
+def _render_shard(number: int, after_case_id: int, last_case_id: int, path: str,
+                  fmt: str, chunk_size: int) -> dict:
+    """
+    Write the statements of after_case_id < case_id <= last_case_id to
+    path, one roster chunk at a time, then checkpoint the shard.
+    """
+    started = time.perf_counter()
+    cases = 0
+    with open(path + ".tmp", "w", newline="") as file:
+        writer = csv.writer(file) if fmt == "csv" else None
+        for chunk in _worker_services.iter_case_rosters_in_range(
+            after_case_id, last_case_id, chunk_size
+        ):
+            for roster in chunk.values():
+                statement = case_statement(roster)
+                if writer is None:
+                    file.write(json.dumps(statement, default=json_default) + "\n")
+                    continue
+                case = [statement[key] for key in AppServices.ROSTER_CASE_KEYS]
+                lawyers = statement["lawyers"] or [dict.fromkeys(AppServices.ROSTER_LAWYER_KEYS)]
+                writer.writerows(
+                    case + [lawyer[key] for key in AppServices.ROSTER_LAWYER_KEYS]
+                    + [statement["total_hours"]]
+                    for lawyer in lawyers
+                )
+            cases += len(chunk)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(path + ".tmp", path)
+
+    result = {"shard": number, "cases": cases, "seconds": time.perf_counter() - started}
+    with open(path + ".done", "w") as file:
+        json.dump(result, file)
+    return result
+
+
+class StatementReportRunner(ApplicationBase):
+    """
+    Writes a roster statement for every legal_case row using several
+    processes.
+
+    The case_id keyspace is cut into shards of shard_size cases. A
+    ProcessPoolExecutor of workers renders them, each process with its own
+    AppServices and connection pool, streaming its statements into one
+    file per shard. The shard files are then concatenated in case_id order
+    into the output.
+
+    Progress lives in <output>.shards/: plan.json fixes the shard
+    boundaries, and a shard-NNNNN.<fmt>.done file marks each finished
+    shard. If a run is interrupted, running it again with the same output
+    only renders the unfinished shards.
+    """
+
+    DEFAULT_SHARD_SIZE = 5000
+    DEFAULT_CHUNK_SIZE = 500
+
+    # case_id of the last case of a shard starting after %s (OFFSET shard_size - 1)
+    SHARD_BOUNDARY_SQL = """
+        SELECT case_id
+        FROM legal_case
+        WHERE case_id > %s
+        ORDER BY case_id
+        LIMIT 1 OFFSET %s;
+        """
+
+    def __init__(self, config: dict, services: AppServices) -> None:
+        """
+        Initialize the runner.
+
+        :param config: application config dict (also handed to every worker)
+        :param services: AppServices instance used to plan the shards
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.DB = services
+        statements_config = config.get("statements", {})
+        self.workers = statements_config.get("workers") or os.cpu_count() or 1
+        self.shard_size = statements_config.get("shard_size", self.DEFAULT_SHARD_SIZE)
+        self.chunk_size = statements_config.get("chunk_size", self.DEFAULT_CHUNK_SIZE)
+        self.format = statements_config.get("format", "jsonl")
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Public API ----------
+
+    def run(self, output: str, workers=None, fmt=None, shard_size=None,
+            restart: bool = False, progress=None) -> dict:
+        """
+        Write every case's statement to output, resuming an unfinished run.
+
+        :param output: file to write (jsonl: one JSON object per case)
+        :param workers: worker processes, default statements.workers (or one per CPU)
+        :param fmt: 'jsonl' or 'csv' for a new run (a resumed run keeps its own)
+        :param shard_size: cases per shard for a new run
+        :param restart: discard the checkpoints of an unfinished run
+        :param progress: optional callable, given a dict after every shard
+        :return: {"output", "format", "shards", "resumed_shards", "cases", "seconds"}
+        """
+        started = time.perf_counter()
+        self._require_shared_database()
+        work_dir = output + ".shards"
+        if restart:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        plan = self._load_plan(work_dir)
+        if plan is None:
+            plan = self._plan(fmt or self.format, shard_size or self.shard_size)
+            os.makedirs(work_dir, exist_ok=True)
+            self._write_json(os.path.join(work_dir, "plan.json"), plan)
+        fmt = plan["format"]
+
+        shards = list(enumerate(plan["shards"], start=1))
+        paths = {number: os.path.join(work_dir, f"shard-{number:05d}.{fmt}") for number, _ in shards}
+        finished = {number: self._checkpoint(paths[number]) for number, _ in shards}
+        pending = [(number, shard) for number, shard in shards if finished[number] is None]
+        cases = sum(result["cases"] for result in finished.values() if result is not None)
+        resumed = len(shards) - len(pending)
+        if resumed:
+            self._logger.log_info(
+                "%s: resuming %s: %d of %d shards already done",
+                inspect.currentframe().f_code.co_name, output, resumed, len(shards),
+            )
+
+        if pending:
+            cases += self._render(pending, paths, fmt, workers or self.workers,
+                                  len(shards), cases, progress)
+
+        self._merge(output, fmt, [paths[number] for number, _ in shards])
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+        seconds = time.perf_counter() - started
+        self._logger.log_info(
+            "%s: wrote %d statements to %s in %.2fs",
+            inspect.currentframe().f_code.co_name, cases, output, seconds,
+        )
+        return {
+            "output": output,
+            "format": fmt,
+            "shards": len(shards),
+            "resumed_shards": resumed,
+            "cases": cases,
+            "seconds": seconds,
+        }
+
+    # ---------- Private helpers ----------
+
+    def _render(self, pending: list, paths: dict, fmt: str, workers: int,
+                total_shards: int, cases: int, progress) -> int:
+        """Render the pending shards in worker processes; returns the cases written."""
+        workers = max(1, min(workers, len(pending)))
+        started = time.perf_counter()
+        done_before = total_shards - len(pending)
+        written = 0
+
+        # spawn: workers must not inherit the parent's open connections
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._worker_config(),),
+        )
+        try:
+            futures = [
+                executor.submit(_render_shard, number, after_case_id, last_case_id,
+                                paths[number], fmt, self.chunk_size)
+                for number, (after_case_id, last_case_id) in pending
+            ]
+            for finished, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                written += result["cases"]
+                elapsed = time.perf_counter() - started
+                report = {
+                    "shards_done": done_before + finished,
+                    "shards_total": total_shards,
+                    "cases": cases + written,
+                    "elapsed_seconds": elapsed,
+                    "eta_seconds": elapsed / finished * (len(pending) - finished),
+                }
+                self._logger.log_debug(
+                    "%s: shard %d done (%d cases in %.2fs): %s",
+                    inspect.currentframe().f_code.co_name,
+                    result["shard"], result["cases"], result["seconds"], report,
+                )
+                if progress is not None:
+                    progress(report)
+        except BaseException:
+            # Finished shards keep their checkpoints; a rerun picks up the rest
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        return written
+
+    def _plan(self, fmt: str, shard_size: int) -> dict:
+        """Cut the case_id keyspace into (after_case_id, last_case_id] shards."""
+        if fmt not in STATEMENT_FORMATS:
+            raise ValueError(
+                f"Unknown statement format '{fmt}'. Expected one of: {', '.join(STATEMENT_FORMATS)}."
+            )
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1.")
+
+        max_case_id = self.DB.fetch_all(
+            "SELECT COALESCE(MAX(case_id), 0) FROM legal_case;", dictionary=False
+        )[0][0]
+        shards = []
+        after_case_id = 0
+        while after_case_id < max_case_id:
+            # Each lookup skips shard_size entries of the primary key index
+            boundary = self.DB.fetch_all(
+                self.SHARD_BOUNDARY_SQL, (after_case_id, shard_size - 1), dictionary=False
+            )
+            last_case_id = boundary[0][0] if boundary else max_case_id
+            shards.append([after_case_id, last_case_id])
+            after_case_id = last_case_id
+        return {
+            "format": fmt,
+            "shard_size": shard_size,
+            "max_case_id": max_case_id,
+            "shards": shards,
+        }
+
+    def _merge(self, output: str, fmt: str, paths: list):
+        """Concatenate the shard files (in case_id order) into output, atomically."""
+        with open(output + ".tmp", "wb") as merged:
+            if fmt == "csv":
+                merged.write((",".join(CSV_HEADERS) + "\r\n").encode())
+            for path in paths:
+                with open(path, "rb") as shard:
+                    shutil.copyfileobj(shard, merged, 1024 * 1024)
+        os.replace(output + ".tmp", output)
+
+    def _worker_config(self) -> dict:
+        """
+        The config for worker processes: a worker runs one query at a time
+        and never writes, so it leaves the write-behind journal alone.
+        """
+        config = copy.deepcopy(self._config_dict)
+        config["write_behind"] = dict(config.get("write_behind", {}), enabled=False)
+        database = config["database"]
+        database["pool"] = dict(database.get("pool", {}), size=1, max_overflow=0)
+        if "replicas" in database:
+            database["replicas"] = dict(database["replicas"], pool_size=1)
+        return config
+
+    def _require_shared_database(self):
+        database = self._config_dict["database"]
+        if (database.get("backend", "mysql") == "sqlite"
+                and database.get("sqlite", {}).get("path", ":memory:") == ":memory:"):
+            raise ValueError(
+                "Worker processes can't see an in-memory SQLite database; "
+                "set database.sqlite.path to a file."
+            )
+
+    @staticmethod
+    def _checkpoint(path: str):
+        """The finished shard's result, or None if it still has to be rendered."""
+        if not (os.path.exists(path + ".done") and os.path.exists(path)):
+            return None
+        with open(path + ".done", "r") as file:
+            return json.load(file)
+
+    @staticmethod
+    def _load_plan(work_dir: str):
+        path = os.path.join(work_dir, "plan.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as file:
+            return json.load(file)
+
+    @staticmethod
+    def _write_json(path: str, value: dict):
+        with open(path + ".tmp", "w") as file:
+            json.dump(value, file)
+        os.replace(path + ".tmp", path)
@@ -0,0 +1,102 @@
+"""Input validation rules shared by the user interface and bulk import."""
+
+from decimal import Decimal, InvalidOperation
+
+# Column limits: case_lawyer_xref.role VARCHAR(100), billable_hours and
+# time_entry.hours DECIMAL(10,2), time_entry.note VARCHAR(500)
+MAX_ROLE_LENGTH = 100
+MAX_HOURS = Decimal("99999999.99")
+MAX_NOTE_LENGTH = 500
+
+
+def validate_lawyer(first_name, last_name, email):
+    """
+    Validate the fields of a new lawyer.
+
+    Raises ValueError with a user-facing message if a rule is broken.
+    """
+    # Names must contain letters only
+    if not str(first_name).isalpha() or not str(last_name).isalpha():
+        raise ValueError("First and last name must contain letters only.")
+
+    # Email must contain '@'
+    if "@" not in str(email):
+        raise ValueError("Email address must contain '@'.")
+
+
+def validate_case(case_name, client_name, case_status, start_date):
+    """
+    Validate the required fields of a new legal case.
+
+    Raises ValueError with a user-facing message if a rule is broken.
+    """
+    if not case_name or not client_name or not case_status or not start_date:
+        raise ValueError(
+            "Case name, client name, status, and start date are required."
+        )
+
+
+def parse_assignment(case_raw, lawyer_raw, role, hours_raw):
+    """
+    Validate and convert the fields of a lawyer-to-case assignment.
+
+    Returns (case_id, lawyer_id, role, billable_hours).
+    Raises ValueError with a user-facing message if a rule is broken.
+    """
+    try:
+        case_id = int(case_raw)
+        lawyer_id = int(lawyer_raw)
+        billable_hours = float(hours_raw)
+    except (TypeError, ValueError):
+        raise ValueError("Please enter valid numeric values for IDs and hours.")
+
+    validate_role(role)
+    validate_hours_range(billable_hours)
+
+    return case_id, lawyer_id, role, billable_hours
+
+
+def validate_role(role):
+    """Raise ValueError unless role is non-empty and fits case_lawyer_xref.role."""
+    if not role:
+        raise ValueError("Role is required.")
+    if len(str(role)) > MAX_ROLE_LENGTH:
+        raise ValueError(f"Role must be at most {MAX_ROLE_LENGTH} characters.")
+
+
+def validate_hours_range(hours):
+    """Raise ValueError if hours do not fit a DECIMAL(10,2) column."""
+    try:
+        hours = Decimal(str(hours))
+    except InvalidOperation:
+        raise ValueError("Please enter a valid number of hours.")
+    if not hours.is_finite() or abs(hours) > MAX_HOURS:
+        raise ValueError(f"Hours must be between -{MAX_HOURS} and {MAX_HOURS}.")
+
+
+def validate_note(note):
+    """Raise ValueError if a time entry note is longer than time_entry.note."""
+    if note is not None and len(str(note)) > MAX_NOTE_LENGTH:
+        raise ValueError(f"Note must be at most {MAX_NOTE_LENGTH} characters.")
+
+
+def parse_hours(hours_raw):
+    """
+    Validate and convert the hours of a time entry.
+
+    Returns a Decimal with two decimal places (the time_entry.hours type).
+    Negative hours are allowed, they correct an earlier entry.
+    Raises ValueError with a user-facing message if a rule is broken.
+    """
+    try:
+        hours = Decimal(str(hours_raw).strip())
+    except (InvalidOperation, ValueError):
+        raise ValueError("Please enter a valid number of hours.")
+
+    if not hours.is_finite() or hours != hours.quantize(Decimal("0.01")):
+        raise ValueError("Hours must be a number with at most two decimal places.")
+    if hours == 0:
+        raise ValueError("Hours must not be zero.")
+    validate_hours_range(hours)
+
+    return hours.quantize(Decimal("0.01"))
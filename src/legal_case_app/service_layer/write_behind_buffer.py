@@ -0,0 +1,463 @@
+"""Implements the WriteBehindBuffer class."""
+
+from legal_case_app.application_base import ApplicationBase
+from legal_case_app.service_layer.validation import (
+    parse_hours,
+    validate_hours_range,
+    validate_note,
+    validate_role,
+)
+from datetime import date
+from decimal import Decimal
+import glob
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+
+
+class WriteBehindBuffer(ApplicationBase):
+    """
+    Write-behind queue for case_lawyer_xref assignments and hours ledger
+    entries.
+
+    assign() and add_hours() validate the write, append it to a journal
+    file and fsync it before returning, then keep it in memory grouped per
+    (case_id, lawyer_id): a later assignment replaces role and hours,
+    time entries are kept in order and written through
+    HoursLedgerService.record_hours_many (one totals upsert per case and
+    lawyer per batch). A background thread flushes everything pending in
+    one transaction when max_pending keys are waiting or every
+    flush_interval_seconds.
+
+    Each flush seals the current journal file as one batch. The batch id
+    is recorded in write_behind_batch (migration 006) in the same
+    transaction as its rows, and the file is removed after the commit, so
+    a batch file left behind by a crash is replayed on the next start
+    exactly once. Writes for a missing case or lawyer, or hours for a
+    lawyer not on the case, can no longer be refused to the caller; they
+    are logged and appended to rejects.jsonl in the journal directory.
+    If the database still refuses a batch (a data or integrity error),
+    its entries are written one at a time in the same transaction and
+    the refused ones go to rejects.jsonl, so one bad entry cannot block
+    the queue. A refused entry is undone as a whole (its assignment and
+    its time entries), so everything in rejects.jsonl was not written.
+
+    Use one journal directory per process.
+    """
+
+    DEFAULT_MAX_PENDING = 500
+    DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+
+    # PEP 249 exception names (MySQL and SQLite alike) for a statement the
+    # database refuses whatever the retry; anything else is retried
+    REFUSED_ERRORS = ("DataError", "IntegrityError")
+
+    BATCH_APPLIED_SQL = "SELECT batch_id FROM write_behind_batch WHERE batch_id = %s;"
+    INSERT_BATCH_SQL = "INSERT INTO write_behind_batch (batch_id, entries) VALUES (%s, %s);"
+    DELETE_BATCH_SQL = "DELETE FROM write_behind_batch WHERE batch_id = %s;"
+    # {ids} is a list of %s
+    EXISTING_CASES_SQL = "SELECT case_id FROM legal_case WHERE case_id IN ({ids});"
+    EXISTING_LAWYERS_SQL = "SELECT lawyer_id FROM lawyer WHERE lawyer_id IN ({ids});"
+    ASSIGNED_SQL = """
+        SELECT case_id, lawyer_id
+        FROM case_lawyer_xref
+        WHERE case_id IN ({ids});
+        """
+
+    def __init__(self, config: dict, services) -> None:
+        """
+        Initialize the buffer and replay batches left by an earlier process.
+
+        :param config: application config dict ("write_behind" section)
+        :param services: AppServices instance the batches are written through
+        """
+        self._config_dict = config
+        self.META = config["meta"]
+
+        super().__init__(
+            subclass_name=self.__class__.__name__,
+            logfile_prefix_name=self.META["log_prefix"],
+        )
+
+        self.DB = services
+        write_behind_config = config.get("write_behind", {})
+        self.directory = write_behind_config.get("journal_directory", "write_behind")
+        self.max_pending = write_behind_config.get("max_pending", self.DEFAULT_MAX_PENDING)
+        self.flush_interval = write_behind_config.get(
+            "flush_interval_seconds", self.DEFAULT_FLUSH_INTERVAL_SECONDS
+        )
+        self.fsync = write_behind_config.get("fsync", True)
+        self.rejects_path = os.path.join(self.directory, "rejects.jsonl")
+
+        # _lock guards the open batch; _flush_lock lets one flush run at a time
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+
+        # Open batch: journal file and {(case_id, lawyer_id): entry}
+        self._journal = None
+        self._journal_path = None
+        self._pending = {}
+        # Sealed batches waiting to be applied, oldest first: (batch_id, path, pending)
+        self._sealed = []
+        # Batches whose files are gone; their markers are deleted by the next flush
+        self._applied = []
+        self.stats = {"writes": 0, "flushes": 0, "entries_written": 0, "rejected": 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._recover()
+
+        self._logger.log_debug(f"{inspect.currentframe().f_code.co_name}:It works!")
+
+    # ---------- Public API ----------
+
+    def assign(self, case_id: int, lawyer_id: int, role: str, billable_hours):
+        """
+        Queue an assignment; it replaces any pending one for the same pair.
+
+        Flushed as an upsert, so an existing assignment gets the new role
+        and hours instead of an error.
+
+        :raises ValueError: if role or billable_hours do not fit their columns
+        """
+        validate_role(role)
+        if billable_hours is not None:
+            validate_hours_range(billable_hours)
+        hours = None if billable_hours is None else self._to_decimal(billable_hours)
+        self._write({
+            "op": "assign", "case_id": case_id, "lawyer_id": lawyer_id,
+            "role": role, "hours": None if hours is None else str(hours),
+        })
+
+    def add_hours(self, case_id: int, lawyer_id: int, hours, work_date=None, note=None):
+        """
+        Queue one hours ledger entry (see HoursLedgerService.record_hours).
+
+        :param work_date: 'YYYY-MM-DD' or date, defaults to today (when
+                          queued, not when flushed)
+        :raises ValueError: if hours, work_date or note are not valid
+        """
+        hours = parse_hours(hours)
+        work_date = date.today() if work_date is None else date.fromisoformat(str(work_date))
+        validate_note(note)
+        self._write({
+            "op": "add_hours", "case_id": case_id, "lawyer_id": lawyer_id,
+            "hours": str(hours), "work_date": work_date.isoformat(), "note": note,
+        })
+
+    def pending_count(self) -> int:
+        """Number of (case_id, lawyer_id) keys not yet written to the database."""
+        with self._lock:
+            return len(self._pending) + sum(len(pending) for _, _, pending in self._sealed)
+
+    def flush(self) -> int:
+        """
+        Write everything queued so far, one transaction per sealed batch.
+
+        Database errors are re-raised; the batch stays on disk and in the
+        queue and is tried again by the next flush.
+
+        :return: number of entries written
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._seal()
+                sealed = list(self._sealed)
+
+            written = 0
+            for batch in sealed:
+                written += self._apply(*batch)
+                with self._lock:
+                    self._sealed.remove(batch)
+            return written
+
+    def close(self):
+        """Stop the flusher thread and flush what is left."""
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        written = self.flush()
+        with self._flush_lock:
+            self._prune()
+        self._logger.log_debug(
+            "%s: write-behind closed, %d entries written on close, stats %s",
+            inspect.currentframe().f_code.co_name, written, self.stats,
+        )
+        return written
+
+    # ---------- Queue ----------
+
+    def _write(self, op: dict):
+        """Journal one write durably, then coalesce it into the open batch."""
+        line = json.dumps(op) + "\n"
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The write-behind buffer is closed.")
+            if self._journal is None:
+                batch_id = f"batch-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+                self._journal_path = os.path.join(self.directory, batch_id + ".jsonl")
+                self._journal = open(self._journal_path, "a")
+                if self.fsync:
+                    # The new file's directory entry must survive a crash too
+                    directory = os.open(self.directory, os.O_RDONLY)
+                    try:
+                        os.fsync(directory)
+                    finally:
+                        os.close(directory)
+            self._journal.write(line)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self._coalesce(self._pending, op)
+            self.stats["writes"] += 1
+            full = len(self._pending) >= self.max_pending
+            self._start_flusher()
+        if full:
+            self._wake.set()
+
+    @staticmethod
+    def _coalesce(pending: dict, op: dict):
+        """Fold one journaled write into {(case_id, lawyer_id): entry}."""
+        key = (op["case_id"], op["lawyer_id"])
+        hours = None if op["hours"] is None else Decimal(op["hours"])
+        entry = pending.setdefault(key, {"role": None, "hours": None, "time_entries": []})
+        if op["op"] == "assign":
+            entry["role"], entry["hours"] = op["role"], hours
+            return
+        entry["time_entries"].append((hours, op.get("work_date"), op.get("note")))
+
+    def _seal(self):
+        """Close the open batch and queue it for writing. Caller holds _lock."""
+        if self._journal is None:
+            return
+        self._journal.close()
+        batch_id = os.path.basename(self._journal_path)[:-len(".jsonl")]
+        self._sealed.append((batch_id, self._journal_path, self._pending))
+        self._journal = None
+        self._journal_path = None
+        self._pending = {}
+
+    # ---------- Flusher thread ----------
+
+    def _start_flusher(self):
+        """Start the background flusher once. Caller holds _lock."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="write-behind-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            with self._lock:
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                self._logger.log_error(
+                    "%s: write-behind flush failed, retrying in %.1fs: %s",
+                    inspect.currentframe().f_code.co_name, self.flush_interval, e,
+                )
+
+    # ---------- Writing batches ----------
+
+    def _apply(self, batch_id: str, path: str, pending: dict) -> int:
+        """Write one batch in a transaction (unless it already was), then drop its file."""
+        started = time.perf_counter()
+        applied = list(self._applied)
+        try:
+            already_applied, rejected = self._apply_in_transaction(
+                batch_id, pending, applied, self._write_entries
+            )
+        except Exception as e:
+            if type(e).__name__ not in self.REFUSED_ERRORS:
+                raise
+            self._logger.log_warning(
+                "%s: %s refused by the database (%s), writing its entries one at a time",
+                inspect.currentframe().f_code.co_name, batch_id, e,
+            )
+            already_applied, rejected = self._apply_in_transaction(
+                batch_id, pending, applied, self._write_entries_one_by_one
+            )
+        del self._applied[:len(applied)]
+
+        # Safe to lose from here on: the marker row stops a second replay
+        os.remove(path)
+        self._applied.append(batch_id)
+        if already_applied:
+            self._logger.log_info(
+                "%s: %s was already written, removed its journal file",
+                inspect.currentframe().f_code.co_name, batch_id,
+            )
+            return 0
+
+        self.DB.invalidate_case_rosters(*{case_id for case_id, _ in pending})
+        if rejected:
+            self._reject(batch_id, rejected)
+        written = len(pending) - len(rejected)
+        self.stats["flushes"] += 1
+        self.stats["entries_written"] += written
+        self._logger.log_debug(
+            "%s: %s: wrote %d entries (%d rejected) in %.3fs",
+            inspect.currentframe().f_code.co_name, batch_id, written, len(rejected),
+            time.perf_counter() - started,
+        )
+        return written
+
+    def _apply_in_transaction(self, batch_id: str, pending: dict, applied: list,
+                              write_entries) -> tuple:
+        """
+        Write the batch and its marker in one transaction.
+
+        :param write_entries: _write_entries or _write_entries_one_by_one
+        :return: (already_applied, rejected)
+        """
+        rejected = []
+        # flush_queued=False: this is the flush
+        with self.DB.transaction(flush_queued=False):
+            if applied:
+                self.DB.execute_many(self.DELETE_BATCH_SQL, [(batch_id,) for batch_id in applied])
+            already_applied = bool(self.DB.fetch_all(
+                self.BATCH_APPLIED_SQL, (batch_id,), dictionary=False
+            ))
+            if not already_applied and pending:
+                rejected = write_entries(pending)
+                self.DB.execute(self.INSERT_BATCH_SQL, (batch_id, len(pending)))
+            elif not already_applied:
+                # An empty file is a batch that crashed before its first write
+                self.DB.execute(self.INSERT_BATCH_SQL, (batch_id, 0))
+        return already_applied, rejected
+
+    def _prune(self):
+        """Delete the markers of batches whose files are gone. Caller holds _flush_lock."""
+        if not self._applied:
+            return
+        self.DB.execute_many(self.DELETE_BATCH_SQL, [(batch_id,) for batch_id in self._applied])
+        self._applied.clear()
+
+    def _write_entries(self, pending: dict) -> list:
+        """
+        Upsert the assignments and record the time entries of one batch.
+
+        :return: [(case_id, lawyer_id, entry, reason)] for the entries refused
+        """
+        case_ids = sorted({case_id for case_id, _ in pending})
+        lawyer_ids = sorted({lawyer_id for _, lawyer_id in pending})
+        cases = {row[0] for row in self._fetch_in(self.EXISTING_CASES_SQL, case_ids)}
+        lawyers = {row[0] for row in self._fetch_in(self.EXISTING_LAWYERS_SQL, lawyer_ids)}
+        assigned = {tuple(row) for row in self._fetch_in(self.ASSIGNED_SQL, case_ids)}
+
+        upserts, time_entries, rejected = [], [], []
+        for (case_id, lawyer_id), entry in sorted(pending.items()):
+            if case_id not in cases:
+                rejected.append((case_id, lawyer_id, entry, f"Case {case_id} does not exist."))
+            elif lawyer_id not in lawyers:
+                rejected.append((case_id, lawyer_id, entry, f"Lawyer {lawyer_id} does not exist."))
+            elif entry["role"] is None and (case_id, lawyer_id) not in assigned:
+                rejected.append((
+                    case_id, lawyer_id, entry,
+                    f"Lawyer {lawyer_id} is not assigned to case {case_id}.",
+                ))
+            else:
+                if entry["role"] is not None:
+                    upserts.append((case_id, lawyer_id, entry["role"], entry["hours"]))
+                time_entries.extend(
+                    (case_id, lawyer_id, hours, work_date, note)
+                    for hours, work_date, note in entry["time_entries"]
+                )
+
+        # Assignments first: the ledger checks that each lawyer is on the case
+        if upserts:
+            self.DB.execute_many(self.DB.UPSERT_CASE_LAWYER_SQL, upserts)
+        if time_entries:
+            self.DB.hours_ledger.record_hours_many(time_entries)
+        return rejected
+
+    def _write_entries_one_by_one(self, pending: dict) -> list:
+        """
+        _write_entries for a batch the database refused: each entry on its
+        own, so only the entries it refuses are rejected. A refused entry
+        is rolled back to its savepoint, upsert and time entries alike;
+        the transaction carries on.
+        """
+        rejected = []
+        for key, entry in sorted(pending.items()):
+            try:
+                with self.DB.savepoint("write_behind_entry"):
+                    rejected.extend(self._write_entries({key: entry}))
+            except Exception as e:
+                if type(e).__name__ not in self.REFUSED_ERRORS:
+                    raise
+                rejected.append((*key, entry, f"Refused by the database: {e}"))
+        return rejected
+
+    def _fetch_in(self, query: str, ids: list) -> list:
+        placeholders = ", ".join(["%s"] * len(ids))
+        return self.DB.fetch_all(query.format(ids=placeholders), tuple(ids), dictionary=False)
+
+    def _reject(self, batch_id: str, rejected: list):
+        """Log refused entries and append them to rejects.jsonl."""
+        with open(self.rejects_path, "a") as file:
+            for case_id, lawyer_id, entry, reason in rejected:
+                self._logger.log_warning(
+                    "%s: %s: dropped write for case %s, lawyer %s: %s",
+                    inspect.currentframe().f_code.co_name, batch_id, case_id, lawyer_id, reason,
+                )
+                file.write(json.dumps({
+                    "batch_id": batch_id,
+                    "case_id": case_id,
+                    "lawyer_id": lawyer_id,
+                    "role": entry["role"],
+                    "hours": None if entry["hours"] is None else str(entry["hours"]),
+                    "time_entries": [
+                        {"hours": str(hours), "work_date": work_date, "note": note}
+                        for hours, work_date, note in entry["time_entries"]
+                    ],
+                    "error": reason,
+                }) + "\n")
+        self.stats["rejected"] += len(rejected)
+
+    # ---------- Recovery ----------
+
+    def _recover(self):
+        """Queue the batch files an earlier process did not finish, oldest first."""
+        paths = sorted(glob.glob(os.path.join(self.directory, "batch-*.jsonl")))
+        for path in paths:
+            pending = {}
+            with open(path, "r") as file:
+                for line_no, line in enumerate(file, start=1):
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        # A torn last line was never acknowledged to the caller
+                        self._logger.log_warning(
+                            "%s: %s line %d is incomplete, skipped",
+                            inspect.currentframe().f_code.co_name, path, line_no,
+                        )
+                        continue
+                    self._coalesce(pending, op)
+            batch_id = os.path.basename(path)[:-len(".jsonl")]
+            self._sealed.append((batch_id, path, pending))
+
+        if paths:
+            self._logger.log_info(
+                "%s: %d write-behind batches left by an earlier run, replaying",
+                inspect.currentframe().f_code.co_name, len(paths),
+            )
+            with self._lock:
+                self._start_flusher()
+            self._wake.set()
+
+    @staticmethod
+    def _to_decimal(hours) -> Decimal:
+        return Decimal(str(hours)).quantize(Decimal("0.01"))
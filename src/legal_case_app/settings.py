@@ -2,7 +2,52 @@
 
 import json
 import platform
-from pathlib import Path
+import threading
+from types import MappingProxyType
+
+
+# Required settings and their types; other keys are allowed and kept as-is.
+SETTINGS_SCHEMA = {
+    'logs_dir': str,
+    'log_filename': str,
+    'log_level': str,
+    'log_to_console': bool,
+    'log_to_file': bool,
+    'deployed_to_production': bool,
+}
+LOG_LEVELS = ('notset', 'debug', 'info', 'warning', 'error', 'critical')
+
+# Optional settings and their defaults.
+OPTIONAL_SETTINGS = {
+    'log_async': False,             # write logs from a QueueListener thread
+    'log_queue_size': 10000,        # records buffered before overflow applies
+    'log_queue_overflow': 'drop',   # 'drop' or 'block' when the queue is full
+    'log_format': 'text',           # 'text' or 'json' (one object per line)
+}
+LOG_OVERFLOW_POLICIES = ('drop', 'block')
+LOG_FORMATS = ('text', 'json')
+
+_shared_settings = {}
+_shared_settings_lock = threading.Lock()
+
+
+def get_settings(filename:str='app_settings.json'):
+    """Return the process-wide settings for filename.
+
+    The file is read and validated once per process; every later call
+    returns the same read-only mapping.
+    """
+    settings = _shared_settings.get(filename)
+    if settings is None:
+        with _shared_settings_lock:
+            settings = _shared_settings.get(filename)
+            if settings is None:
+                loader = Settings(filename)
+                raw = loader.read_settings_file_from_location(filename)
+                loader.validate(raw)
+                settings = MappingProxyType(raw)
+                _shared_settings[filename] = settings
+    return settings
 
 class Settings():
     """Manage application settings."""
@@ -57,5 +102,26 @@ class Settings():
 
         return settings
 
-
-
+    def validate(self, settings:dict) -> None:
+        """Check settings against SETTINGS_SCHEMA.
+        Raises ValueError listing every problem found.
+        """
+        problems = []
+        for key, expected_type in SETTINGS_SCHEMA.items():
+            if key not in settings:
+                problems.append(f"missing '{key}'")
+            elif not isinstance(settings[key], expected_type):
+                problems.append(f"'{key}' should be {expected_type.__name__}, "
+                                f"got {type(settings[key]).__name__}")
+        for key, default in OPTIONAL_SETTINGS.items():
+            if key in settings and type(settings[key]) is not type(default):
+                problems.append(f"'{key}' should be {type(default).__name__}, "
+                                f"got {type(settings[key]).__name__}")
+        for key, choices in (('log_level', LOG_LEVELS),
+                             ('log_queue_overflow', LOG_OVERFLOW_POLICIES),
+                             ('log_format', LOG_FORMATS)):
+            if isinstance(settings.get(key), str) and settings[key] not in choices:
+                problems.append(f"'{key}' must be one of {', '.join(choices)}")
+        if problems:
+            raise ValueError(f"Invalid settings in {self._default_settings_filename}: "
+                             f"{'; '.join(problems)}")
@@ -0,0 +1,71 @@
+"""Provides StartupTimer for measuring application cold start."""
+
+import os
+import sys
+import time
+
+
+class StartupTimer():
+    """Records named startup phases and renders a timing report."""
+
+    def __init__(self, started:float=None)->None:
+        """Initialize instance.
+
+        :param started: perf_counter() taken as early as possible in the
+                        process (defaults to now)
+        """
+        self._started = started if started is not None else time.perf_counter()
+        self._last = self._started
+        self.phases = []
+
+    def mark(self, phase:str)->None:
+        """Close the current phase under the given name."""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def total_ms(self)->float:
+        """Milliseconds from start to the last mark."""
+        return (self._last - self._started) * 1000
+
+    def format_report(self, import_breakdown:list=None)->str:
+        """Return the phase timings (and optional import breakdown) as text."""
+        lines = ["--- Startup timing ---"]
+        for phase, ms in self.phases:
+            lines.append(f"{ms:>9.1f} ms  {phase}")
+        lines.append(f"{self.total_ms():>9.1f} ms  total")
+
+        if import_breakdown:
+            lines.append("")
+            lines.append("--- Slowest imports (-X importtime, cumulative) ---")
+            for cumulative_us, self_us, module in import_breakdown:
+                lines.append(f"{cumulative_us / 1000:>9.1f} ms  "
+                             f"(self {self_us / 1000:.1f} ms)  {module}")
+        return "\n".join(lines)
+
+
+def import_time_breakdown(module:str='main', top:int=10)->list:
+    """Import module in a fresh interpreter with -X importtime.
+
+    Returns the top modules by cumulative import time as
+    (cumulative_us, self_us, module_name) tuples.
+    """
+    import subprocess
+
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [src_dir] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             f'import {module}'],
+                            capture_output=True, text=True, env=env)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
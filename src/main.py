@@ -1,12 +1,51 @@
-
 """
 Main entry point for the Legal Case Counsel Roster Application.
+
+Parses the command line and dispatches to the batch commands and
+subcommand runners in legal_case_app.cli, or starts the menu.
 """
 
+# Taken before any other import so --startup-report covers import time too
+import time
+_PROCESS_START = time.perf_counter()
+
 import json
+import sys
 from argparse import ArgumentParser
 
-from legal_case_app.presentation_layer.user_interface import UserInterface
+# Service layer imports are deferred to the code paths that use them, so the
+# --socket client starts without loading them
+from legal_case_app.startup_timer import StartupTimer, import_time_breakdown
+from legal_case_app.cli.batch_commands import (
+    add_batch_command_parsers,
+    run_batch_command,
+    run_client,
+)
+from legal_case_app.cli.subcommands import (
+    print_query_profile,
+    run_archive,
+    run_import,
+    run_ledger,
+    run_migrate,
+    run_parity,
+    run_report,
+    run_server,
+    run_snapshot,
+    run_statements,
+)
+
+
+def report_name(value: str) -> str:
+    """argparse type for the report name, checked against AppServices on use only."""
+    from argparse import ArgumentTypeError
+    from legal_case_app.service_layer.app_services import AppServices
+
+    if value not in AppServices.BILLABLE_HOURS_REPORTS:
+        raise ArgumentTypeError(
+            f"invalid choice: {value!r} (choose from "
+            f"{', '.join(AppServices.BILLABLE_HOURS_REPORTS)})"
+        )
+    return value
 
 
 def configure_and_parse_commandline_arguments():
@@ -14,6 +53,8 @@ def configure_and_parse_commandline_arguments():
     Configure and parse command-line arguments.
     This follows the book and professor's framework.
     """
+    from datetime import date
+
     parser = ArgumentParser(
         prog="main.py",
         description="Start the Legal Case Counsel Roster application.",
@@ -27,35 +68,385 @@ def configure_and_parse_commandline_arguments():
         help="Path to JSON configuration file.",
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-query p50/p95/p99 latency to stderr on exit.",
+    )
+
+    parser.add_argument(
+        "--test-connection",
+        action="store_true",
+        help="Run a test query before starting the menu.",
+    )
+
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Print startup phase timings and the slowest imports to stderr.",
+    )
+
+    parser.add_argument(
+        "--startup-budget-ms",
+        type=float,
+        default=None,
+        help="With --startup-report, exit with status 1 if startup took longer.",
+    )
+
+    parser.add_argument(
+        "--script",
+        default=None,
+        help="Run the batch commands in this file ('-' for stdin), one per "
+        "line, in a single transaction.",
+    )
+
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Send the batch commands to a running 'serve' daemon on this "
+        "Unix socket instead of opening a database connection.",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["json", "csv"],
+        default="json",
+        help="Output format of the batch commands (default: json).",
+    )
+
+    subparsers = parser.add_subparsers(
+        dest="command",
+        help="Optional non-interactive command (default: start the menu).",
+    )
+    add_batch_command_parsers(subparsers)
+
+    import_parser = subparsers.add_parser(
+        "import",
+        help="Bulk-load lawyers, cases or assignments from a CSV/JSONL file.",
+    )
+    import_parser.add_argument(
+        "kind",
+        choices=["lawyers", "cases", "assignments"],
+        help="What the input file contains.",
+    )
+    import_parser.add_argument(
+        "file",
+        help="Input file (.csv with a header row, or .jsonl).",
+    )
+    import_parser.add_argument(
+        "-b",
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Rows per transaction (default: bulk_import.batch_size in config).",
+    )
+    import_parser.add_argument(
+        "-r",
+        "--rejects",
+        default=None,
+        help="Where to write rejected rows (default: <file>.rejects.jsonl).",
+    )
+
+    migrate_parser = subparsers.add_parser(
+        "migrate",
+        help="Apply pending database/migrations scripts.",
+    )
+    migrate_parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Only list migrations and whether they are applied.",
+    )
+    migrate_parser.add_argument(
+        "--target",
+        type=int,
+        default=None,
+        help="Stop after this migration version.",
+    )
+    migrate_parser.add_argument(
+        "--check-plans",
+        action="store_true",
+        help="EXPLAIN every service query and fail on full table scans.",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run the batch commands as a daemon on a Unix socket.",
+    )
+    serve_parser.add_argument(
+        "--socket",
+        dest="serve_socket",
+        default=None,
+        help="Socket path (default: server.socket_path in config).",
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Client handler threads (default: server.workers in config).",
+    )
+
+    report_parser = subparsers.add_parser(
+        "report",
+        help="Write a billable hours report as CSV.",
+    )
+    report_parser.add_argument(
+        "name",
+        type=report_name,
+        help="Which report to run: by-lawyer, by-case, by-role, by-status-month, "
+             "or ledger-by-lawyer / ledger-by-case (hours ledger totals).",
+    )
+    report_parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="CSV file to write (default: standard output).",
+    )
+    report_parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="Aggregate a snapshot directory with NumPy instead of querying the database.",
+    )
+    report_parser.add_argument(
+        "--include-archive",
+        action="store_true",
+        help="Also count archived cases.",
+    )
+
+    archive_parser = subparsers.add_parser(
+        "archive",
+        help="Move long-closed cases and their assignments to the archive tables.",
+    )
+    archive_parser.add_argument(
+        "--older-than-years",
+        type=int,
+        default=None,
+        help="Archive cases closed more than this many years ago "
+             "(default: archive.older_than_years in config).",
+    )
+    archive_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Cases moved per transaction (default: archive.batch_size in config).",
+    )
+    archive_parser.add_argument(
+        "--max-batches",
+        type=int,
+        default=None,
+        help="Stop after this many batches; run again to continue.",
+    )
+
+    statements_parser = subparsers.add_parser(
+        "statements",
+        help="Write every case's roster statement, in parallel worker processes.",
+    )
+    statements_parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="File to write; rerunning after an interruption resumes it.",
+    )
+    statements_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: statements.workers in config, or one per CPU).",
+    )
+    statements_parser.add_argument(
+        "--format",
+        dest="statement_format",
+        choices=["jsonl", "csv"],
+        default=None,
+        help="Output format (default: statements.format in config).",
+    )
+    statements_parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=None,
+        help="Cases per shard (default: statements.shard_size in config).",
+    )
+    statements_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Discard the checkpoints of an unfinished run and start over.",
+    )
+
+    snapshot_parser = subparsers.add_parser(
+        "snapshot",
+        help="Export the roster tables to a columnar snapshot for offline analysis.",
+    )
+    snapshot_parser.add_argument(
+        "action",
+        choices=["export"],
+        help="export: write a new snapshot part.",
+    )
+    snapshot_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only export rows changed since the last export.",
+    )
+    snapshot_parser.add_argument(
+        "-d",
+        "--directory",
+        default=None,
+        help="Snapshot directory (default: snapshot.directory in config).",
+    )
+
+    ledger_parser = subparsers.add_parser(
+        "ledger",
+        help="Record time entries in the billable hours ledger, or check its totals.",
+    )
+    ledger_actions = ledger_parser.add_subparsers(dest="action", required=True)
+    for action, action_help in (
+        ("verify", "Report totals that drifted from the ledger."),
+        ("rebuild", "Report totals that drifted and correct them."),
+    ):
+        check_parser = ledger_actions.add_parser(action, help=action_help)
+        check_parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Ids checked per query (default: hours_ledger.verify_chunk_size in config).",
+        )
+    record_parser = ledger_actions.add_parser(
+        "record", help="Append one time entry for a lawyer assigned to a case."
+    )
+    record_parser.add_argument("case_id", type=int)
+    record_parser.add_argument("lawyer_id", type=int)
+    record_parser.add_argument(
+        "hours", help="Hours worked; negative hours correct an earlier entry."
+    )
+    record_parser.add_argument(
+        "--work-date", type=date.fromisoformat, default=None,
+        help="YYYY-MM-DD (default: today).",
+    )
+    record_parser.add_argument("--note", default=None, help="Optional free text.")
+
+    subparsers.add_parser(
+        "parity",
+        help="Run the same service calls on the configured database and on "
+        "in-memory SQLite, and compare the results (needs an empty database).",
+    )
+
     return parser.parse_args()
 
 
+def report_startup(timer: StartupTimer, args) -> int:
+    """Print the startup report if asked for. Returns 1 if over budget."""
+    if not args.startup_report:
+        return 0
+
+    print(timer.format_report(import_time_breakdown("main")), file=sys.stderr)
+    if args.startup_budget_ms is not None and timer.total_ms() > args.startup_budget_ms:
+        print(
+            f"Startup took {timer.total_ms():.1f} ms, over the "
+            f"{args.startup_budget_ms:.0f} ms budget.",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
 def main():
     """Application entry point."""
+    timer = StartupTimer(_PROCESS_START)
+    timer.mark("imports")
 
     # ---- 1. Read command-line arguments ----
     args = configure_and_parse_commandline_arguments()
+    timer.mark("parse arguments")
 
     # ---- 2. Load JSON config ----
     with open(args.configfile, "r") as file:
         config = json.load(file)
+    timer.mark("load config")
+
+    # ---- Non-interactive subcommands ----
+    batch_mode = args.script or args.command not in (
+        None, "migrate", "import", "report", "serve", "ledger", "parity", "snapshot",
+        "statements", "archive",
+    )
+    if args.socket and batch_mode:
+        timer.mark("ready")
+        exit_code = report_startup(timer, args)
+        sys.exit(run_client(args) or exit_code)
+
+    from legal_case_app.service_layer.app_services import AppServices
+
+    if args.command == "migrate":
+        timer.mark("ready")
+        exit_code = report_startup(timer, args)
+        sys.exit(run_migrate(config, args) or exit_code)
+    if args.command == "parity":
+        timer.mark("ready")
+        exit_code = report_startup(timer, args)
+        sys.exit(run_parity(config) or exit_code)
+    if args.command in ("import", "report", "serve", "ledger", "snapshot", "statements",
+                        "archive"):
+        services = AppServices(config)
+        timer.mark("build services")
+        exit_code = report_startup(timer, args)
+        try:
+            if args.command == "import":
+                run_import(config, services, args)
+            elif args.command == "serve":
+                exit_code = run_server(config, services, args) or exit_code
+            elif args.command == "ledger":
+                exit_code = run_ledger(config, services, args) or exit_code
+            elif args.command == "snapshot":
+                run_snapshot(config, services, args)
+            elif args.command == "statements":
+                run_statements(config, services, args)
+            elif args.command == "archive":
+                run_archive(config, services, args)
+            else:
+                run_report(services, args)
+        finally:
+            services.close()
+            if args.profile:
+                print_query_profile(services)
+        sys.exit(exit_code)
+    if args.script or args.command is not None:
+        services = AppServices(config)
+        timer.mark("build services")
+        exit_code = report_startup(timer, args)
+        try:
+            exit_code = run_batch_command(config, services, args) or exit_code
+        finally:
+            services.close()
+            if args.profile:
+                print_query_profile(services)
+        sys.exit(exit_code)
 
     # ---- 3. Initialize User Interface ----
+    from legal_case_app.presentation_layer.user_interface import UserInterface
+
     ui = UserInterface(config)
+    timer.mark("build user interface")
 
     # ---- 4. TEST DATABASE CONNECTION (Chapter 24 Step 5) ----
-    print("\nTesting MySQL connection...")
-    try:
-        results = ui.DB.db.test_connection()
-        print("Connection successful! Sample rows:")
-        print(results)
-    except Exception as e:
-        print("Connection failed:", e)
-        raise
+    # Opt-in: the pool is otherwise created lazily by the first real query.
+    if args.test_connection:
+        print("\nTesting MySQL connection...")
+        try:
+            results = ui.DB.db.test_connection()
+            print("Connection successful! Sample rows:")
+            print(results)
+        except Exception as e:
+            print("Connection failed:", e)
+            raise
+        timer.mark("test connection")
+
+    exit_code = report_startup(timer, args)
 
     # ---- 5. START APPLICATION ----
-    ui.start()
+    try:
+        ui.start()
+    finally:
+        if args.profile:
+            print_query_profile(ui.DB)
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
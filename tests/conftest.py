@@ -0,0 +1,115 @@
+"""
+Shared fixtures: AppServices on a scratch SQLite file, and on MySQL when
+LEGAL_CASE_TEST_MYSQL_CONFIG names the config of an empty, migrated
+scratch database (its tables are emptied before every test).
+"""
+
+from legal_case_app.service_layer.app_services import AppServices
+import copy
+import json
+import os
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MYSQL_CONFIG_ENV = "LEGAL_CASE_TEST_MYSQL_CONFIG"
+
+
+def load_config(path: str) -> dict:
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+@pytest.fixture(params=["sqlite", "mysql"])
+def backend(request) -> str:
+    """Every test using services runs once per backend."""
+    if request.param == "mysql" and not os.environ.get(MYSQL_CONFIG_ENV):
+        pytest.skip(f"no MySQL server configured (set {MYSQL_CONFIG_ENV})")
+    return request.param
+
+
+@pytest.fixture
+def app_config(backend, tmp_path) -> dict:
+    """Application config for backend, with scratch write-behind and snapshot directories."""
+    if backend == "mysql":
+        config = load_config(os.environ[MYSQL_CONFIG_ENV])
+    else:
+        config = load_config(os.path.join(ROOT, "config", "legal_case_app_config.json"))
+        config["database"]["backend"] = "sqlite"
+        config["database"]["sqlite"] = {
+            "path": str(tmp_path / "legal_case.db"),
+            "schema": os.path.join(ROOT, "database", "sqlite", "create_tables.sql"),
+        }
+    config["write_behind"] = dict(
+        config.get("write_behind", {}), enabled=False,
+        journal_directory=str(tmp_path / "write_behind"),
+    )
+    config["snapshot"] = dict(config.get("snapshot", {}), directory=str(tmp_path / "snapshot"))
+    config["archive"] = dict(config.get("archive", {}), pause_seconds=0)
+    return config
+
+
+@pytest.fixture
+def make_services(app_config):
+    """
+    Factory for AppServices on the test database; make_services(section=dict)
+    overrides config sections. Every instance is closed after the test.
+    """
+    built = []
+
+    def make(**sections) -> AppServices:
+        config = copy.deepcopy(app_config)
+        for name, values in sections.items():
+            config[name] = dict(config.get(name, {}), **values)
+        services = AppServices(config)
+        if not built and services.db.name == "mysql":
+            from benchmarks.seed_dataset import reset_tables
+
+            reset_tables(services)
+        built.append(services)
+        return services
+
+    yield make
+    for services in reversed(built):
+        try:
+            services.close()
+        finally:
+            services.db.close()
+
+
+@pytest.fixture
+def services(make_services) -> AppServices:
+    return make_services()
+
+
+@pytest.fixture
+def roster(services) -> dict:
+    """
+    Three lawyers, four cases and four assignments:
+
+        case 0 (Open, 2024-03): lawyer 0 Lead 3.5, lawyer 1 Associate 2
+        case 1 (Open, 2024-05): lawyer 0 Lead 5, lawyer 2 Consultant 1.25
+        case 2 (Closed 2023-12-20), case 3 (Pending): nobody
+
+    :return: {"lawyers": [lawyer_id, ...], "cases": [case_id, ...]}
+    """
+    lawyers = [
+        services.add_lawyer("Jordan", "Miles", "Tax Law", "jm@example.com", "555-0101"),
+        services.add_lawyer("Sara", "Patel", "Family Law", "sp@example.com"),
+        services.add_lawyer("Jane", "Jordan", "Corporate Law", "jj@example.com"),
+    ]
+    cases = [
+        services.add_case("Smith v. Jones", "Smith", "Open", "2024-03-01", None, "Contract dispute"),
+        services.add_case("Acme Merger", "Acme", "Open", "2024-05-15"),
+        services.add_case("Estate of Brown", "Brown", "Closed", "2023-01-10", "2023-12-20"),
+        services.add_case("Rossi Appeal", "Rossi", "Pending", "2024-05-02"),
+    ]
+    services.assign_lawyer_to_case(cases[0], lawyers[0], "Lead", 3.5)
+    services.assign_lawyer_to_case(cases[0], lawyers[1], "Associate", 2)
+    services.assign_lawyer_to_case(cases[1], lawyers[0], "Lead", 5)
+    services.assign_lawyer_to_case(cases[1], lawyers[2], "Consultant", 1.25)
+    return {"lawyers": lawyers, "cases": cases}
+
+
+def count_rows(services: AppServices, table: str) -> int:
+    return services.fetch_all(f"SELECT COUNT(*) FROM {table};", dictionary=False, read=False)[0][0]
@@ -0,0 +1,430 @@
+"""AppServices public methods, on every configured backend (see conftest)."""
+
+from legal_case_app.models import CaseAssignment, LegalCase, Lawyer
+from legal_case_app.service_layer.case_archive_service import CaseArchiveService
+from conftest import count_rows
+from datetime import date
+from decimal import Decimal
+import pytest
+
+
+def hours(rows, column: int):
+    """rows with the hours column as float: SUM/AVG types differ by engine."""
+    return [
+        tuple(float(value) if n == column or n == column + 1 else value
+              for n, value in enumerate(row))
+        for row in rows
+    ]
+
+
+# ---------- Lawyers and cases ----------
+
+def test_add_and_get_all_lawyers(services, roster):
+    lawyers = services.get_all_lawyers()
+
+    assert [type(lawyer) for lawyer in lawyers] == [Lawyer] * 3
+    assert [lawyer.lawyer_id for lawyer in lawyers] == roster["lawyers"]
+    assert lawyers[0].full_name == "Jordan Miles"
+    assert lawyers[0].phone == "555-0101"
+    assert lawyers[1].phone is None
+    assert isinstance(lawyers[0].hire_date, date)
+
+
+def test_add_lawyer_duplicate_email_is_refused(services, roster):
+    with pytest.raises(Exception) as excinfo:
+        services.add_lawyer("Dup", "Email", "Tax Law", "jm@example.com")
+
+    assert type(excinfo.value).__name__ == "IntegrityError"
+    assert count_rows(services, "lawyer") == 3
+
+
+def test_add_and_get_all_cases(services, roster):
+    cases = services.get_all_cases()
+
+    assert [type(case) for case in cases] == [LegalCase] * 4
+    assert [case.case_id for case in cases] == roster["cases"]
+    assert cases[0].start_date == date(2024, 3, 1)
+    assert cases[0].description == "Contract dispute"
+    assert cases[2].end_date == date(2023, 12, 20)
+    assert cases[3].end_date is None
+
+
+def test_get_case_lawyers(services, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    assignments = services.get_case_lawyers()
+
+    assert all(type(row) is CaseAssignment for row in assignments)
+    assert sorted((a.case_id, a.lawyer_id, a.role, a.billable_hours) for a in assignments) == [
+        (cases[0], lawyers[0], "Lead", Decimal("3.50")),
+        (cases[0], lawyers[1], "Associate", Decimal("2.00")),
+        (cases[1], lawyers[0], "Lead", Decimal("5.00")),
+        (cases[1], lawyers[2], "Consultant", Decimal("1.25")),
+    ]
+
+
+def test_get_case_lawyer_columns(services, roster):
+    columns = services.get_case_lawyer_columns()
+
+    assert list(columns) == list(CaseAssignment.COLUMNS)
+    assert sorted(columns["lawyer_id"]) == sorted(
+        [roster["lawyers"][0], roster["lawyers"][1], roster["lawyers"][0], roster["lawyers"][2]]
+    )
+    assert sorted(float(value) for value in columns["billable_hours"]) == [1.25, 2.0, 3.5, 5.0]
+
+
+# ---------- Keyset pages and streaming ----------
+
+def test_iter_lawyers_pages(services, roster):
+    pages = list(services.iter_lawyers(page_size=2))
+
+    assert [len(page) for page in pages] == [2, 1]
+    assert [lawyer.lawyer_id for page in pages for lawyer in page] == roster["lawyers"]
+
+
+def test_iter_cases_pages(services, roster):
+    pages = list(services.iter_cases(page_size=2))
+
+    assert [len(page) for page in pages] == [2, 2]
+    assert [case.case_id for page in pages for case in page] == roster["cases"]
+
+
+def test_iter_case_lawyers_pages(services, roster):
+    pages = list(services.iter_case_lawyers(page_size=3))
+
+    assert [len(page) for page in pages] == [3, 1]
+    ids = [row.id for page in pages for row in page]
+    assert ids == sorted(ids)
+
+
+def test_stream_rows_batches(services, roster):
+    batches = list(services.stream_rows(
+        "SELECT lawyer_id, last_name FROM lawyer ORDER BY lawyer_id;",
+        row_format="dict", batch_size=2,
+    ))
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [row["last_name"] for batch in batches for row in batch] == ["Miles", "Patel", "Jordan"]
+
+
+def test_fetch_all_row_formats(services, roster):
+    query = "SELECT lawyer_id, first_name FROM lawyer WHERE lawyer_id = %s;"
+    lawyer_id = roster["lawyers"][1]
+
+    assert services.fetch_all(query, (lawyer_id,)) == [{"lawyer_id": lawyer_id, "first_name": "Sara"}]
+    assert services.fetch_all(query, (lawyer_id,), dictionary=False) == [(lawyer_id, "Sara")]
+    record = services.fetch_all(query, (lawyer_id,), row_format="record")[0]
+    assert record.first_name == record["first_name"] == "Sara"
+
+
+# ---------- Rosters ----------
+
+def test_get_case_with_lawyers(services, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    rows = services.get_case_with_lawyers(cases[0])
+
+    assert sorted((row["lawyer_id"], row["role"]) for row in rows) == [
+        (lawyers[0], "Lead"), (lawyers[1], "Associate"),
+    ]
+    assert {row["case_name"] for row in rows} == {"Smith v. Jones"}
+
+
+def test_get_case_with_lawyers_without_lawyers(services, roster):
+    rows = services.get_case_with_lawyers(roster["cases"][3])
+
+    assert len(rows) == 1
+    assert rows[0]["case_name"] == "Rossi Appeal"
+    assert rows[0]["lawyer_id"] is None
+
+
+def test_get_case_roster(services, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    case_roster = services.get_case_roster(cases[1])
+
+    assert case_roster["case"]["case_name"] == "Acme Merger"
+    assert case_roster["case"]["start_date"] == date(2024, 5, 15)
+    assert sorted(
+        (lawyer["lawyer_id"], lawyer["role"], lawyer["billable_hours"])
+        for lawyer in case_roster["lawyers"]
+    ) == [(lawyers[0], "Lead", Decimal("5.00")), (lawyers[2], "Consultant", Decimal("1.25"))]
+    assert services.get_case_roster(10 ** 9) is None
+
+
+def test_get_cases_with_lawyers(services, roster):
+    cases = roster["cases"]
+    rosters = services.get_cases_with_lawyers([cases[1], cases[0], cases[1], 10 ** 9], chunk_size=1)
+
+    assert sorted(rosters) == [cases[0], cases[1]]
+    assert len(rosters[cases[0]]["lawyers"]) == 2
+
+
+def test_get_cases_with_lawyers_by_status(services, roster):
+    cases = roster["cases"]
+
+    assert sorted(services.get_cases_with_lawyers_by_status("Open", chunk_size=1)) == cases[:2]
+    assert list(services.get_cases_with_lawyers_by_status("Pending")) == [cases[3]]
+    assert services.get_cases_with_lawyers_by_status("Dismissed") == {}
+
+
+# ---------- Search ----------
+
+def test_search_lawyers(services, roster):
+    lawyers = roster["lawyers"]
+
+    assert sorted(lawyer.lawyer_id for lawyer in services.search_lawyers("jor")) == [
+        lawyers[0], lawyers[2],
+    ]
+    assert [lawyer.lawyer_id for lawyer in services.search_lawyers("jor mil")] == [lawyers[0]]
+    assert services.search_lawyers("nobody") == []
+    assert services.search_lawyers("+-*") == []
+
+
+def test_search_cases(services, roster):
+    assert [case.case_id for case in services.search_cases("smith contract")] == [
+        roster["cases"][0]
+    ]
+    assert services.search_cases("smith", page=2) == []
+
+
+@pytest.mark.parametrize("typeahead", [True, False])
+def test_typeahead(services, roster, typeahead):
+    services.typeahead_enabled = typeahead
+
+    assert sorted(label for _, label in services.typeahead_lawyers("jo")) == [
+        "Jane Jordan", "Jordan Miles",
+    ]
+    assert services.typeahead_cases("ac") == [(roster["cases"][1], "Acme Merger")]
+
+
+def test_typeahead_sees_new_rows(services, roster):
+    services.typeahead_enabled = True
+    services.typeahead_lawyers("x")
+    lawyer_id = services.add_lawyer("Xena", "Ward", "Tax Law", "xw@example.com")
+
+    assert services.typeahead_lawyers("xe") == [(lawyer_id, "Xena Ward")]
+
+
+# ---------- Writes ----------
+
+def test_execute_returns_lastrowid_or_rowcount(services, roster):
+    lawyer_id = services.execute(services.INSERT_LAWYER_SQL, ("Ada", "Nolan", "Tax Law", "an@example.com", None))
+    updated = services.execute(
+        "UPDATE lawyer SET specialization = %s WHERE specialization = %s;",
+        ("Tax", "Tax Law"), rowcount=True,
+    )
+
+    assert lawyer_id == roster["lawyers"][-1] + 1
+    assert updated == 2
+
+
+def test_assign_lawyer_to_case_twice_is_refused(services, roster):
+    with pytest.raises(Exception) as excinfo:
+        services.assign_lawyer_to_case(roster["cases"][0], roster["lawyers"][0], "Lead", 1)
+
+    assert type(excinfo.value).__name__ == "IntegrityError"
+    assert count_rows(services, "case_lawyer_xref") == 4
+
+
+def test_staff_case_inserts_and_updates(services, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    result = services.staff_case(
+        cases[1], [(lawyers[0], "Partner", 6), (lawyers[1], "Associate", 0.5)]
+    )
+
+    assert result == {"inserted": [lawyers[1]], "updated": [lawyers[0]]}
+    assert sorted(
+        (lawyer["lawyer_id"], lawyer["role"], lawyer["billable_hours"])
+        for lawyer in services.get_case_roster(cases[1])["lawyers"]
+    ) == [
+        (lawyers[0], "Partner", Decimal("6.00")),
+        (lawyers[1], "Associate", Decimal("0.50")),
+        (lawyers[2], "Consultant", Decimal("1.25")),
+    ]
+
+
+@pytest.mark.parametrize("assignments, message", [
+    ([], "At least one assignment"),
+    ("repeated", "more than once"),
+    ("missing lawyer", "No lawyer found"),
+])
+def test_staff_case_refuses_bad_input(services, roster, assignments, message):
+    lawyer_id = roster["lawyers"][0]
+    if assignments == "repeated":
+        assignments = [(lawyer_id, "Lead", 1), (lawyer_id, "Lead", 2)]
+    elif assignments == "missing lawyer":
+        assignments = [(lawyer_id, "Lead", 1), (10 ** 9, "Lead", 1)]
+
+    with pytest.raises(ValueError, match=message):
+        services.staff_case(roster["cases"][2], assignments)
+    assert count_rows(services, "case_lawyer_xref") == 4
+
+
+POISON_ROLE_TRIGGERS = {
+    "sqlite": """
+        CREATE TRIGGER staff_test_poison BEFORE INSERT ON case_lawyer_xref
+        WHEN NEW.role = 'poison'
+        BEGIN
+            SELECT RAISE(ABORT, 'poison assignment');
+        END;
+        """,
+    "mysql": """
+        CREATE TRIGGER staff_test_poison BEFORE INSERT ON case_lawyer_xref
+        FOR EACH ROW
+        BEGIN
+            IF NEW.role = 'poison' THEN
+                SIGNAL SQLSTATE '23000' SET MESSAGE_TEXT = 'poison assignment';
+            END IF;
+        END;
+        """,
+}
+
+
+def test_staff_case_is_all_or_nothing(services, roster, backend):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    services.add_billable_hours(cases[0], lawyers[0], 2, "2024-03-02")
+    before = services.get_case_lawyers()
+    services.execute(POISON_ROLE_TRIGGERS[backend])
+    try:
+        # Every id passes the checks and the first row is written before
+        # the database refuses the poison one
+        with pytest.raises(Exception) as excinfo:
+            services.staff_case(cases[0], [
+                (lawyers[0], "Partner", 9),
+                (lawyers[2], "poison", 1),
+            ])
+        with pytest.raises(Exception):
+            services.staff_case(cases[3], [
+                (lawyers[1], "Lead", 1),
+                (lawyers[2], "poison", 1),
+            ])
+    finally:
+        services.execute("DROP TRIGGER staff_test_poison;")
+
+    assert type(excinfo.value).__name__ == "IntegrityError"
+    assert services.get_case_lawyers() == before
+    assert services.get_case_with_lawyers(cases[3])[0]["lawyer_id"] is None
+    assert services.hours_ledger.get_case_hours(cases[0]) == {
+        "total_hours": Decimal("2.00"), "entry_count": 1,
+    }
+    assert services.hours_ledger.get_case_hours(cases[3]) == {"total_hours": 0, "entry_count": 0}
+    assert count_rows(services, "time_entry") == 1
+    assert list(services.hours_ledger.verify_totals()) == []
+
+
+def test_staff_case_unknown_case(services, roster):
+    with pytest.raises(ValueError, match="No case found"):
+        services.staff_case(10 ** 9, [(roster["lawyers"][0], "Lead", 1)])
+
+
+def test_add_billable_hours(services, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    entry_id = services.add_billable_hours(cases[0], lawyers[0], "2.5", "2024-03-02", "Research")
+
+    assert isinstance(entry_id, int)
+    assert services.hours_ledger.get_case_hours(cases[0]) == {
+        "total_hours": Decimal("2.50"), "entry_count": 1,
+    }
+    with pytest.raises(ValueError, match="not assigned"):
+        services.add_billable_hours(cases[3], lawyers[0], 1)
+    with pytest.raises(ValueError):
+        services.add_billable_hours(cases[0], lawyers[0], "lots")
+
+
+# ---------- Reports ----------
+
+def test_billable_hours_report_by_lawyer(services, roster):
+    lawyers = roster["lawyers"]
+    headers, rows = services.get_billable_hours_report("by-lawyer")
+
+    assert headers == ("lawyer_id", "first_name", "last_name", "total_hours", "avg_hours", "assignments")
+    assert hours(rows, 3) == [
+        (lawyers[0], "Jordan", "Miles", 8.5, 4.25, 2),
+        (lawyers[1], "Sara", "Patel", 2.0, 2.0, 1),
+        (lawyers[2], "Jane", "Jordan", 1.25, 1.25, 1),
+    ]
+
+
+def test_billable_hours_report_by_case(services, roster):
+    cases = roster["cases"]
+    _, rows = services.get_billable_hours_report("by-case")
+
+    assert hours(rows, 3) == [
+        (cases[1], "Acme Merger", "Open", 6.25, 3.13, 2),
+        (cases[0], "Smith v. Jones", "Open", 5.5, 2.75, 2),
+    ]
+
+
+def test_billable_hours_report_by_role(services, roster):
+    _, rows = services.get_billable_hours_report("by-role")
+
+    assert hours(rows, 1) == [
+        ("Lead", 8.5, 4.25, 2),
+        ("Associate", 2.0, 2.0, 1),
+        ("Consultant", 1.25, 1.25, 1),
+    ]
+
+
+def test_billable_hours_report_by_status_month(services, roster):
+    _, rows = services.get_billable_hours_report("by-status-month")
+
+    assert hours(rows, 2) == [
+        ("Open", "2024-03", 5.5, 2.75, 2),
+        ("Open", "2024-05", 6.25, 3.13, 2),
+    ]
+
+
+def test_billable_hours_report_columnar(services, roster):
+    headers, columns = services.get_billable_hours_report("by-role", columnar=True)
+
+    assert list(columns) == list(headers)
+    assert list(columns["role"]) == ["Lead", "Associate", "Consultant"]
+    assert list(columns["assignments"]) == [2, 1, 1]
+
+
+def test_ledger_reports(services, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    services.add_billable_hours(cases[0], lawyers[0], 3, "2024-03-02")
+    services.add_billable_hours(cases[1], lawyers[0], 2, "2024-05-16")
+    services.add_billable_hours(cases[1], lawyers[2], 1, "2024-05-16")
+
+    _, by_lawyer = services.get_billable_hours_report("ledger-by-lawyer")
+    _, by_case = services.get_billable_hours_report("ledger-by-case")
+
+    assert [(row[0], float(row[3]), row[4]) for row in by_lawyer] == [
+        (lawyers[0], 5.0, 2), (lawyers[2], 1.0, 1),
+    ]
+    assert [(row[0], float(row[3]), row[4]) for row in by_case] == [
+        (cases[0], 3.0, 1), (cases[1], 3.0, 2),
+    ]
+
+
+def test_unknown_report(services):
+    with pytest.raises(ValueError, match="Unknown report"):
+        services.get_billable_hours_report("by-planet")
+
+
+# ---------- Archive ----------
+
+def test_include_archive(services, roster, app_config):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    services.assign_lawyer_to_case(cases[2], lawyers[1], "Lead", 4)
+    services.assign_lawyer_to_case(cases[2], lawyers[2], "Associate", 1)
+    result = CaseArchiveService(app_config, services).archive(older_than_years=0)
+
+    assert (result["cases"], result["assignments"], result["finished"]) == (1, 2, True)
+    assert [case.case_id for case in services.get_all_cases()] == [cases[0], cases[1], cases[3]]
+    assert [case.case_id for case in services.get_all_cases(include_archive=True)][-1] == cases[2]
+    assert services.get_case_with_lawyers(cases[2]) == []
+    archived = services.get_case_with_lawyers(cases[2], include_archive=True)
+    assert {row["case_name"] for row in archived} == {"Estate of Brown"}
+    assert sorted(row["lawyer_id"] for row in archived) == [lawyers[1], lawyers[2]]
+    assert count_rows(services, "case_lawyer_xref") == 4
+
+
+# ---------- Metrics ----------
+
+def test_pool_metrics_and_profile(services, roster):
+    metrics = services.get_pool_metrics()
+
+    assert metrics["checkouts"] > 0
+    assert "wait_histogram" in metrics
+    assert "INSERT INTO lawyer" in services.get_query_profile_report()
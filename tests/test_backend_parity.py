@@ -0,0 +1,12 @@
+"""BackendParityChecker: the configured backend against in-memory SQLite."""
+
+from legal_case_app.service_layer.backend_parity_checker import BackendParityChecker
+
+
+def test_backends_agree(make_services, app_config):
+    # Empties the MySQL scratch database; the SQLite file starts empty
+    make_services()
+    results = BackendParityChecker(app_config).check()
+
+    assert len(results) > 40
+    assert [(name, expected, actual) for name, ok, expected, actual in results if not ok] == []
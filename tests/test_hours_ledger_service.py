@@ -0,0 +1,144 @@
+"""HoursLedgerService: entries, running totals and verify_totals."""
+
+from conftest import count_rows
+from decimal import Decimal
+import pytest
+
+
+@pytest.fixture
+def ledger(services):
+    return services.hours_ledger
+
+
+def ledger_sums(services, scope: str, item_id: int) -> dict:
+    """The totals recomputed from time_entry, to compare with the stored ones."""
+    key = "case_id" if scope == "case" else "lawyer_id"
+    total, count = services.fetch_all(
+        f"SELECT SUM(hours), COUNT(*) FROM time_entry WHERE {key} = %s;",
+        (item_id,), dictionary=False,
+    )[0]
+    return {"total_hours": Decimal(str(total or 0)).quantize(Decimal("0.01")), "entry_count": count}
+
+
+def test_record_hours_keeps_totals_in_step(services, ledger, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    ledger.record_hours(cases[0], lawyers[0], "2.5", "2024-03-02")
+    ledger.record_hours(cases[0], lawyers[1], 1, "2024-03-03", "Research")
+    ledger.record_hours(cases[1], lawyers[0], "4.25", "2024-05-16")
+    # A correction is a new entry with negative hours
+    ledger.record_hours(cases[0], lawyers[0], "-0.5", "2024-03-04", "Billed twice")
+
+    assert ledger.get_case_hours(cases[0]) == {"total_hours": Decimal("3.00"), "entry_count": 3}
+    assert ledger.get_lawyer_hours(lawyers[0]) == {"total_hours": Decimal("6.25"), "entry_count": 3}
+    for scope, ids in (("case", cases), ("lawyer", lawyers)):
+        for item_id in ids:
+            totals = getattr(ledger, f"get_{scope}_hours")(item_id)
+            assert {key: Decimal(str(value)) for key, value in totals.items()} == (
+                ledger_sums(services, scope, item_id)
+            )
+    assert list(ledger.verify_totals()) == []
+
+
+def test_record_hours_many_keeps_totals_in_step(services, ledger, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    written = ledger.record_hours_many([
+        (cases[1], lawyers[0], 4, "2024-05-16", None),
+        (cases[1], lawyers[2], "1.75", "2024-05-16", None),
+        (cases[1], lawyers[0], "-1", "2024-05-17", "Correction"),
+        (cases[0], lawyers[1], 2, "2024-03-05", None),
+    ])
+
+    assert written == 4
+    assert ledger.get_case_hours(cases[1]) == {"total_hours": Decimal("4.75"), "entry_count": 3}
+    assert ledger.get_case_hours(cases[0]) == ledger_sums(services, "case", cases[0])
+    assert ledger.get_lawyer_hours(lawyers[0]) == {"total_hours": Decimal("3.00"), "entry_count": 2}
+    assert ledger.get_lawyer_hours(lawyers[2]) == ledger_sums(services, "lawyer", lawyers[2])
+    assert list(ledger.verify_totals()) == []
+
+
+def test_record_hours_many_writes_nothing_for_an_unassigned_lawyer(services, ledger, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+
+    with pytest.raises(ValueError, match="not assigned"):
+        ledger.record_hours_many([
+            (cases[0], lawyers[0], 1, "2024-03-02", None),
+            (cases[3], lawyers[0], 1, "2024-05-03", None),
+        ])
+    assert count_rows(services, "time_entry") == 0
+    assert count_rows(services, "case_hours_total") == 0
+
+
+def test_record_hours_refuses_bad_input(ledger, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+
+    with pytest.raises(ValueError, match="not assigned"):
+        ledger.record_hours(cases[3], lawyers[0], 1)
+    with pytest.raises(ValueError):
+        ledger.record_hours(cases[0], lawyers[0], "nan")
+    with pytest.raises(ValueError):
+        ledger.record_hours(cases[0], lawyers[0], 1, note="x" * 501)
+
+
+def test_verify_totals_reports_and_fixes_drift(services, ledger, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    ledger.record_hours(cases[0], lawyers[0], 3, "2024-03-02")
+    ledger.record_hours(cases[0], lawyers[1], 2, "2024-03-03")
+    ledger.record_hours(cases[1], lawyers[2], "-1.5", "2024-05-16")
+    # Drift three ways: a wrong total, a missing total, a total with no entries
+    services.execute(
+        "UPDATE case_hours_total SET total_hours = total_hours + 5, "
+        "entry_count = entry_count + 1 WHERE case_id = %s;", (cases[0],)
+    )
+    services.execute("DELETE FROM lawyer_hours_total WHERE lawyer_id = %s;", (lawyers[1],))
+    services.execute(
+        "INSERT INTO case_hours_total (case_id, total_hours, entry_count) VALUES (%s, 2, 1);",
+        (cases[3],),
+    )
+
+    drifted = {
+        (drift["scope"], drift["id"]): (
+            float(drift["stored_hours"]), drift["stored_entries"],
+            float(drift["actual_hours"]), drift["actual_entries"],
+        )
+        for drift in ledger.verify_totals(chunk_size=2)
+    }
+    assert drifted == {
+        ("case", cases[0]): (10.0, 3, 5.0, 2),
+        ("case", cases[3]): (2.0, 1, 0.0, 0),
+        ("lawyer", lawyers[1]): (0.0, 0, 2.0, 1),
+    }
+    # Reporting alone changes nothing
+    assert len(list(ledger.verify_totals())) == 3
+
+    assert len(list(ledger.verify_totals(fix=True, chunk_size=2))) == 3
+    assert list(ledger.verify_totals()) == []
+    assert ledger.get_case_hours(cases[0]) == {"total_hours": Decimal("5.00"), "entry_count": 2}
+    assert ledger.get_case_hours(cases[3]) == {"total_hours": Decimal("0.00"), "entry_count": 0}
+    assert ledger.get_lawyer_hours(lawyers[1]) == {"total_hours": Decimal("2.00"), "entry_count": 1}
+    assert ledger.get_case_hours(cases[1]) == {"total_hours": Decimal("-1.50"), "entry_count": 1}
+
+
+def test_verify_totals_fix_adds_the_difference(services, ledger, roster, monkeypatch):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    ledger.record_hours(cases[0], lawyers[0], 3, "2024-03-02")
+    services.execute(
+        "UPDATE case_hours_total SET total_hours = total_hours + 5 WHERE case_id = %s;",
+        (cases[0],),
+    )
+
+    # An entry recorded after the drift was measured, before it is fixed:
+    # overwriting with the measured total would lose it
+    stream_rows, recorded = services.stream_rows, []
+
+    def stream_then_record(*args, **kwargs):
+        yield from stream_rows(*args, **kwargs)
+        if not recorded:
+            recorded.append(ledger.record_hours(cases[0], lawyers[0], 1, "2024-03-05"))
+
+    monkeypatch.setattr(services, "stream_rows", stream_then_record)
+    assert [drift["id"] for drift in ledger.verify_totals(fix=True)] == [cases[0]]
+    monkeypatch.undo()
+
+    assert recorded
+    assert ledger.get_case_hours(cases[0]) == {"total_hours": Decimal("4.00"), "entry_count": 2}
+    assert list(ledger.verify_totals()) == []
@@ -0,0 +1,147 @@
+"""RosterCache, and its invalidation by the AppServices write paths."""
+
+from legal_case_app.service_layer.bulk_import_service import BulkImportService
+from legal_case_app.service_layer.roster_cache import RosterCache
+import pytest
+
+
+def lawyer_ids(rows) -> list:
+    return sorted(row["lawyer_id"] for row in rows if row["lawyer_id"] is not None)
+
+
+# ---------- RosterCache ----------
+
+def test_cache_hits_and_misses():
+    cache, loads = RosterCache(max_entries=2), []
+
+    def load(case_id):
+        loads.append(case_id)
+        return [{"case_id": case_id}]
+
+    assert cache.get_or_load(1, load) == [{"case_id": 1}]
+    assert cache.get_or_load(1, load) == [{"case_id": 1}]
+    assert loads == [1]
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_cache_does_not_store_unknown_cases():
+    cache = RosterCache()
+    cache.get_or_load(1, lambda case_id: [])
+
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RosterCache(max_entries=2)
+    for case_id in (1, 2, 1, 3):
+        cache.get_or_load(case_id, lambda key: [key])
+
+    loads = []
+    cache.get_or_load(2, lambda key: loads.append(key) or [key])
+    assert loads == [2]
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_cache_entries_expire():
+    cache, loads = RosterCache(ttl_seconds=0), []
+    for _ in range(2):
+        cache.get_or_load(1, lambda key: loads.append(key) or [key])
+
+    assert loads == [1, 1]
+    assert cache.stats()["expirations"] == 1
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = RosterCache()
+
+    def load_during_write(case_id):
+        rows = [{"case_id": case_id, "version": "before"}]
+        # A writer invalidates while the old rows are in flight
+        cache.invalidate(case_id)
+        return rows
+
+    assert cache.get_or_load(1, load_during_write)[0]["version"] == "before"
+    assert cache.get_or_load(1, lambda key: [{"case_id": key, "version": "after"}])[0][
+        "version"] == "after"
+
+
+# ---------- AppServices write paths ----------
+
+@pytest.fixture
+def cached(services, roster):
+    """Prime the cache with case 0 and case 2 (no lawyers yet)."""
+    for case_id in (roster["cases"][0], roster["cases"][2]):
+        services.get_case_with_lawyers(case_id)
+    assert services.roster_cache.stats()["size"] == 2
+    return services
+
+
+def test_reads_are_served_from_the_cache(cached, roster):
+    hits = cached.roster_cache.stats()["hits"]
+    cached.get_case_with_lawyers(roster["cases"][0])
+
+    assert cached.roster_cache.stats()["hits"] == hits + 1
+
+
+def test_assign_lawyer_to_case_invalidates(cached, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    cached.assign_lawyer_to_case(cases[2], lawyers[1], "Lead", 1)
+
+    assert lawyer_ids(cached.get_case_with_lawyers(cases[2])) == [lawyers[1]]
+
+
+def test_staff_case_invalidates(cached, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    cached.staff_case(cases[0], [(lawyers[0], "Partner", 9), (lawyers[2], "Associate", 1)])
+
+    rows = cached.get_case_with_lawyers(cases[0])
+    assert lawyer_ids(rows) == lawyers
+    assert {row["role"] for row in rows if row["lawyer_id"] == lawyers[0]} == {"Partner"}
+
+
+def test_bulk_import_invalidates(cached, roster, app_config, tmp_path):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    path = tmp_path / "assignments.csv"
+    path.write_text(
+        "case_id,lawyer_id,role,billable_hours\n"
+        f"{cases[2]},{lawyers[0]},Lead,2\n"
+        f"{cases[0]},{lawyers[2]},Consultant,1\n"
+    )
+
+    stats = BulkImportService(app_config, cached).import_file("assignments", str(path))
+
+    assert stats["loaded"] == 2
+    assert lawyer_ids(cached.get_case_with_lawyers(cases[2])) == [lawyers[0]]
+    assert lawyer_ids(cached.get_case_with_lawyers(cases[0])) == lawyers
+
+
+def test_rolled_back_transaction_clears_the_cache(cached, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+
+    with pytest.raises(RuntimeError):
+        with cached.transaction():
+            cached.assign_lawyer_to_case(cases[2], lawyers[0], "Lead", 1)
+            # Read back inside the transaction: must not outlive the rollback
+            assert lawyer_ids(cached.get_case_with_lawyers(cases[2])) == [lawyers[0]]
+            raise RuntimeError("abort")
+
+    assert lawyer_ids(cached.get_case_with_lawyers(cases[2])) == []
+
+
+def test_stale_load_does_not_repopulate_after_a_write(cached, roster, monkeypatch):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    cached.roster_cache.clear()
+    fetch_all = cached.fetch_all
+
+    def fetch_then_write(*args, **kwargs):
+        rows = fetch_all(*args, **kwargs)
+        # Another writer lands between the roster read and the cache store
+        monkeypatch.setattr(cached, "fetch_all", fetch_all)
+        cached.assign_lawyer_to_case(cases[2], lawyers[2], "Lead", 1)
+        return rows
+
+    monkeypatch.setattr(cached, "fetch_all", fetch_then_write)
+    assert lawyer_ids(cached.get_case_with_lawyers(cases[2])) == []
+
+    assert cached.roster_cache.stats()["size"] == 0
+    assert lawyer_ids(cached.get_case_with_lawyers(cases[2])) == [lawyers[2]]
@@ -0,0 +1,204 @@
+"""WriteBehindBuffer: coalescing, crash replay and refused batches."""
+
+from conftest import count_rows
+from decimal import Decimal
+import glob
+import json
+import os
+import pytest
+import shutil
+
+
+# Flushed only when a test asks for it
+WRITE_BEHIND = {"enabled": True, "flush_interval_seconds": 3600, "fsync": False}
+
+POISON_TRIGGERS = {
+    "sqlite": """
+        CREATE TRIGGER wb_test_poison BEFORE INSERT ON time_entry
+        WHEN NEW.note = 'poison'
+        BEGIN
+            SELECT RAISE(ABORT, 'poison entry');
+        END;
+        """,
+    "mysql": """
+        CREATE TRIGGER wb_test_poison BEFORE INSERT ON time_entry
+        FOR EACH ROW
+        BEGIN
+            IF NEW.note = 'poison' THEN
+                SIGNAL SQLSTATE '23000' SET MESSAGE_TEXT = 'poison entry';
+            END IF;
+        END;
+        """,
+}
+
+
+@pytest.fixture
+def buffered(make_services, roster):
+    """AppServices on the roster database with write_behind on."""
+    return make_services(write_behind=WRITE_BEHIND)
+
+
+def assignment(services, case_id: int, lawyer_id: int):
+    rows = services.fetch_all(
+        "SELECT role, billable_hours FROM case_lawyer_xref WHERE case_id = %s AND lawyer_id = %s;",
+        (case_id, lawyer_id), dictionary=False, read=False,
+    )
+    return tuple(rows[0]) if rows else None
+
+
+def journal_files(services) -> list:
+    return sorted(glob.glob(os.path.join(services.write_behind.directory, "batch-*.jsonl")))
+
+
+def write_journal(directory: str, batch_id: str, ops: list, torn: str = "") -> str:
+    """A journal file as a crashed process leaves it (optionally with a torn last line)."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{batch_id}.jsonl")
+    with open(path, "w") as file:
+        file.writelines(json.dumps(op) + "\n" for op in ops)
+        file.write(torn)
+    return path
+
+
+# ---------- Coalescing ----------
+
+def test_repeated_writes_to_one_pair_coalesce(buffered, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    buffered.assign_lawyer_to_case(cases[2], lawyers[0], "Associate", 1)
+    buffered.add_billable_hours(cases[2], lawyers[0], 2, "2024-01-02")
+    buffered.assign_lawyer_to_case(cases[2], lawyers[0], "Lead", "4.5")
+    buffered.add_billable_hours(cases[2], lawyers[0], "-0.5", "2024-01-03", "Correction")
+    buffered.assign_lawyer_to_case(cases[3], lawyers[1], "Lead", 2)
+
+    # Nothing is written before the flush
+    assert buffered.write_behind.pending_count() == 2
+    assert assignment(buffered, cases[2], lawyers[0]) is None
+
+    assert buffered.flush_writes() == 2
+    assert buffered.write_behind.stats["writes"] == 5
+    # The last assignment wins, every time entry is kept in order
+    assert assignment(buffered, cases[2], lawyers[0]) == ("Lead", Decimal("4.50"))
+    assert assignment(buffered, cases[3], lawyers[1]) == ("Lead", Decimal("2.00"))
+    assert buffered.fetch_all(
+        "SELECT hours, note FROM time_entry ORDER BY entry_id;", dictionary=False, read=False
+    ) == [(Decimal("2.00"), None), (Decimal("-0.50"), "Correction")]
+    assert buffered.hours_ledger.get_case_hours(cases[2]) == {
+        "total_hours": Decimal("1.50"), "entry_count": 2,
+    }
+    assert journal_files(buffered) == []
+
+
+def test_queued_assignment_upserts(buffered, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    buffered.assign_lawyer_to_case(cases[0], lawyers[0], "Partner", 7)
+    buffered.flush_writes()
+
+    assert assignment(buffered, cases[0], lawyers[0]) == ("Partner", Decimal("7.00"))
+    assert count_rows(buffered, "case_lawyer_xref") == 4
+
+
+def test_invalid_writes_are_refused_when_queued(buffered, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+
+    with pytest.raises(ValueError):
+        buffered.assign_lawyer_to_case(cases[0], lawyers[2], "x" * 101, 1)
+    with pytest.raises(ValueError):
+        buffered.add_billable_hours(cases[0], lawyers[0], "abc")
+    assert buffered.write_behind.pending_count() == 0
+
+
+def test_transaction_flushes_the_queue_first(buffered, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    buffered.assign_lawyer_to_case(cases[1], lawyers[1], "Associate", 1)
+    buffered.staff_case(cases[1], [(lawyers[1], "Partner", 3)])
+
+    # The synchronous write came last and stays
+    assert buffered.write_behind.pending_count() == 0
+    assert assignment(buffered, cases[1], lawyers[1]) == ("Partner", Decimal("3.00"))
+
+
+# ---------- Crash replay ----------
+
+def test_recover_replays_a_crashed_batch(make_services, app_config, roster):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    directory = app_config["write_behind"]["journal_directory"]
+    path = write_journal(directory, "batch-00000000000000000001-aaaaaaaa", [
+        {"op": "assign", "case_id": cases[3], "lawyer_id": lawyers[2],
+         "role": "Lead", "hours": "2.00"},
+        {"op": "add_hours", "case_id": cases[3], "lawyer_id": lawyers[2],
+         "hours": "1.50", "work_date": "2024-05-03", "note": None},
+    ], torn='{"op": "assign", "case_id": ')
+
+    services = make_services(write_behind=WRITE_BEHIND)
+    # The replay may already have run on the flusher thread
+    services.flush_writes()
+
+    assert assignment(services, cases[3], lawyers[2]) == ("Lead", Decimal("2.00"))
+    assert services.hours_ledger.get_case_hours(cases[3]) == {
+        "total_hours": Decimal("1.50"), "entry_count": 1,
+    }
+    assert not os.path.exists(path)
+
+
+def test_recover_replays_a_batch_only_once(make_services, app_config, roster, tmp_path):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    directory = app_config["write_behind"]["journal_directory"]
+    path = write_journal(directory, "batch-00000000000000000002-bbbbbbbb", [
+        {"op": "add_hours", "case_id": cases[0], "lawyer_id": lawyers[0],
+         "hours": "3.00", "work_date": "2024-03-02", "note": "Once"},
+    ])
+    shutil.copy(path, tmp_path / "journal.copy")
+
+    first = make_services(write_behind=WRITE_BEHIND)
+    first.flush_writes()
+    assert count_rows(first, "time_entry") == 1
+
+    # Crash after the commit, before the file was removed
+    shutil.copy(tmp_path / "journal.copy", path)
+    second = make_services(write_behind=WRITE_BEHIND)
+    second.flush_writes()
+
+    assert count_rows(second, "time_entry") == 1
+    assert second.hours_ledger.get_case_hours(cases[0])["entry_count"] == 1
+    assert not os.path.exists(path)
+
+
+# ---------- Refused batches ----------
+
+@pytest.fixture
+def poison_trigger(services, backend):
+    """Make the database refuse time entries with the note 'poison'."""
+    services.execute(POISON_TRIGGERS[backend])
+    yield
+    services.execute("DROP TRIGGER wb_test_poison;")
+
+
+def test_refused_batch_is_isolated(buffered, roster, poison_trigger):
+    lawyers, cases = roster["lawyers"], roster["cases"]
+    buffered.add_billable_hours(cases[0], lawyers[0], 2, "2024-03-02")
+    # Assignment and refused hours for one pair: rolled back together
+    buffered.assign_lawyer_to_case(cases[3], lawyers[1], "Associate", 1)
+    buffered.add_billable_hours(cases[3], lawyers[1], 1, "2024-05-03", "poison")
+    buffered.assign_lawyer_to_case(cases[2], lawyers[2], "Lead", 1)
+    buffered.assign_lawyer_to_case(10 ** 9, lawyers[0], "Lead", 1)
+
+    assert buffered.flush_writes() == 2
+
+    assert assignment(buffered, cases[2], lawyers[2]) == ("Lead", Decimal("1.00"))
+    assert assignment(buffered, cases[3], lawyers[1]) is None
+    assert buffered.fetch_all(
+        "SELECT case_id, hours FROM time_entry;", dictionary=False, read=False
+    ) == [(cases[0], Decimal("2.00"))]
+    assert list(buffered.hours_ledger.verify_totals()) == []
+    assert count_rows(buffered, "write_behind_batch") == 1
+    assert journal_files(buffered) == []
+
+    with open(buffered.write_behind.rejects_path, "r") as file:
+        rejects = {(line["case_id"], line["lawyer_id"]): line for line in map(json.loads, file)}
+    assert sorted(rejects) == sorted([(cases[3], lawyers[1]), (10 ** 9, lawyers[0])])
+    refused = rejects[(cases[3], lawyers[1])]
+    assert refused["error"].startswith("Refused by the database")
+    assert (refused["role"], refused["hours"]) == ("Associate", "1.00")
+    assert refused["time_entries"] == [{"hours": "1.00", "work_date": "2024-05-03", "note": "poison"}]
+    assert "does not exist" in rejects[(10 ** 9, lawyers[0])]["error"]
+    assert buffered.write_behind.stats["rejected"] == 2